@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+
+"""
+sceptre.cache
+
+This module implements helpers for the data Sceptre keeps between runs in a
+project's cache directory, ``<sceptre_dir>/.sceptre``.
+"""
+
+import io
+import json
+import logging
+import os
+import threading
+
+
+CACHE_DIR_NAME = ".sceptre"
+
+
+def get_cache_dir(sceptre_dir):
+    """
+    Returns the directory used to cache data for the Sceptre project in
+    ``sceptre_dir``.
+
+    :param sceptre_dir: The absolute path to the Sceptre directory.
+    :type sceptre_dir: str
+    :returns: The path of the project's cache directory.
+    :rtype: str
+    """
+    return os.path.join(sceptre_dir, CACHE_DIR_NAME)
+
+
+class JsonStore(object):
+    """
+    JsonStore is a threadsafe dict which is persisted as a JSON file.
+
+    The file is read the first time the data is accessed. A missing or
+    unreadable file is treated as an empty store, as the data it holds can
+    always be rebuilt.
+
+    :param path: The path of the JSON file.
+    :type path: str
+    """
+
+    def __init__(self, path):
+        self.logger = logging.getLogger(__name__)
+
+        self.path = path
+        self._data = None
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "sceptre.cache.JsonStore(path='{0}')".format(self.path)
+
+    @property
+    def data(self):
+        """
+        Returns the data held in the store.
+
+        :returns: The store's data.
+        :rtype: dict
+        """
+        with self._lock:
+            if self._data is None:
+                self._data = self._read()
+            return self._data
+
+    def get(self, key, default=None):
+        """
+        Returns the value stored under ``key``, or ``default``.
+
+        :param key: The key of the item to return.
+        :type key: str
+        :param default: The value to return if ``key`` is not in the store.
+        :type default: obj
+        :returns: The stored value.
+        :rtype: obj
+        """
+        return self.data.get(key, default)
+
+    def set(self, key, value):
+        """
+        Stores ``value`` under ``key``. The value must be JSON serialisable.
+
+        :param key: The key to store the value under.
+        :type key: str
+        :param value: The value to store.
+        :type value: obj
+        """
+        data = self.data
+        with self._lock:
+            data[key] = value
+
+    def save(self):
+        """
+        Writes the store to disk, creating the cache directory if needed.
+        As the data can always be rebuilt, a store which cannot be written is
+        logged and skipped rather than failing the command which recorded it.
+        """
+        data = self.data
+        with self._lock:
+            try:
+                directory = os.path.dirname(self.path)
+                if directory and not os.path.isdir(directory):
+                    os.makedirs(directory)
+                with open(self.path, "w") as store_file:
+                    json.dump(data, store_file, indent=2, sort_keys=True)
+            except (IOError, OSError) as exp:
+                self.logger.warning("Could not save %s: %s", self.path, exp)
+                return
+        self.logger.debug("Saved %s", self.path)
+
+    def _read(self):
+        """
+        Reads the store from disk.
+
+        :returns: The stored data, or an empty dict.
+        :rtype: dict
+        """
+        try:
+            with open(self.path) as store_file:
+                data = json.load(store_file)
+        except (IOError, OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+
+class StackDurations(JsonStore):
+    """
+    StackDurations records how long each stack command took in previous
+    runs, so that schedules and plans can be weighted by real durations.
+
+    Durations are stored per command, in seconds, as a moving average of the
+    observed durations.
+
+    :param sceptre_dir: The absolute path to the Sceptre directory.
+    :type sceptre_dir: str
+    """
+
+    FILE_NAME = "durations.json"
+
+    def __init__(self, sceptre_dir):
+        super(StackDurations, self).__init__(
+            os.path.join(get_cache_dir(sceptre_dir), self.FILE_NAME)
+        )
+
+    def get_durations(self, command):
+        """
+        Returns the recorded durations of ``command``.
+
+        :param command: The stack command. Can be (launch | delete).
+        :type command: str
+        :returns: The duration of each stack in seconds, keyed by stack name.
+        :rtype: dict
+        """
+        return dict(self.get(command, {}))
+
+    def record(self, command, durations):
+        """
+        Folds newly observed durations of ``command`` into the store.
+
+        :param command: The stack command. Can be (launch | delete).
+        :type command: str
+        :param durations: The observed duration of each stack in seconds, \
+            keyed by stack name.
+        :type durations: dict
+        """
+        recorded = self.get_durations(command)
+        for stack_name, duration in durations.items():
+            previous = recorded.get(stack_name)
+            recorded[stack_name] = round(
+                duration if previous is None else (previous + duration) / 2.0,
+                3
+            )
+        self.set(command, recorded)
+
+
+class StackFingerprints(JsonStore):
+    """
+    StackFingerprints records the fingerprint of each stack when it was last
+    successfully launched, so that unchanged stacks can be skipped.
+
+    :param sceptre_dir: The absolute path to the Sceptre directory.
+    :type sceptre_dir: str
+    """
+
+    FILE_NAME = "fingerprints.json"
+
+    def __init__(self, sceptre_dir):
+        super(StackFingerprints, self).__init__(
+            os.path.join(get_cache_dir(sceptre_dir), self.FILE_NAME)
+        )
+
+
+class RenderCache(object):
+    """
+    RenderCache stores rendered template bodies on disk, so that templates
+    whose inputs have not changed are not rendered again in later runs.
+
+    Each body is stored in its own file, named by the render key of the
+    template. Reading an entry marks it as recently used, and when the
+    entries grow beyond ``max_size`` bytes the least recently used are
+    removed.
+
+    :param cache_dir: The project's cache directory.
+    :type cache_dir: str
+    :param max_size: The number of bytes after which entries are evicted.
+    :type max_size: int
+    """
+
+    DIR_NAME = "render"
+    MAX_SIZE = 64 * 1024 * 1024
+
+    def __init__(self, cache_dir, max_size=MAX_SIZE):
+        self.logger = logging.getLogger(__name__)
+
+        self.path = os.path.join(cache_dir, self.DIR_NAME)
+        self.max_size = max_size
+
+    def __repr__(self):
+        return "sceptre.cache.RenderCache(path='{0}', max_size={1})".format(
+            self.path, self.max_size
+        )
+
+    def get(self, key):
+        """
+        Returns the body stored under ``key``.
+
+        :param key: The render key of the template.
+        :type key: str
+        :returns: The rendered body, or None.
+        :rtype: str
+        """
+        entry_path = os.path.join(self.path, key)
+        try:
+            with io.open(entry_path, encoding="utf-8") as entry_file:
+                body = entry_file.read()
+            os.utime(entry_path, None)
+        except (IOError, OSError):
+            return None
+        self.logger.debug("Render cache hit for %s", key)
+        return body
+
+    def set(self, key, body):
+        """
+        Stores ``body`` under ``key``, then evicts the least recently used
+        entries if the cache has grown beyond its maximum size. As bodies can
+        always be rendered again, a body which cannot be written is logged
+        and skipped rather than failing the render.
+
+        :param key: The render key of the template.
+        :type key: str
+        :param body: The rendered body.
+        :type body: str
+        """
+        if isinstance(body, bytes):
+            body = body.decode("utf-8")
+        entry_path = os.path.join(self.path, key)
+        temporary_path = "{0}.{1}.tmp".format(entry_path, os.getpid())
+        try:
+            if not os.path.isdir(self.path):
+                try:
+                    os.makedirs(self.path)
+                except OSError:
+                    if not os.path.isdir(self.path):
+                        raise
+            with io.open(temporary_path, "w", encoding="utf-8") as entry_file:
+                entry_file.write(body)
+            os.rename(temporary_path, entry_path)
+            self._evict()
+        except (IOError, OSError) as exp:
+            self.logger.warning(
+                "Could not cache rendered template in %s: %s", self.path, exp
+            )
+            try:
+                os.remove(temporary_path)
+            except OSError:
+                pass
+
+    def _evict(self):
+        """
+        Removes the least recently used entries until the cache is no larger
+        than its maximum size.
+        """
+        entries = []
+        for name in os.listdir(self.path):
+            try:
+                stat = os.stat(os.path.join(self.path, name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+        size = sum(entry[1] for entry in entries)
+        for _, entry_size, name in sorted(entries):
+            if size <= self.max_size:
+                break
+            try:
+                os.remove(os.path.join(self.path, name))
+            except OSError:
+                continue
+            size -= entry_size
+            self.logger.debug("Evicted %s from the render cache", name)
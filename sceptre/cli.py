@@ -25,6 +25,9 @@ from jinja2.exceptions import TemplateError
 
 from .environment import Environment
 from .exceptions import SceptreException
+from .retry import retry_metrics
+from .scheduler import FailurePolicy
+from .snapshot import ProjectSnapshot
 from .stack_status import StackStatus, StackChangeSetStatus
 from .stack_status_colourer import StackStatusColourer
 from . import __version__
@@ -57,6 +60,38 @@ def stack_options(func):
     return func
 
 
+def concurrency_options(func):
+    """
+    concurrency_options is a decorator which adds the ``--max-concurrency``,
+    ``--explain-schedule`` and ``--on-failure`` options to the click function
+    ``func``.
+
+    :param func: The click function to add the options to.
+    :type func: function
+    :returns: function
+    """
+    func = click.option(
+        "--on-failure", default=FailurePolicy.CONTINUE,
+        type=click.Choice([
+            FailurePolicy.CONTINUE,
+            FailurePolicy.STOP_DISPATCH,
+            FailurePolicy.CANCEL_IN_FLIGHT
+        ]),
+        help="What to do when a stack fails: keep starting unrelated stacks "
+             "(continue), start no further stacks (stop-dispatch), or also "
+             "cancel in-progress updates (cancel-in-flight)."
+    )(func)
+    func = click.option(
+        "--explain-schedule", is_flag=True,
+        help="Log the order in which stacks are prioritised."
+    )(func)
+    func = click.option(
+        "--max-concurrency", type=click.IntRange(min=1),
+        help="The maximum number of stacks to operate on at once."
+    )(func)
+    return func
+
+
 def change_set_options(func):
     """
     change_set_options is a decorator which adds the environment, stack and
@@ -113,9 +148,16 @@ def catch_exceptions(func):
 @click.option(
     "--var-file", type=click.File("rb"),
     help="A YAML file of variables to template into config files.")
+@click.option(
+    "--no-render-cache", is_flag=True,
+    help="Render templates without reading or writing the render cache.")
+@click.option(
+    "--render-processes", type=click.IntRange(min=1),
+    help="Render Python templates in this many worker processes.")
 @click.pass_context
 def cli(
-        ctx, debug, directory, no_colour, output, var, var_file
+        ctx, debug, directory, no_colour, output, var, var_file,
+        no_render_cache, render_processes
 ):  # pragma: no cover
     """
     Implements sceptre's CLI.
@@ -139,6 +181,11 @@ def cli(
             user_variables.update({variable_key: variable_value})
     if user_variables:
         ctx.obj["options"]["user_variables"] = user_variables
+    if no_render_cache:
+        ctx.obj["options"]["render_cache"] = False
+    if render_processes:
+        ctx.obj["options"]["render_processes"] = render_processes
+    ctx.call_on_close(log_retry_metrics)
 
 
 @cli.command(name="validate-template")
@@ -296,36 +343,124 @@ def launch_stack(ctx, environment, stack):
 
 @cli.command(name="launch-env")
 @environment_options
+@concurrency_options
+@click.option(
+    "--incremental", is_flag=True,
+    help="Skip stacks which have not changed since they were last launched.")
+@click.option(
+    "--from-rendered", "rendered_dir",
+    type=click.Path(exists=True, file_okay=False),
+    help="Launch with the templates written by generate-env to this "
+         "directory, rather than rendering them.")
 @click.pass_context
 @catch_exceptions
-def launch_env(ctx, environment):
+def launch_env(
+        ctx, environment, max_concurrency, explain_schedule, on_failure,
+        incremental, rendered_dir
+):
     """
     Creates or updates all stacks.
 
     Creates or updates all the stacks in ENVIRONMENT.
     """
     env = get_env(ctx.obj["sceptre_dir"], environment, ctx.obj["options"])
-    response = env.launch()
+    response = env.launch(
+        max_concurrency=max_concurrency, explain_schedule=explain_schedule,
+        incremental=incremental, on_failure=on_failure,
+        rendered_dir=rendered_dir
+    )
     if not all(status == StackStatus.COMPLETE for status in response.values()):
         exit(1)
 
 
 @cli.command(name="delete-env")
 @environment_options
+@concurrency_options
 @click.pass_context
 @catch_exceptions
-def delete_env(ctx, environment):
+def delete_env(
+        ctx, environment, max_concurrency, explain_schedule, on_failure
+):
     """
     Deletes all stacks.
 
     Deletes all the stacks in ENVIRONMENT.
     """
     env = get_env(ctx.obj["sceptre_dir"], environment, ctx.obj["options"])
-    response = env.delete()
+    response = env.delete(
+        max_concurrency=max_concurrency, explain_schedule=explain_schedule,
+        on_failure=on_failure
+    )
     if not all(status == StackStatus.COMPLETE for status in response.values()):
         exit(1)
 
 
+@cli.command(name="generate-env")
+@environment_options
+@click.option(
+    "--out", "out_dir", required=True,
+    type=click.Path(file_okay=False),
+    help="The directory to write the rendered templates to.")
+@click.option(
+    "--max-concurrency", type=click.IntRange(min=1),
+    help="The maximum number of templates to render at once.")
+@click.pass_context
+@catch_exceptions
+def generate_env(ctx, environment, out_dir, max_concurrency):
+    """
+    Renders all templates.
+
+    Renders the template of every stack in ENVIRONMENT to OUT, along with a
+    manifest of their hashes and sizes, for use by launch-env
+    --from-rendered.
+    """
+    env = get_env(ctx.obj["sceptre_dir"], environment, ctx.obj["options"])
+    response = env.generate(out_dir, max_concurrency=max_concurrency)
+    write(response, ctx.obj["output_format"])
+
+
+@cli.command(name="compile")
+@environment_options
+@click.pass_context
+@catch_exceptions
+def compile_env(ctx, environment):
+    """
+    Writes a snapshot of the project's config.
+
+    Reads the config of every stack in ENVIRONMENT, and writes a snapshot of
+    the config tree, parsed config files and plugins to the project's
+    .sceptre directory. Later commands on ENVIRONMENT start from
+    the snapshot for as long as the project is unchanged.
+    """
+    env = get_env(ctx.obj["sceptre_dir"], environment, ctx.obj["options"])
+    response = env.compile()
+    write(response, ctx.obj["output_format"])
+
+
+@cli.command(name="plan-env")
+@environment_options
+@click.option(
+    "--command", type=click.Choice(["launch", "delete"]), default="launch",
+    help="The command to plan.")
+@click.option(
+    "--max-concurrency", type=click.IntRange(min=1),
+    help="The maximum number of stacks to estimate running at once.")
+@click.pass_context
+@catch_exceptions
+def plan_env(ctx, environment, command, max_concurrency):
+    """
+    Prints the plan for launching or deleting stacks.
+
+    Prints, as JSON, the waves in which the stacks in ENVIRONMENT can be
+    launched or deleted, the critical path and the maximum useful
+    parallelism. If durations have been recorded by previous runs, an
+    estimated duration in seconds is included.
+    """
+    env = get_env(ctx.obj["sceptre_dir"], environment, ctx.obj["options"])
+    response = env.plan(command=command, max_concurrency=max_concurrency)
+    write(response, "json")
+
+
 @cli.command(name="continue-update-rollback")
 @stack_options
 @click.pass_context
@@ -575,7 +710,9 @@ def get_stack_policy(ctx, environment, stack):
 
 def get_env(sceptre_dir, environment_path, options):
     """
-    Initialises and returns a sceptre.environment.Environment().
+    Initialises and returns a sceptre.environment.Environment(). If the
+    project has an up to date snapshot written by ``sceptre compile``, the
+    environment starts from it.
 
     :param sceptre_dir: The absolute path to the Sceptre directory.
     :type project dir: str
@@ -589,10 +726,24 @@ def get_env(sceptre_dir, environment_path, options):
     return Environment(
         sceptre_dir=sceptre_dir,
         environment_path=environment_path,
-        options=options
+        options=options,
+        config_index=ProjectSnapshot(sceptre_dir).load(environment_path)
     )
 
 
+def log_retry_metrics():
+    """
+    Logs a summary of the Boto3 calls retried during the run, if any were.
+    """
+    summary = retry_metrics.get_summary()
+    if summary["retries"] or summary["exhausted"]:
+        logging.getLogger(__name__).debug(
+            "Made %d retries, waiting %.2f seconds in total, and gave up "
+            "on %d: %s", summary["retries"], summary["sleep_time"],
+            summary["exhausted"], summary["codes"]
+        )
+
+
 def setup_logging(debug, no_colour):
     """
     Sets up logging.
@@ -7,21 +7,22 @@ This module implements a Config class, which stores a stack or environment's
 configuration.
 """
 
+import copy
 import logging
 import os
 import yaml
 
-from jinja2 import Environment, FileSystemLoader, StrictUndefined
 from packaging.specifiers import SpecifierSet
 from packaging.version import Version
 
 from . import __version__
+from .config_cache import config_file_cache
 from .exceptions import ConfigItemNotFoundError
 from .exceptions import EnvironmentPathNotFoundError
 from .exceptions import VersionIncompatibleError
 from .hooks import Hook
 from .resolvers import Resolver
-from .helpers import get_subclasses
+from .plugins import plugin_registry
 
 
 class Config(dict):
@@ -32,6 +33,10 @@ class Config(dict):
     config from the ``<base_file_name>.yaml`` files along the
     ``environment_path`` from ``sceptre_dir``.
 
+    Each Config parses YAML with its own subclass of ``yaml.SafeLoader``,
+    ``loader_class``, so the resolver and hook constructors bound to one
+    Config never affect another, and configs can be read concurrently.
+
     :param sceptre_dir: The absolute path to the Sceptre directory.
     :type project dir: str
     :param environment_path: The name of the environment.
@@ -47,6 +52,7 @@ class Config(dict):
         self.sceptre_dir = sceptre_dir
         self.environment_path = environment_path
         self.name = base_file_name
+        self.loader_class = type("ConfigLoader", (yaml.SafeLoader,), {})
         self["dependencies"] = []
 
         self._check_env_path_exists(os.path.join(
@@ -116,7 +122,9 @@ class Config(dict):
         relevant config files. If config items appear in files lower down the
         environment tree, they overwrite items from further up. Jinja2 is used
         to template in variables from user_variables, environment variables,
-        and the segments of the environment path.
+        and the segments of the environment path. Rendered and parsed files
+        are shared through sceptre.config_cache, so each file is only
+        rendered and parsed once for the same variables.
 
         :param user_variables: A dict of key value pairs to be supplied to \
         the config file via Jinja2 templating.
@@ -127,35 +135,15 @@ class Config(dict):
 
         self.logger.debug("Reading in '%s' files...", file_name)
 
-        def get_config(path):
-            """
-            Recursively reads in config files in nested subfolders.
-            """
-            if not path:
-                return {}
-            else:
-                directory_path = os.path.join(self.sceptre_dir, path)
-                config = {}
-                if os.path.isfile(os.path.join(directory_path, file_name)):
-                    env = Environment(
-                        loader=FileSystemLoader(directory_path),
-                        undefined=StrictUndefined
-                    )
-                    template = env.get_template(file_name)
-                    rendered_template = template.render(
-                        environment_variable=os.environ,
-                        var=user_variables,
-                        environment_path=self.environment_path.split("/")
-                    )
-
-                    yaml_data = yaml.safe_load(rendered_template)
-                    if yaml_data is not None:
-                        config = yaml_data
-                cascaded_config = get_config(os.path.dirname(path))
-                cascaded_config.update(config)
-                return cascaded_config
-
-        config = get_config(path)
+        config = {}
+        for directory_path in self._get_directory_paths(path):
+            if os.path.isfile(os.path.join(directory_path, file_name)):
+                node = config_file_cache.get_node(
+                    directory_path, file_name, self.environment_path,
+                    user_variables
+                )
+                if node is not None:
+                    config.update(self._construct(node))
 
         self.update(config)
 
@@ -163,6 +151,40 @@ class Config(dict):
 
         self.logger.debug("Config: %s", self)
 
+    def _get_directory_paths(self, path):
+        """
+        Returns the absolute paths of ``path`` and its parent directories,
+        from top to bottom.
+
+        :param path: A path relative to the Sceptre directory.
+        :type path: str
+        :returns: The absolute directory paths.
+        :rtype: list
+        """
+        directory_paths = []
+        while path:
+            directory_paths.insert(0, os.path.join(self.sceptre_dir, path))
+            path = os.path.dirname(path)
+        return directory_paths
+
+    def _construct(self, node):
+        """
+        Constructs the Python values of a parsed YAML node, using the
+        resolver and hook constructors added to the config's loader. The
+        node is shared through the config file cache, and constructing it
+        rewrites merge keys in place, so a copy of it is constructed.
+
+        :param node: A YAML node.
+        :type node: yaml.Node
+        :returns: The node's value.
+        :rtype: obj
+        """
+        loader = self.loader_class("")
+        try:
+            return loader.construct_document(copy.deepcopy(node))
+        finally:
+            loader.dispose()
+
     @staticmethod
     def _check_env_path_exists(path):
         """
@@ -231,6 +253,9 @@ class Config(dict):
         self.add_yaml_constructors(
             resolvers_folder, Resolver, resolver_constructor_factory
         )
+        self.add_entry_point_constructors(
+            "sceptre.resolvers", Resolver, resolver_constructor_factory
+        )
         external_resolver_folder = os.path.join(self.sceptre_dir, "resolvers")
         self.add_yaml_constructors(
             external_resolver_folder, Resolver, resolver_constructor_factory
@@ -269,6 +294,9 @@ class Config(dict):
         self.add_yaml_constructors(
             library_hook_folder, Hook, hook_constructor_factory
         )
+        self.add_entry_point_constructors(
+            "sceptre.hooks", Hook, hook_constructor_factory
+        )
 
         project_hook_folder = os.path.join(self.sceptre_dir, "hooks")
         self.add_yaml_constructors(
@@ -278,7 +306,8 @@ class Config(dict):
     def add_yaml_constructors(self, base_directory, base_type, factory):
         """
         Adds PyYAML constructors for all classes which inherit from a
-        specific base type within a given directory.
+        specific base type within a given directory. The classes are loaded
+        through sceptre.plugins, so each directory is only imported once.
 
         :param base_directory: A path of a directory to search for classes.
         :type base_directory: str
@@ -287,13 +316,38 @@ class Config(dict):
         :param factory: A function to use to construct objects.
         :type factory: function
         """
-        classes = get_subclasses(
-            directory=base_directory, class_type=base_type
-        )
+        classes = plugin_registry.get_classes(base_type, base_directory)
+        self._add_constructors(classes, factory)
 
+    def add_entry_point_constructors(self, group, base_type, factory):
+        """
+        Adds PyYAML constructors for all classes which inherit from a
+        specific base type, registered by installed packages under the
+        setuptools entry point ``group``.
+
+        :param group: The name of the entry point group.
+        :type group: str
+        :param base_type: The base class in which the class must inherit from.
+        :type base_type: class
+        :param factory: A function to use to construct objects.
+        :type factory: function
+        """
+        classes = plugin_registry.get_entry_point_classes(base_type, group)
+        self._add_constructors(classes, factory)
+
+    def _add_constructors(self, classes, factory):
+        """
+        Adds a PyYAML constructor for each of ``classes``, with the tag
+        ``!<name>``.
+
+        :param classes: Classes keyed by name.
+        :type classes: dict
+        :param factory: A function to use to construct objects.
+        :type factory: function
+        """
         for node_name, node_class in classes.items():
             node_tag = u'!' + node_name
-            yaml.SafeLoader.add_constructor(
+            self.loader_class.add_constructor(
                 node_tag, factory(node_class)
             )
             self.logger.debug(
@@ -0,0 +1,320 @@
+# -*- coding: utf-8 -*-
+
+"""
+sceptre.config_cache
+
+This module implements a ConfigFileCache class, which stores the rendered
+and parsed contents of config files, so that config files shared by many
+stacks and environments are only rendered and parsed once.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+
+from jinja2 import Environment, FileSystemLoader, StrictUndefined, meta
+from jinja2 import nodes
+import yaml
+
+
+class ConfigFileCache(object):
+    """
+    ConfigFileCache stores config files as parsed YAML nodes.
+
+    A file's entry is keyed by its path, modification time and size, by the
+    values of the template variables the file uses, and by the paths,
+    modification times and sizes of the files it includes or imports, whose
+    template variables count as the file's own. Files which include or
+    import templates by a name which is only known when they are rendered
+    are not cached. Files which do not
+    use ``environment_path`` are therefore rendered once however many
+    environments they cascade into, and files which do not use ``var`` or
+    ``environment_variable`` are not rendered again when user variables or
+    environment variables change. User variables and environment variables
+    are keyed by a hash of only the items the file reads, so their values
+    are never held in a key.
+
+    Files are cached as YAML nodes, rather than constructed values, because
+    resolvers and hooks in a config file are constructed for, and bound to,
+    the config which reads them. Constructing values from a node is cheap
+    next to rendering and parsing the file.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+        self._jinja_environments = {}
+        self._variables = {}
+        self._nodes = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "sceptre.config_cache.ConfigFileCache()"
+
+    def get_node(
+            self, directory_path, file_name, environment_path,
+            user_variables=None
+    ):
+        """
+        Returns the parsed YAML node of the config file ``file_name`` in
+        ``directory_path``, rendering and parsing it if it has not been
+        cached.
+
+        :param directory_path: The absolute path of the file's directory.
+        :type directory_path: str
+        :param file_name: The name of the file.
+        :type file_name: str
+        :param environment_path: The path of the environment being read.
+        :type environment_path: str
+        :param user_variables: The user variables to render the file with.
+        :type user_variables: dict
+        :returns: The file's YAML node, or None if the file is empty.
+        :rtype: yaml.Node
+        """
+        path = os.path.join(directory_path, file_name)
+        stat = os.stat(path)
+        file_key = (path, stat.st_mtime, stat.st_size)
+
+        env = self._get_jinja_environment(directory_path)
+        variables, includes = self._get_variables(
+            env, directory_path, file_name, file_key
+        )
+        key = None
+        if variables is not None:
+            key = file_key + (
+                environment_path if "environment_path" in variables else None,
+                self._hash(user_variables or {}, variables["var"])
+                if "var" in variables else None,
+                self._hash(os.environ, variables["environment_variable"])
+                if "environment_variable" in variables else None,
+                includes
+            )
+
+        with self._lock:
+            if key in self._nodes:
+                return self._nodes[key]
+
+        self.logger.debug("Rendering config file %s", path)
+        rendered_template = env.get_template(file_name).render(
+            environment_variable=os.environ,
+            var=user_variables,
+            environment_path=environment_path.split("/")
+        )
+        node = yaml.compose(rendered_template, Loader=yaml.SafeLoader)
+        if key is not None:
+            with self._lock:
+                self._nodes[key] = node
+        return node
+
+    def get_entries(self):
+        """
+        Returns the cache's entries, for storing in a snapshot.
+
+        Nodes rendered from user variables or environment variables are left
+        out, as they depend on values which may be secret and which may
+        differ between runs.
+
+        :returns: The template variables and templates used by each file, \
+            and the YAML node of each file, keyed by their cache keys. The \
+            first three items of each key are the file's path, modification \
+            time and size, and the last item of a node's key holds the same \
+            for each file it includes or imports.
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                "variables": dict(self._variables),
+                "nodes": dict(
+                    (key, node) for key, node in self._nodes.items()
+                    if key[4] is None and key[5] is None
+                )
+            }
+
+    def add_entries(self, entries):
+        """
+        Adds entries returned by ``get_entries`` to the cache.
+
+        :param entries: The entries to add.
+        :type entries: dict
+        """
+        with self._lock:
+            self._variables.update(entries["variables"])
+            self._nodes.update(entries["nodes"])
+
+    def clear(self):
+        """
+        Removes every cached file.
+        """
+        with self._lock:
+            self._jinja_environments.clear()
+            self._variables.clear()
+            self._nodes.clear()
+
+    def _get_jinja_environment(self, directory_path):
+        """
+        Returns the Jinja environment used to render config files in
+        ``directory_path``.
+
+        :param directory_path: The absolute path of the directory.
+        :type directory_path: str
+        :returns: The Jinja environment.
+        :rtype: jinja2.Environment
+        """
+        with self._lock:
+            if directory_path not in self._jinja_environments:
+                self._jinja_environments[directory_path] = Environment(
+                    loader=FileSystemLoader(directory_path),
+                    undefined=StrictUndefined
+                )
+            return self._jinja_environments[directory_path]
+
+    def _get_variables(self, env, directory_path, file_name, file_key):
+        """
+        Returns the template variables a config file uses, including those
+        used by the files it includes or imports, and the items of each
+        variable it reads.
+
+        :param env: The Jinja environment of the file's directory.
+        :type env: jinja2.Environment
+        :param directory_path: The absolute path of the file's directory.
+        :type directory_path: str
+        :param file_name: The name of the file.
+        :type file_name: str
+        :param file_key: The file's path, modification time and size.
+        :type file_key: tuple
+        :returns: The names of the items of each variable which the files \
+            read, or None for a variable which is read dynamically, keyed \
+            by variable name, and the path, modification time and size of \
+            each included or imported file. Both are None if a file \
+            includes or imports a template by a dynamic name, or one which \
+            does not exist.
+        :rtype: tuple
+        """
+        variables = {}
+        includes = set()
+        unread = [(file_name, file_key)]
+        while unread:
+            name, key = unread.pop()
+            if key in includes:
+                continue
+            includes.add(key)
+            file_variables, references = self._parse(env, name, key)
+            if references is None:
+                return None, None
+            for variable, items in file_variables.items():
+                if variable not in variables:
+                    variables[variable] = items
+                elif items is None or variables[variable] is None:
+                    variables[variable] = None
+                else:
+                    variables[variable] = variables[variable] | items
+            for reference in references:
+                path = os.path.join(directory_path, reference)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    return None, None
+                unread.append(
+                    (reference, (path, stat.st_mtime, stat.st_size))
+                )
+        includes.discard(file_key)
+        return variables, tuple(sorted(includes))
+
+    def _parse(self, env, file_name, file_key):
+        """
+        Returns the template variables a single config file uses, and the
+        names of the templates it includes or imports.
+
+        :param env: The Jinja environment of the file's directory.
+        :type env: jinja2.Environment
+        :param file_name: The name of the file.
+        :type file_name: str
+        :param file_key: The file's path, modification time and size.
+        :type file_key: tuple
+        :returns: The names of the items of each variable which the file \
+            reads, or None for a variable which is read dynamically, keyed \
+            by variable name, and the names of the templates the file \
+            includes or imports, or None if any name is dynamic.
+        :rtype: tuple
+        """
+        with self._lock:
+            if file_key in self._variables:
+                return self._variables[file_key]
+        source = env.loader.get_source(env, file_name)[0]
+        template = env.parse(source)
+        variables = dict(
+            (name, self._get_items(template, name))
+            for name in meta.find_undeclared_variables(template)
+        )
+        references = list(meta.find_referenced_templates(template))
+        if None in references:
+            references = None
+        with self._lock:
+            self._variables[file_key] = (variables, references)
+        return variables, references
+
+    @staticmethod
+    def _get_items(template, name):
+        """
+        Returns the items of the variable ``name`` which ``template`` reads
+        with constant attribute or subscript lookups, such as ``var.region``
+        or ``environment_variable["HOME"]``.
+
+        :param template: The parsed template.
+        :type template: jinja2.nodes.Template
+        :param name: The name of the variable.
+        :type name: str
+        :returns: The names of the items, or None if the variable is used \
+            in any other way.
+        :rtype: set
+        """
+        lookups = list(template.find_all((nodes.Getattr, nodes.Getitem)))
+        looked_up = set(id(lookup.node) for lookup in lookups)
+        if any(
+            id(node) not in looked_up
+            for node in template.find_all(nodes.Name) if node.name == name
+        ):
+            return None
+        called = set(id(call.node) for call in template.find_all(nodes.Call))
+        items = set()
+        for lookup in lookups:
+            if not isinstance(lookup.node, nodes.Name) or \
+                    lookup.node.name != name:
+                continue
+            if id(lookup) in called:
+                return None
+            if isinstance(lookup, nodes.Getattr):
+                items.add(lookup.attr)
+            elif isinstance(lookup.arg, nodes.Const):
+                items.add(lookup.arg.value)
+            else:
+                return None
+        return items
+
+    @staticmethod
+    def _hash(variables, items):
+        """
+        Returns a hash of ``items`` of ``variables``.
+
+        :param variables: A dict of variables.
+        :type variables: dict
+        :param items: The names of the items to hash, or None to hash every \
+            item.
+        :type items: set
+        :returns: The hex digest of the items' hash.
+        :rtype: str
+        """
+        if items is None:
+            items = variables.keys()
+        values = sorted(
+            (repr(item), variables[item]) for item in items
+            if item in variables
+        )
+        return hashlib.sha256(
+            json.dumps(values, default=repr).encode("utf-8")
+        ).hexdigest()
+
+
+config_file_cache = ConfigFileCache()
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+
+"""
+sceptre.config_index
+
+This module implements a ConfigIndex class, which stores the layout of a
+Sceptre project's config directory.
+"""
+
+import logging
+import os
+import threading
+
+
+def is_directory_loop(directory, name):
+    """
+    Returns whether the sub-directory ``name`` of ``directory`` links back to
+    ``directory`` or one of its parents, which would make a walk which
+    follows symlinks loop forever.
+
+    :param directory: The directory being walked.
+    :type directory: str
+    :param name: The name of the sub-directory.
+    :type name: str
+    :returns: Whether the sub-directory is a loop.
+    :rtype: bool
+    """
+    target = os.path.realpath(os.path.join(directory, name))
+    real_directory = os.path.realpath(directory)
+    return real_directory == target or \
+        real_directory.startswith(target + os.sep)
+
+
+class ConfigIndex(object):
+    """
+    ConfigIndex stores which stacks and sub-environments each environment
+    under ``environment_path`` contains.
+
+    The index is built the first time it is queried, by a single walk of the
+    environment's directory tree. Only directory entries are read, so no
+    config files are opened. As with shell globbing, entries whose names
+    start with a "." are ignored.
+
+    :param sceptre_dir: The absolute path to the Sceptre directory.
+    :type sceptre_dir: str
+    :param environment_path: The path of the top level environment to index.
+    :type environment_path: str
+    :param entries: A previously built index, such as one loaded from a \
+        project snapshot.
+    :type entries: dict
+    """
+
+    def __init__(self, sceptre_dir, environment_path, entries=None):
+        self.logger = logging.getLogger(__name__)
+
+        self.sceptre_dir = sceptre_dir
+        self.environment_path = environment_path
+        self._entries = entries
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return (
+            "sceptre.config_index.ConfigIndex(sceptre_dir='{0}', "
+            "environment_path='{1}')".format(
+                self.sceptre_dir, self.environment_path
+            )
+        )
+
+    @property
+    def entries(self):
+        """
+        Returns the index.
+
+        :returns: A tuple of the full names of an environment's stacks and \
+            the paths of its sub-environments, keyed by environment path.
+        :rtype: dict
+        """
+        with self._lock:
+            if self._entries is None:
+                self._entries = self._walk()
+            return self._entries
+
+    def is_leaf(self, environment_path):
+        """
+        Returns a boolean indicating if the environment contains no
+        sub-environments.
+
+        :param environment_path: The path of the environment.
+        :type environment_path: str
+        :returns: Whether the environment is a leaf environment.
+        :rtype: bool
+        """
+        return not self.get_environment_paths(environment_path)
+
+    def get_stack_names(self, environment_path):
+        """
+        Returns the full names of the stacks in an environment.
+
+        :param environment_path: The path of the environment.
+        :type environment_path: str
+        :returns: A list of stack names.
+        :rtype: list
+        """
+        return list(self.entries.get(environment_path, ((), ()))[0])
+
+    def get_environment_paths(self, environment_path):
+        """
+        Returns the paths of an environment's sub-environments.
+
+        :param environment_path: The path of the environment.
+        :type environment_path: str
+        :returns: A list of environment paths.
+        :rtype: list
+        """
+        return list(self.entries.get(environment_path, ((), ()))[1])
+
+    def _walk(self):
+        """
+        Walks the environment's directory tree.
+
+        :returns: The index.
+        :rtype: dict
+        """
+        config_dir = os.path.join(self.sceptre_dir, "config")
+        root = os.path.join(config_dir, self.environment_path)
+        self.logger.debug("Indexing config directory '%s'", root)
+
+        entries = {}
+        for directory, sub_directories, file_names in os.walk(
+            root, followlinks=True
+        ):
+            sub_directories[:] = sorted(
+                name for name in sub_directories
+                if not name.startswith(".")
+                and not is_directory_loop(directory, name)
+            )
+            path = os.path.relpath(directory, config_dir).replace(os.sep, "/")
+            stack_names = sorted(
+                "/".join([path, os.path.splitext(file_name)[0]])
+                for file_name in file_names
+                if file_name.endswith(".yaml")
+                and not file_name.startswith(".")
+                and file_name != "config.yaml"
+            )
+            environment_paths = [
+                "/".join([path, name]) for name in sub_directories
+            ]
+            entries[path] = (tuple(stack_names), tuple(environment_paths))
+        return entries
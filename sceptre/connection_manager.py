@@ -15,45 +15,72 @@ import time
 import boto3
 from botocore.exceptions import ClientError
 
+from .describe_cache import DescribeCache
+from .describe_cache import MUTATING_COMMANDS
 from .helpers import mask_key
+from .exceptions import RetryBudgetExhaustedError
 from .exceptions import RetryLimitExceededError
+from .retry import default_retry_policy
 
 
 def _retry_boto_call(func):
     """
-    Retries a Boto3 call up to 30 times if request rate limits are hit.
+    Retries a Boto3 call while it fails with retryable errors, such as
+    request rate limits being hit or transient service errors.
 
-    The time waited between retries increases linearly. If rate limits are
-    hit 30 times, _retry_boto_call raises a
-    sceptre.exceptions.RetryLimitExceededException.
+    Which errors are retried, how long to wait between attempts and how many
+    attempts to make are decided by the ``retry_policy`` of the connection
+    manager the call is made through, or by the default RetryPolicy. If the
+    policy gives up, _retry_boto_call raises a
+    sceptre.exceptions.RetryLimitExceededException, or a
+    sceptre.exceptions.RetryBudgetExhaustedError if the policy's retry budget
+    ran out before its attempts did.
 
     :param func: a function that uses boto calls
     :type func: function
     :returns: The decorated function.
     :rtype: function
     :raises: sceptre.exceptions.RetryLimitExceededException
+    :raises: sceptre.exceptions.RetryBudgetExhaustedError
     """
     logger = logging.getLogger(__name__)
 
     @functools.wraps(func)
     def decorated(*args, **kwargs):
-        max_retries = 30
+        policy = getattr(args[0], "retry_policy", None) if args else None
+        if policy is None:
+            policy = default_retry_policy
+        service = kwargs.get("service", args[1] if len(args) > 1 else None)
         attempts = 1
-        while attempts < max_retries:
+        while True:
             try:
-                return func(*args, **kwargs)
+                response = func(*args, **kwargs)
             except ClientError as e:
-                if e.response["Error"]["Code"] == "Throttling":
-                    logger.error("Request limit exceeded, pausing...")
-                    time.sleep(attempts)
-                    attempts += 1
-                else:
+                if not policy.is_retryable(service, e):
                     raise
-        raise RetryLimitExceededError(
-            "Exceeded request limit {0} times. Aborting.".format(
-                max_retries
-            )
-        )
+                if not policy.can_retry(attempts):
+                    if attempts < policy.max_attempts:
+                        raise RetryBudgetExhaustedError(
+                            "Retry budget exhausted after {0} attempts. "
+                            "Aborting.".format(attempts)
+                        )
+                    raise RetryLimitExceededError(
+                        "Exceeded request limit {0} times. Aborting.".format(
+                            attempts
+                        )
+                    )
+                code = e.response["Error"].get("Code")
+                delay = policy.get_delay(attempts)
+                logger.warning(
+                    "%s returned %s, retrying in %.2f seconds...",
+                    service, code, delay
+                )
+                policy.metrics.record_retry(service, code, delay)
+                time.sleep(delay)
+                attempts += 1
+            else:
+                policy.record_success()
+                return response
 
     return decorated
 
@@ -63,20 +90,33 @@ class ConnectionManager(object):
     The Connection Manager should be used to create boto3 clients for
     the various AWS services that we need to interact with.
 
+    ``describe_stacks`` responses for single stacks are cached in
+    ``describe_cache``, which is shared by every ConnectionManager in the
+    process, for the rest of the run.
+
+    Calls which fail with retryable errors are retried according to
+    ``retry_policy``.
+
     :param iam_role: The iam_role that should be assumed in the account.
     :type iam_role: str
     :param region: The region to use.
     :type region: str
+    :param retry_policy: The policy used to retry failed calls. Defaults to \
+        the default RetryPolicy.
+    :type retry_policy: sceptre.retry.RetryPolicy
     """
 
     _session_lock = threading.Lock()
     _client_lock = threading.Lock()
 
-    def __init__(self, region, iam_role=None):
+    describe_cache = DescribeCache()
+
+    def __init__(self, region, iam_role=None, retry_policy=None):
         self.logger = logging.getLogger(__name__)
 
         self.region = region
         self.iam_role = iam_role
+        self.retry_policy = retry_policy or default_retry_policy
         self._boto_session = None
 
         self.clients = {}
@@ -196,4 +236,79 @@ class ConnectionManager(object):
         if kwargs is None:  # pragma: no cover
             kwargs = {}
         client = self._get_client(service)
-        return getattr(client, command)(**kwargs)
+        cache_key = self._get_describe_cache_key(service, command, kwargs)
+        if cache_key is None:
+            return getattr(client, command)(**kwargs)
+
+        if command == "describe_stacks":
+            return self.describe_cache.get_or_load(
+                cache_key, lambda: client.describe_stacks(**kwargs)
+            )
+
+        self.describe_cache.invalidate(cache_key)
+        try:
+            return getattr(client, command)(**kwargs)
+        finally:
+            self.describe_cache.invalidate(cache_key)
+
+    def _get_describe_cache_key(self, service, command, kwargs):
+        """
+        Returns the key of the stack in the describe cache which ``command``
+        reads or changes, or None if the command does not use the cache.
+
+        Only ``describe_stacks`` calls for a single stack are cached, and
+        commands which start an operation on a stack invalidate it.
+
+        :param service: The Boto3 service.
+        :type service: str
+        :param command: The Boto3 command.
+        :type command: str
+        :param kwargs: The keyword arguments supplied to <command>.
+        :type kwargs: dict
+        :returns: The cache key.
+        :rtype: tuple
+        """
+        if service != "cloudformation" or "StackName" not in kwargs:
+            return None
+        if command == "describe_stacks":
+            if set(kwargs) != set(["StackName"]):
+                return None
+        elif command not in MUTATING_COMMANDS:
+            return None
+        return self.get_describe_cache_key(kwargs["StackName"])
+
+    def get_describe_cache_key(self, stack_name):
+        """
+        Returns the key under which descriptions of the stack ``stack_name``
+        made by this connection manager are cached.
+
+        :param stack_name: The external name of the stack.
+        :type stack_name: str
+        :returns: The cache key.
+        :rtype: tuple
+        """
+        return (self.region, self.iam_role, stack_name)
+
+    def paginate(self, service, command, kwargs=None):
+        """
+        Makes a Boto3 client call, following ``NextToken`` until every page
+        of results has been returned. Each page is requested with ``call``,
+        so is retried if request rate limits are hit.
+
+        :param service: The Boto3 service to return a client for.
+        :type service: str
+        :param command: The Boto3 command to call.
+        :type command: str
+        :param kwargs: The keyword arguments to supply to <command>.
+        :type kwargs: dict
+        :returns: A generator of the responses for each page.
+        :rtype: generator
+        """
+        kwargs = dict(kwargs or {})
+        while True:
+            response = self.call(service, command, dict(kwargs))
+            yield response
+            next_token = response.get("NextToken")
+            if not next_token:
+                return
+            kwargs["NextToken"] = next_token
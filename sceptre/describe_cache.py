@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+
+"""
+sceptre.describe_cache
+
+This module implements a DescribeCache class, which stores the responses of
+``describe_stacks`` calls for the duration of a Sceptre run.
+"""
+
+from concurrent.futures import Future
+import logging
+import threading
+
+
+MUTATING_COMMANDS = frozenset([
+    "cancel_update_stack",
+    "continue_update_rollback",
+    "create_stack",
+    "delete_stack",
+    "execute_change_set",
+    "update_stack"
+])
+
+
+class DescribeCache(object):
+    """
+    DescribeCache stores ``describe_stacks`` responses, keyed by the region,
+    IAM role and name of the described stack.
+
+    Only responses for stacks which are not in progress are stored, as
+    their status cannot change until an operation is started on them. The
+    entries for a stack are invalidated, under every region and IAM role,
+    whenever Sceptre starts such an operation, so stacks launched or deleted
+    by this run are never stale. Each invalidation advances ``version``, and
+    responses requested before a stack's last invalidation are not stored.
+
+    Concurrent lookups of the same stack are de-duplicated: only the first
+    makes a call, and the others wait for its response.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+        self._responses = {}
+        self._loading = {}
+        self._invalidated = {}
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "sceptre.describe_cache.DescribeCache()"
+
+    @property
+    def version(self):
+        """
+        Returns the number of invalidations made so far. Callers which
+        describe stacks outside ``get_or_load`` read it before making their
+        call, and pass it to ``set``.
+
+        :returns: The cache's version.
+        :rtype: int
+        """
+        with self._lock:
+            return self._version
+
+    def get(self, key):
+        """
+        Returns the cached response for ``key``.
+
+        :param key: A tuple of the region, IAM role and stack name.
+        :type key: tuple
+        :returns: The cached response, or None.
+        :rtype: dict
+        """
+        with self._lock:
+            return self._responses.get(key)
+
+    def get_or_load(self, key, load):
+        """
+        Returns the cached response for ``key``, calling ``load`` to fetch
+        and cache it if there is none. If another thread is already loading
+        ``key``, waits for and returns its response instead.
+
+        :param key: A tuple of the region, IAM role and stack name.
+        :type key: tuple
+        :param load: A function which returns a ``describe_stacks`` response.
+        :type load: function
+        :returns: The response.
+        :rtype: dict
+        """
+        with self._lock:
+            response = self._responses.get(key)
+            if response is not None:
+                return response
+            future = self._loading.get(key)
+            is_loader = future is None
+            if is_loader:
+                future = self._loading[key] = Future()
+        if not is_loader:
+            return future.result()
+
+        try:
+            response = load()
+        except Exception as exp:
+            with self._lock:
+                if self._loading.get(key) is future:
+                    del self._loading[key]
+            future.set_exception(exp)
+            raise
+        with self._lock:
+            if self._loading.get(key) is future:
+                del self._loading[key]
+                self._set(key, response)
+        future.set_result(response)
+        return response
+
+    def set(self, key, response, version=None):
+        """
+        Caches ``response`` under ``key``, unless the described stack is in
+        progress, or has been invalidated since the response was requested.
+
+        :param key: A tuple of the region, IAM role and stack name.
+        :type key: tuple
+        :param response: A ``describe_stacks`` response.
+        :type response: dict
+        :param version: The cache's ``version`` when the response was \
+            requested. Defaults to the current version.
+        :type version: int
+        """
+        with self._lock:
+            if version is None or \
+                    self._invalidated.get(key[2], 0) <= version:
+                self._set(key, response)
+
+    def invalidate(self, key):
+        """
+        Removes the cached responses for the stack named in ``key``, under
+        every region and IAM role. The responses of lookups of the stack
+        which are in flight will not be cached.
+
+        :param key: A tuple of the region, IAM role and stack name.
+        :type key: tuple
+        """
+        stack_name = key[2]
+        with self._lock:
+            self._version += 1
+            self._invalidated[stack_name] = self._version
+            for loading_key in list(self._loading):
+                if loading_key[2] == stack_name:
+                    del self._loading[loading_key]
+            for cached_key in list(self._responses):
+                if cached_key[2] == stack_name:
+                    del self._responses[cached_key]
+                    self.logger.debug(
+                        "Invalidated cached description of %s", cached_key
+                    )
+
+    def clear(self):
+        """
+        Removes every cached response.
+        """
+        with self._lock:
+            self._loading.clear()
+            self._responses.clear()
+            self._invalidated.clear()
+
+    def _set(self, key, response):
+        """
+        Caches ``response`` under ``key`` unless the described stack is in
+        progress. Must be called with the lock held.
+
+        :param key: A tuple of the region, IAM role and stack name.
+        :type key: tuple
+        :param response: A ``describe_stacks`` response.
+        :type response: dict
+        """
+        stacks = response.get("Stacks") or [{}]
+        if not stacks[0].get("StackStatus", "").endswith("_IN_PROGRESS"):
+            self._responses[key] = response
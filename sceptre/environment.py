@@ -8,26 +8,39 @@ represent a logical grouping of stacks as an environment.
 
 """
 
-from glob import glob
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import json
 import logging
-import os
-import threading
 
 import botocore
 
-from concurrent.futures import ThreadPoolExecutor, wait
-
-from .exceptions import CircularDependenciesError
-from .exceptions import StackDoesNotExistError
-
+from .cache import StackDurations
+from .cache import StackFingerprints
 from .config import Config
+from .config_index import ConfigIndex
 from .connection_manager import ConnectionManager
+from .graph import StackGraph
 from .exceptions import InvalidEnvironmentPathError
+from .exceptions import RenderedTemplateError
 from .helpers import recurse_into_sub_environments, get_name_tuple
+from .poller import StatusPoller
+from .poller import get_stack_statuses
+from .render_pool import get_render_pool
+from .rendered import read_rendered_templates
+from .rendered import write_rendered_templates
+from .retry import RetryPolicy
+from .scheduler import FailurePolicy
+from .snapshot import ProjectSnapshot
+from .scheduler import StackScheduler
 from .stack import Stack
 from .stack_status import StackStatus
 
 
+# Environments with at least this many stacks describe them all up front.
+BULK_DESCRIBE_THRESHOLD = 10
+
+
 class Environment(object):
     """
     Environment stores information about the current environment.
@@ -42,26 +55,43 @@ class Environment(object):
     This is done using the
     ``sceptre.helpers.recurse_into_sub_environments`` decorator.
 
+    Sub-environments, stacks and the environment's config are loaded lazily,
+    the first time they are accessed. The layout of the config directory is
+    read once, into a sceptre.config_index.ConfigIndex which is shared with
+    the environment's sub-environments. Retry policies are also shared with
+    sub-environments, so environments with the same ``retry`` config use a
+    single sceptre.retry.RetryPolicy, and a single retry budget, for the
+    whole run.
+
     :param sceptre_dir: The absolute path to the Sceptre directory.
     :type project dir: str
     :param environment_path: The name of the environment.
     :type environment_path: str
     :param options: A dict of key-value pairs to update self.config with.
     :type debug: dict
+    :param config_index: An index of the config directory. Defaults to an \
+        index of ``environment_path``.
+    :type config_index: sceptre.config_index.ConfigIndex
+    :param retry_policies: The retry policies of the run, keyed by their \
+        config. Defaults to the policies of a new run.
+    :type retry_policies: dict
     """
-    def __init__(self, sceptre_dir, environment_path, options=None):
+    def __init__(
+            self, sceptre_dir, environment_path, options=None,
+            config_index=None, retry_policies=None
+    ):
         self.logger = logging.getLogger(__name__)
 
         self.sceptre_dir = sceptre_dir
         self.path = self._validate_path(environment_path)
         self._options = {} if options is None else options
+        self._config_index = config_index
+        self._retry_policies = {} if retry_policies is None \
+            else retry_policies
 
         self._is_leaf = None
-
-        if self.is_leaf:
-            self.stacks = self._load_stacks()
-        else:
-            self.environments = self._load_environments()
+        self._stacks = None
+        self._environments = None
 
     def __repr__(self):
         return (
@@ -105,64 +135,234 @@ class Environment(object):
         :returns: bool
         """
         if self._is_leaf is None:
-            self._is_leaf = all([
-                os.path.isfile(path)
-                for path in glob(os.path.join(
-                    self.sceptre_dir, "config", self.path, "*"
-                ))
-            ])
+            self._is_leaf = self.config_index.is_leaf(self.path)
         return self._is_leaf
 
-    def launch(self):
+    @property
+    def config_index(self):
+        """
+        Returns the index of the config directory.
+
+        :returns: The config index.
+        :rtype: sceptre.config_index.ConfigIndex
+        """
+        if self._config_index is None:
+            self._config_index = ConfigIndex(self.sceptre_dir, self.path)
+        return self._config_index
+
+    @property
+    def stacks(self):
+        """
+        Returns the stacks in a leaf environment, loading them on first
+        access.
+
+        :returns: The environment's stacks, keyed by the stack's base name.
+        :rtype: dict
+        """
+        if self._stacks is None:
+            self._stacks = self._load_stacks()
+        return self._stacks
+
+    @stacks.setter
+    def stacks(self, stacks):
+        self._stacks = stacks
+
+    @property
+    def environments(self):
+        """
+        Returns the sub-environments of a non-leaf environment, initialising
+        them on first access.
+
+        :returns: The environment's sub-environments, keyed by the \
+            environment's path.
+        :rtype: dict
+        """
+        if self._environments is None:
+            self._environments = self._load_environments()
+        return self._environments
+
+    @environments.setter
+    def environments(self, environments):
+        self._environments = environments
+
+    def launch(
+            self, max_concurrency=None, explain_schedule=False,
+            incremental=False, on_failure=FailurePolicy.CONTINUE,
+            rendered_dir=None
+    ):
         """
         Creates or updates all stacks in the environment.
 
+        In incremental mode, stacks whose fingerprint matches the fingerprint
+        recorded when they were last launched are skipped. A stack's
+        fingerprint includes the fingerprints of its dependencies, so every
+        stack downstream of a changed stack is launched.
+
+        If ``rendered_dir`` is given, stacks are launched with the templates
+        written there by ``generate``, rather than rendering them.
+
+        :param max_concurrency: The maximum number of stacks to launch at \
+            once.
+        :type max_concurrency: int
+        :param explain_schedule: Whether to log the order in which stacks \
+            are prioritised.
+        :type explain_schedule: bool
+        :param incremental: Whether to skip unchanged stacks.
+        :type incremental: bool
+        :param on_failure: The sceptre.scheduler.FailurePolicy to apply \
+            when a stack does not complete.
+        :type on_failure: str
+        :param rendered_dir: A directory of pre-rendered templates.
+        :type rendered_dir: str
         :returns: dict
+        :raises: sceptre.exceptions.RenderedTemplateError
         """
         self.logger.debug("Launching environment '%s'", self.path)
-        threading_events = self._get_threading_events()
+        if rendered_dir is not None:
+            self._use_rendered_templates(rendered_dir)
         stack_statuses = self._get_initial_statuses()
         launch_dependencies = self._get_launch_dependencies(self.path)
 
-        self._check_for_circular_dependencies(launch_dependencies)
+        self._check_dependencies(launch_dependencies)
         self._build(
-            "launch", threading_events, stack_statuses, launch_dependencies
+            "launch", stack_statuses, launch_dependencies,
+            max_concurrency, explain_schedule, incremental, on_failure
         )
         return stack_statuses
 
-    def delete(self):
+    def delete(
+            self, max_concurrency=None, explain_schedule=False,
+            on_failure=FailurePolicy.CONTINUE
+    ):
         """
         Deletes all stacks in the environment.
 
+        :param max_concurrency: The maximum number of stacks to delete at \
+            once.
+        :type max_concurrency: int
+        :param explain_schedule: Whether to log the order in which stacks \
+            are prioritised.
+        :type explain_schedule: bool
+        :param on_failure: The sceptre.scheduler.FailurePolicy to apply \
+            when a stack does not complete.
+        :type on_failure: str
         :returns: dict
         """
         self.logger.debug("Deleting environment '%s'", self.path)
-        threading_events = self._get_threading_events()
         stack_statuses = self._get_initial_statuses()
         delete_dependencies = self._get_delete_dependencies()
 
-        self._check_for_circular_dependencies(delete_dependencies)
+        self._check_dependencies(delete_dependencies)
         self._build(
-            "delete", threading_events, stack_statuses, delete_dependencies
+            "delete", stack_statuses, delete_dependencies,
+            max_concurrency, explain_schedule, on_failure=on_failure
         )
         return stack_statuses
 
-    @recurse_into_sub_environments
+    def generate(self, out_dir, max_concurrency=None):
+        """
+        Renders the template of every stack in the environment, and writes
+        them to ``out_dir`` along with a manifest of their hashes and sizes.
+
+        Templates are rendered in parallel, each by a single resolution of
+        its stack's sceptre_user_data.
+
+        :param out_dir: The directory to write the templates to.
+        :type out_dir: str
+        :param max_concurrency: The maximum number of templates to render \
+            at once.
+        :type max_concurrency: int
+        :returns: The manifest.
+        :rtype: dict
+        """
+        self.logger.debug(
+            "Rendering environment '%s' to %s", self.path, out_dir
+        )
+        stacks = self._get_stacks()
+        self._start_render_pools(stacks.values())
+        with ThreadPoolExecutor(
+            max_workers=max_concurrency or max(len(stacks), 1)
+        ) as executor:
+            futures = {
+                stack_name: executor.submit(self._render_template, stack)
+                for stack_name, stack in stacks.items()
+            }
+            bodies = {
+                stack_name: future.result()
+                for stack_name, future in futures.items()
+            }
+        return write_rendered_templates(out_dir, self.path, bodies)
+
+    def compile(self):
+        """
+        Reads the config of every stack in the environment, and writes a
+        snapshot of the config tree, the parsed config files and the plugins
+        to the project's cache directory.
+
+        :returns: A summary of the snapshot, with the dependencies of each \
+            stack.
+        :rtype: dict
+        """
+        self.logger.debug("Compiling environment '%s'", self.path)
+        dependencies = dict(
+            (stack_name, sorted(stack.dependencies))
+            for stack_name, stack in self._get_stacks().items()
+        )
+        response = ProjectSnapshot(self.sceptre_dir).write(
+            self.path, self.config_index.entries
+        )
+        response["dependencies"] = dependencies
+        return response
+
+    def plan(self, command="launch", max_concurrency=None):
+        """
+        Returns the plan for launching or deleting the environment, without
+        making any calls to AWS.
+
+        :param command: The command to plan. Can be (launch | delete).
+        :type command: str
+        :param max_concurrency: The maximum number of stacks to run at once \
+            when estimating the duration of the run.
+        :type max_concurrency: int
+        :returns: The execution plan.
+        :rtype: dict
+        """
+        self.logger.debug(
+            "Planning %s of environment '%s'", command, self.path
+        )
+        if command == "delete":
+            dependencies = self._get_delete_dependencies()
+        else:
+            dependencies = self._get_launch_dependencies(self.path)
+
+        self._check_dependencies(dependencies)
+        scheduler = StackScheduler(
+            stacks=self._get_stacks(),
+            dependencies=dependencies,
+            max_concurrency=max_concurrency,
+            durations=StackDurations(self.sceptre_dir).get_durations(command)
+        )
+        plan = {"environment": self.path, "command": command}
+        plan.update(scheduler.plan())
+        return plan
+
     def describe(self):
         """
         Returns each stack's status.
 
+        Rather than describing stacks one at a time, every stack in each
+        account and region used by the environment and its sub-environments
+        is described with a single paginated call. Stacks which do not exist
+        are reported as PENDING.
+
         :returns: The stack status of each stack, keyed by the stack's name.
         :rtype: dict
         """
-        response = {}
-        for stack in self.stacks.values():
-            try:
-                status = stack.get_status()
-            except StackDoesNotExistError:
-                status = "PENDING"
-            response.update({stack.name: status})
-        return response
+        return {
+            stack_name: "PENDING" if status is None else status
+            for stack_name, status
+            in get_stack_statuses(self._get_stacks().values()).items()
+        }
 
     @recurse_into_sub_environments
     def describe_resources(self):
@@ -185,86 +385,265 @@ class Environment(object):
                     raise
         return response
 
-    @recurse_into_sub_environments
-    def _build(self, command, threading_events, stack_statuses, dependencies):
+    def _build(
+            self, command, stack_statuses, dependencies,
+            max_concurrency=None, explain_schedule=False, incremental=False,
+            on_failure=FailurePolicy.CONTINUE
+    ):
         """
         Launches or deletes all stacks in the environment.
 
         Whether the stack is launched or delete depends on the value of
-        <command>. It does this by calling stack.<command>() for
-        each stack in the environment. Stack.<command>() is blocking, because
-        it waits for the stack to be built, so each command is run on a
-        separate thread. As some stacks need to be built before others,
-        depending on their depedencies, threading.Events() are used to notify
-        the other stacks when a particular stack is done building.
+        <command>. Every stack in the environment and its sub-environments is
+        handed to a single sceptre.scheduler.StackScheduler, which runs
+        stack.<command>() on a bounded pool of worker threads once each
+        stack's dependencies have completed. Stacks are prioritised using the
+        durations recorded by previous runs, and the durations observed in
+        this run are recorded for the next one. While the command runs, the
+        stacks wait for their operations to finish through a shared
+        sceptre.poller.StatusPoller. Large environments are described up
+        front with bulk calls, to fill the describe cache.
 
         :param command: The stack command to run. Can be (launch | delete).
         :type command: str
-        """
-        num_stacks = len(self.stacks)
-        with ThreadPoolExecutor(max_workers=num_stacks) as executor:
-            futures = [
-                executor.submit(
-                    self._manage_stack_build, stack,
-                    command, threading_events, stack_statuses, dependencies
+        :param stack_statuses: A dict of stack statuses, keyed by stack name.
+        :type stack_statuses: dict
+        :param dependencies: A list of the stacks that a particular stack \
+            depends on, keyed by that stack's name.
+        :type dependencies: dict
+        :param max_concurrency: The maximum number of stack commands to run \
+            at once.
+        :type max_concurrency: int
+        :param explain_schedule: Whether to log the order in which stacks \
+            are prioritised.
+        :type explain_schedule: bool
+        :param incremental: Whether to skip unchanged stacks when launching.
+        :type incremental: bool
+        :param on_failure: The sceptre.scheduler.FailurePolicy to apply \
+            when a stack does not complete.
+        :type on_failure: str
+        """
+        durations = StackDurations(self.sceptre_dir)
+        stacks = self._get_stacks()
+        self._start_render_pools(stacks.values())
+        if len(stacks) >= BULK_DESCRIBE_THRESHOLD:
+            self._prefetch_descriptions(stacks.values())
+        scheduler = StackScheduler(
+            stacks=stacks,
+            dependencies=dependencies,
+            max_concurrency=max_concurrency,
+            durations=durations.get_durations(command),
+            on_failure=on_failure
+        )
+        if explain_schedule:
+            for item in scheduler.explain():
+                self.logger.info(
+                    "Schedule %(rank)d - %(stack)s - priority: %(priority)s, "
+                    "duration: %(duration)s", item
                 )
-                for stack in self.stacks.values()
-            ]
-            wait(futures)
 
-    def _manage_stack_build(
-            self, stack, command, threading_events,
-            stack_statuses, dependencies
-    ):
+        skipped = set()
+        status_poller = StatusPoller()
+        for stack in stacks.values():
+            stack.status_poller = status_poller
+        try:
+            if incremental:
+                fingerprints = StackFingerprints(self.sceptre_dir)
+                try:
+                    scheduler.run(
+                        functools.partial(
+                            self._launch_if_changed,
+                            fingerprints=fingerprints,
+                            computed_fingerprints={}, skipped=skipped
+                        ),
+                        stack_statuses
+                    )
+                finally:
+                    fingerprints.save()
+            else:
+                scheduler.run(command, stack_statuses)
+        finally:
+            for stack in stacks.values():
+                stack.status_poller = None
+
+        durations.record(command, {
+            stack_name: duration
+            for stack_name, duration in scheduler.observed_durations.items()
+            if stack_name not in skipped
+        })
+        durations.save()
+
+    @staticmethod
+    def _start_render_pools(stacks):
         """
-        Manages the launch or deletion of a stack.
+        Starts the render pools used by ``stacks``, so that their worker
+        processes are forked before any worker or poller threads are
+        started.
 
-        Waits for any stacks that ``stack`` depends on to complete, runs
-        ``stack.command()``, and then marks ``stack`` as complete. If a
-        dependency stack has failed, ``stack`` is marked as failed.
+        :param stacks: The stacks whose render pools to start.
+        :type stacks: list
+        """
+        for render_processes in set(
+            stack.environment_config.get("render_processes")
+            for stack in stacks
+        ):
+            if render_processes:
+                get_render_pool(render_processes).start()
 
-        :param stack: The stack to build.
-        :type: sceptre.Stack
-        :param threading_events: A dict of threading.Events, keyed by stack \
-        names, which is used to notify other stacks when a particular stack \
-        has been built.
-        :type events: dict
-        :param command: The stack command to run. Can be either "launch" or \
-        "delete".
-        :type command: str
+    def _prefetch_descriptions(self, stacks):
+        """
+        Describes ``stacks`` with one paginated call per account and region,
+        which fills the describe cache so that the stacks' status and output
+        lookups do not each make a call.
+
+        :param stacks: The stacks to describe.
+        :type stacks: list
         """
-        for dependency in dependencies[stack.name]:
-            threading_events[dependency].wait()
-            if stack_statuses[dependency] != StackStatus.COMPLETE:
-                self.logger.debug(
-                    "%s, which %s depends is not complete. Marking "
-                    "%s as failed.", dependency, stack.name, dependency
+        self.logger.debug("Prefetching descriptions of %d stacks", len(stacks))
+        try:
+            get_stack_statuses(stacks)
+        except botocore.exceptions.ClientError as exp:
+            self.logger.debug("Failed to prefetch descriptions: %s", exp)
+
+    @staticmethod
+    def _render_template(stack):
+        """
+        Renders the template of ``stack``.
+
+        :param stack: The stack to render.
+        :type stack: sceptre.stack.Stack
+        :returns: The body of the stack's template.
+        :rtype: str
+        """
+        return stack.template.body
+
+    def _use_rendered_templates(self, rendered_dir):
+        """
+        Sets the template of every stack in the environment to the template
+        written to ``rendered_dir`` by ``generate``.
+
+        :param rendered_dir: A directory of pre-rendered templates.
+        :type rendered_dir: str
+        :raises: sceptre.exceptions.RenderedTemplateError
+        """
+        bodies = read_rendered_templates(rendered_dir)
+        stacks = self._get_stacks()
+        missing = sorted(set(stacks) - set(bodies))
+        if missing:
+            raise RenderedTemplateError(
+                "{0} has no rendered templates for: {1}".format(
+                    rendered_dir, ", ".join(missing)
                 )
-                stack_statuses[stack.name] = StackStatus.FAILED
+            )
+        for stack_name, stack in stacks.items():
+            stack.use_rendered_template(bodies[stack_name])
 
-        if stack_statuses[stack.name] != StackStatus.FAILED:
-            try:
-                status = getattr(stack, command)()
-                stack_statuses[stack.name] = status
-            except Exception:
-                stack_statuses[stack.name] = StackStatus.FAILED
-                self.logger.exception(
-                    "Stack %s failed to %s", stack.name, command
+    def _launch_if_changed(
+            self, stack, fingerprints, computed_fingerprints, skipped
+    ):
+        """
+        Launches ``stack`` unless its fingerprint matches the fingerprint
+        recorded when it was last launched, it is still in a complete state,
+        and it has not been replaced or updated since, for example from
+        another checkout or in another account.
+
+        :param stack: The stack to launch.
+        :type stack: sceptre.stack.Stack
+        :param fingerprints: The fingerprints recorded by previous launches.
+        :type fingerprints: sceptre.cache.StackFingerprints
+        :param computed_fingerprints: The fingerprints computed in this run, \
+            keyed by stack name.
+        :type computed_fingerprints: dict
+        :param skipped: A set to which the names of skipped stacks are added.
+        :type skipped: set
+        :returns: The stack's status.
+        :rtype: sceptre.stack_status.StackStatus
+        """
+        recorded = self._get_recorded_launch(fingerprints, stack.name)
+        fingerprint = stack.get_fingerprint({
+            dependency: computed_fingerprints.get(
+                dependency,
+                self._get_recorded_launch(
+                    fingerprints, dependency
+                ).get("fingerprint")
+            )
+            for dependency in stack.dependencies
+        })
+        computed_fingerprints[stack.name] = fingerprint
+
+        if fingerprint == recorded.get("fingerprint"):
+            existing_status, deployment = self._get_deployment(stack)
+            if existing_status.endswith("_COMPLETE") and \
+                    not existing_status.endswith("ROLLBACK_COMPLETE") and \
+                    deployment == recorded.get("deployment"):
+                self.logger.info(
+                    "%s - No changes since the last launch, skipping.",
+                    stack.name
                 )
+                skipped.add(stack.name)
+                return StackStatus.COMPLETE
 
-        threading_events[stack.name].set()
+        status = stack.launch()
+        if status == StackStatus.COMPLETE:
+            fingerprints.set(stack.name, {
+                "fingerprint": fingerprint,
+                "deployment": self._get_deployment(stack)[1]
+            })
+        return status
+
+    @staticmethod
+    def _get_recorded_launch(fingerprints, stack_name):
+        """
+        Returns the fingerprint and deployment recorded when the stack
+        ``stack_name`` was last launched.
+
+        :param fingerprints: The fingerprints recorded by previous launches.
+        :type fingerprints: sceptre.cache.StackFingerprints
+        :param stack_name: The name of the stack.
+        :type stack_name: str
+        :returns: The recorded launch, which is empty if the stack has not \
+            been launched, or was recorded by an older version of Sceptre.
+        :rtype: dict
+        """
+        recorded = fingerprints.get(stack_name)
+        return recorded if isinstance(recorded, dict) else {}
+
+    @staticmethod
+    def _get_deployment(stack):
+        """
+        Returns the status of ``stack``, and the ID and last update time
+        which identify its latest deployment.
+
+        :param stack: The stack to describe.
+        :type stack: sceptre.stack.Stack
+        :returns: The stack's status, or "PENDING" if it does not exist, \
+            and its deployment, or None if it does not exist.
+        :rtype: tuple
+        """
+        try:
+            description = stack.describe()["Stacks"][0]
+        except botocore.exceptions.ClientError as exp:
+            if exp.response["Error"]["Message"].endswith("does not exist"):
+                return "PENDING", None
+            raise
+        last_updated = description.get(
+            "LastUpdatedTime", description.get("CreationTime")
+        )
+        return description["StackStatus"], [
+            description["StackId"],
+            last_updated.isoformat() if last_updated is not None else None
+        ]
 
     @recurse_into_sub_environments
-    def _get_threading_events(self):
+    def _get_stacks(self):
         """
-        Returns a threading.Event() for each stack in every sub-environment.
+        Returns every stack in every sub-environment.
 
-        :returns: A threading.Event object for each stack, keyed by the
-            stack's name.
+        :returns: The stacks, keyed by the stack's full name.
         :rtype: dict
         """
         return {
-            stack.name: threading.Event()
+            stack.name: stack
             for stack in self.stacks.values()
         }
 
@@ -302,7 +681,7 @@ class Environment(object):
             stack_name: [
                 dependency
                 for dependency in dependencies
-                if dependency.startswith(top_level_environment_path)
+                if dependency.startswith(top_level_environment_path + "/")
             ]
             for stack_name, dependencies in all_dependencies.items()
         }
@@ -317,31 +696,21 @@ class Environment(object):
         :rtype: dict
         """
         launch_dependencies = self._get_launch_dependencies(self.path)
-        delete_dependencies = {
-            stack_name: [] for stack_name in launch_dependencies
-        }
-        for stack_name, dependencies in launch_dependencies.items():
-            for dependency in dependencies:
-                delete_dependencies[dependency].append(stack_name)
-        return delete_dependencies
-
-    def _check_for_circular_dependencies(self, dependencies):
-        """
-        Checks to make sure that no stacks are dependent on stacks which are
-        dependent on the first stack.
-
-        :raises: sceptre.workplan.CircularDependenciesException
-        """
-        self.logger.debug("Checking for circular dependencies...")
-        for stack_name, stack_dependencies in dependencies.items():
-            for dependency in stack_dependencies:
-                if stack_name in dependencies[dependency]:
-                    raise CircularDependenciesError(
-                        "The {0} stack is dependent on the {1} stack, which "
-                        "is in turn dependent on the {0} "
-                        "stack.".format(stack_name, dependency)
-                    )
-        self.logger.debug("No circular dependencies found")
+        return StackGraph(launch_dependencies).dependents
+
+    def _check_dependencies(self, dependencies):
+        """
+        Checks that every dependency is a stack in the environment, and that
+        no stacks are dependent on themselves, directly or through other
+        stacks.
+
+        :param dependencies: A list of the stacks that a particular stack \
+            depends on, keyed by that stack's name.
+        :type dependencies: dict
+        :raises: sceptre.exceptions.DependencyStackNotFoundError
+        :raises: sceptre.exceptions.CircularDependenciesError
+        """
+        StackGraph(dependencies).check()
 
     def _get_config(self):
         """
@@ -369,21 +738,7 @@ class Environment(object):
         :returns: A list of the environment's stacks.
         :rtype: list
         """
-        config_files = glob(os.path.join(
-            self.sceptre_dir, "config", self.path, "*.yaml"
-        ))
-        basenames = [
-            os.path.splitext(os.path.basename(config_file))[0]
-            for config_file in config_files
-        ]
-
-        if "config" in basenames:
-            basenames.remove("config")
-
-        stack_names = [
-            "/".join([self.path, basename]) for basename in basenames
-        ]
-        return stack_names
+        return self.config_index.get_stack_names(self.path)
 
     def _load_stacks(self):
         """
@@ -393,9 +748,13 @@ class Environment(object):
         :rtype: dict
         """
         config = self._get_config()
+        retry_policy = None
+        if config.get("retry"):
+            retry_policy = self._get_retry_policy(config["retry"])
         connection_manager = ConnectionManager(
             region=config["region"],
-            iam_role=config.get("iam_role")
+            iam_role=config.get("iam_role"),
+            retry_policy=retry_policy
         )
         stacks = {}
         for stack_name in self._get_available_stacks():
@@ -408,6 +767,25 @@ class Environment(object):
             stacks[get_name_tuple(stack_name)[-1]] = stack
         return stacks
 
+    def _get_retry_policy(self, retry_config):
+        """
+        Returns the retry policy of the run configured by ``retry_config``,
+        creating it if no environment has used the config yet.
+
+        :param retry_config: The ``retry`` item of the environment's config.
+        :type retry_config: dict
+        :returns: The retry policy.
+        :rtype: sceptre.retry.RetryPolicy
+        """
+        key = json.dumps(retry_config, sort_keys=True, default=repr)
+        if key not in self._retry_policies:
+            # Sub-environments load their stacks on separate threads, so
+            # keep whichever policy is stored first.
+            self._retry_policies.setdefault(
+                key, RetryPolicy.from_config(retry_config)
+            )
+        return self._retry_policies[key]
+
     def _get_available_environments(self):
         """
         Returns all the sub-environments contained in the environment.
@@ -415,18 +793,7 @@ class Environment(object):
         :returns: A list of the environment's sub-environments.
         :rtype: list
         """
-        items_in_dir = glob(os.path.join(
-            self.sceptre_dir, "config", self.path, "*"
-        ))
-        dirs = [
-            item for item in items_in_dir
-            if os.path.isdir(item)
-        ]
-        available_environments = [
-            os.path.relpath(d, os.path.join(self.sceptre_dir, "config"))
-            for d in dirs
-        ]
-        return available_environments
+        return self.config_index.get_environment_paths(self.path)
 
     def _load_environments(self):
         """
@@ -444,7 +811,9 @@ class Environment(object):
             environment = Environment(
                 sceptre_dir=self.sceptre_dir,
                 environment_path=environment_name,
-                options=self._options
+                options=self._options,
+                config_index=self.config_index,
+                retry_policies=self._retry_policies
             )
             environments[environment_name] = environment
         return environments
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+"""
+sceptre.event_stream
+
+This module implements a StackEventStream class, which reads a stack's
+CloudFormation events incrementally.
+"""
+
+import logging
+
+import botocore
+
+
+class StackEventStream(object):
+    """
+    StackEventStream reads the events of a stack which are new since it was
+    last read.
+
+    CloudFormation returns a stack's events newest first. Each read follows
+    ``NextToken`` only until it reaches the newest event returned by the
+    previous read, identified by its ``EventId``, so a read costs a single
+    request unless more than a page of events has been emitted since the
+    last one. Before the first event has been seen, the stream starts at
+    events newer than ``since``, or after the events which existed when
+    ``skip_existing`` was called.
+
+    :param connection_manager: A connection manager, used to make Boto3 calls.
+    :type connection_manager: sceptre.connection_manager.ConnectionManager
+    :param stack_name: The external name of the stack.
+    :type stack_name: str
+    :param since: The time from which to read events. Defaults to reading \
+        every event.
+    :type since: datetime.datetime
+    """
+
+    def __init__(self, connection_manager, stack_name, since=None):
+        self.logger = logging.getLogger(__name__)
+
+        self.connection_manager = connection_manager
+        self.stack_name = stack_name
+        self.since = since
+        self.last_event_id = None
+
+    def __repr__(self):
+        return (
+            "sceptre.event_stream.StackEventStream(connection_manager={0}, "
+            "stack_name='{1}', since={2})".format(
+                self.connection_manager, self.stack_name, self.since
+            )
+        )
+
+    def skip_existing(self):
+        """
+        Marks the stack's existing events as seen, so that reads only return
+        events emitted after this call. A stack which does not exist has no
+        existing events.
+        """
+        try:
+            response = self.connection_manager.call(
+                service="cloudformation",
+                command="describe_stack_events",
+                kwargs={"StackName": self.stack_name}
+            )
+        except botocore.exceptions.ClientError as exp:
+            if not exp.response["Error"]["Message"].endswith(
+                "does not exist"
+            ):
+                raise
+            response = {"StackEvents": []}
+        if response["StackEvents"]:
+            self.last_event_id = response["StackEvents"][0]["EventId"]
+        self.since = None
+
+    def read(self):
+        """
+        Returns a generator of the events which are new since the last read,
+        oldest first.
+
+        :returns: A generator of stack events.
+        :rtype: generator
+        """
+        new_events = []
+        pages = self.connection_manager.paginate(
+            service="cloudformation",
+            command="describe_stack_events",
+            kwargs={"StackName": self.stack_name}
+        )
+        for page in pages:
+            caught_up = False
+            for event in page["StackEvents"]:
+                if self._is_seen(event):
+                    caught_up = True
+                    break
+                new_events.append(event)
+            if caught_up:
+                break
+
+        if new_events:
+            self.last_event_id = new_events[0]["EventId"]
+        self.logger.debug(
+            "%s - Read %d new events", self.stack_name, len(new_events)
+        )
+        for event in reversed(new_events):
+            yield event
+
+    def _is_seen(self, event):
+        """
+        Returns whether ``event`` was returned by a previous read, or
+        precedes the start of the stream.
+
+        :param event: A stack event.
+        :type event: dict
+        :returns: Whether the event has been seen.
+        :rtype: bool
+        """
+        if self.last_event_id is not None:
+            return event["EventId"] == self.last_event_id
+        return self.since is not None and event["Timestamp"] <= self.since
@@ -56,6 +56,13 @@ class DependencyStackMissingOutputError(SceptreException):
     pass
 
 
+class DependencyStackNotFoundError(SceptreException):
+    """
+    Error raised if a stack depends on a stack which does not exist
+    """
+    pass
+
+
 class CircularDependenciesError(SceptreException):
     """
     Error raised if there are circular dependencies
@@ -77,6 +84,14 @@ class RetryLimitExceededError(SceptreException):
     pass
 
 
+class RetryBudgetExhaustedError(RetryLimitExceededError):
+    """
+    Error raised if a request is not retried because the retry budget is
+    exhausted.
+    """
+    pass
+
+
 class UnknownHookTypeError(SceptreException):
     """
     Error raised if an unrecognised hook type is received.
@@ -132,3 +147,23 @@ class StackDoesNotExistError(SceptreException):
     """
     Error raised when a stack does not exist.
     """
+
+
+class StackTimeoutError(SceptreException):
+    """
+    Error raised when a stack operation does not finish within the stack's
+    timeout.
+    """
+
+
+class ExportNotFoundError(SceptreException):
+    """
+    Error raised when a CloudFormation export does not exist.
+    """
+
+
+class RenderedTemplateError(SceptreException):
+    """
+    Error raised when pre-rendered templates are missing or do not match
+    their manifest.
+    """
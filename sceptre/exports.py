@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+"""
+sceptre.exports
+
+This module implements an ExportIndex class, which stores the CloudFormation
+exports of each account and region for the duration of a Sceptre run.
+"""
+
+import logging
+import threading
+
+from .exceptions import ExportNotFoundError
+
+
+class ExportIndex(object):
+    """
+    ExportIndex stores the value of every CloudFormation export, keyed by the
+    region and IAM role of the connection manager used to list them.
+
+    The exports of an account and region are listed, with a paginated
+    ``list_exports`` call, the first time one of them is looked up. Later
+    lookups are answered from the index. If an export is not in the index,
+    the exports are listed again once, in case the export was created after
+    the index was loaded.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+        self._exports = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "sceptre.exports.ExportIndex()"
+
+    def get_value(self, connection_manager, name):
+        """
+        Returns the value of the export ``name``.
+
+        :param connection_manager: The connection manager used to list the \
+            exports.
+        :type connection_manager: sceptre.connection_manager.ConnectionManager
+        :param name: The name of the export.
+        :type name: str
+        :returns: The value of the export.
+        :rtype: str
+        :raises: sceptre.exceptions.ExportNotFoundError
+        """
+        key = (connection_manager.region, connection_manager.iam_role)
+        exports = self._get_exports(connection_manager, key)
+        if name not in exports:
+            exports = self._get_exports(connection_manager, key, exports)
+        try:
+            return exports[name]
+        except KeyError:
+            raise ExportNotFoundError(
+                "No export named '{0}' exists in {1}".format(
+                    name, connection_manager.region
+                )
+            )
+
+    def clear(self):
+        """
+        Removes every indexed export.
+        """
+        with self._lock:
+            self._exports.clear()
+
+    def _get_exports(self, connection_manager, key, stale=None):
+        """
+        Returns the indexed exports for ``key``, listing them if they have
+        not been listed, or if the indexed exports are ``stale``. Concurrent
+        calls for the same key list the exports once.
+
+        :param connection_manager: The connection manager used to list the \
+            exports.
+        :type connection_manager: sceptre.connection_manager.ConnectionManager
+        :param key: A tuple of the region and IAM role.
+        :type key: tuple
+        :param stale: Exports which should be listed again.
+        :type stale: dict
+        :returns: The value of each export, keyed by the export's name.
+        :rtype: dict
+        """
+        with self._lock:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            exports = self._exports.get(key)
+            if exports is None or exports is stale:
+                self.logger.debug(
+                    "Listing exports in %s", connection_manager.region
+                )
+                exports = {}
+                for page in connection_manager.paginate(
+                    service="cloudformation", command="list_exports"
+                ):
+                    for export in page.get("Exports", []):
+                        exports[export["Name"]] = export["Value"]
+                with self._lock:
+                    self._exports[key] = exports
+            return exports
+
+
+export_index = ExportIndex()
@@ -0,0 +1,336 @@
+# -*- coding: utf-8 -*-
+
+"""
+sceptre.graph
+
+This module implements a StackGraph class, which stores the dependencies
+between stacks and implements linear-time graph algorithms over them.
+"""
+
+from collections import deque
+import logging
+
+from .exceptions import CircularDependenciesError
+from .exceptions import DependencyStackNotFoundError
+
+
+class StackGraph(object):
+    """
+    StackGraph represents the dependencies between a set of stacks.
+
+    Each stack is a node, and each dependency is an edge from a stack to the
+    stack it depends on. Dependencies on stacks which are not nodes of the
+    graph are recorded as missing, and are otherwise ignored. All of the
+    traversals are iterative, so deep graphs do not hit Python's recursion
+    limit.
+
+    :param dependencies: A list of the stacks that a particular stack depends
+        on, keyed by that stack's name.
+    :type dependencies: dict
+    """
+
+    def __init__(self, dependencies):
+        self.logger = logging.getLogger(__name__)
+
+        self.dependencies = {
+            stack_name: sorted(set(stack_dependencies))
+            for stack_name, stack_dependencies in dependencies.items()
+        }
+        self._edges = {
+            stack_name: [
+                dependency for dependency in stack_dependencies
+                if dependency in self.dependencies
+            ]
+            for stack_name, stack_dependencies in self.dependencies.items()
+        }
+
+    def __repr__(self):
+        return "sceptre.graph.StackGraph(dependencies={0})".format(
+            self.dependencies
+        )
+
+    def __len__(self):
+        return len(self.dependencies)
+
+    def __iter__(self):
+        return iter(self.dependencies)
+
+    @property
+    def dependents(self):
+        """
+        Returns the inverse of the graph's dependencies.
+
+        :returns: A list of the stacks that depend on a particular stack, \
+            keyed by that stack's name.
+        :rtype: dict
+        """
+        dependents = {stack_name: [] for stack_name in self.dependencies}
+        for stack_name in sorted(self._edges):
+            for dependency in self._edges[stack_name]:
+                dependents[dependency].append(stack_name)
+        return dependents
+
+    def reversed(self):
+        """
+        Returns a StackGraph with every edge reversed, as used when deleting
+        stacks. Missing dependencies are dropped.
+
+        :returns: The reversed graph.
+        :rtype: sceptre.graph.StackGraph
+        """
+        return StackGraph(self.dependents)
+
+    def check(self):
+        """
+        Raises an error if the graph references missing stacks or contains
+        cycles.
+
+        :raises: sceptre.exceptions.DependencyStackNotFoundError
+        :raises: sceptre.exceptions.CircularDependenciesError
+        """
+        self.logger.debug("Checking dependencies of %d stacks...", len(self))
+        missing_dependencies = self.get_missing_dependencies()
+        if missing_dependencies:
+            raise DependencyStackNotFoundError(
+                "The following dependencies do not exist: {0}".format(
+                    "; ".join(
+                        "{0} depends on {1}".format(
+                            stack_name, ", ".join(dependencies)
+                        )
+                        for stack_name, dependencies
+                        in sorted(missing_dependencies.items())
+                    )
+                )
+            )
+
+        cycles = self.find_cycles()
+        if cycles:
+            raise CircularDependenciesError(
+                "Circular dependencies found: {0}".format(
+                    "; ".join(" -> ".join(cycle) for cycle in cycles)
+                )
+            )
+        self.logger.debug("No missing or circular dependencies found")
+
+    def get_missing_dependencies(self):
+        """
+        Returns the dependencies on stacks which are not in the graph.
+
+        :returns: A list of the missing stacks that a particular stack \
+            depends on, keyed by that stack's name.
+        :rtype: dict
+        """
+        return {
+            stack_name: [
+                dependency for dependency in dependencies
+                if dependency not in self.dependencies
+            ]
+            for stack_name, dependencies in self.dependencies.items()
+            if len(dependencies) != len(self._edges[stack_name])
+        }
+
+    def find_cycles(self):
+        """
+        Returns one cycle for every group of stacks which depend on each
+        other, found using Tarjan's strongly connected components algorithm.
+
+        Each cycle is the full path of stack names, starting and ending at
+        the same stack, e.g. ``["a", "b", "c", "a"]`` if ``a`` depends on
+        ``b``, which depends on ``c``, which depends on ``a``.
+
+        :returns: A list of cycles.
+        :rtype: list
+        """
+        cycles = []
+        for component in self.get_strongly_connected_components():
+            start = min(component)
+            if len(component) > 1 or start in self._edges[start]:
+                cycles.append(self._find_cycle(start, set(component)))
+        return sorted(cycles)
+
+    def get_strongly_connected_components(self):
+        """
+        Returns the strongly connected components of the graph, using an
+        iterative version of Tarjan's algorithm.
+
+        :returns: A list of components, each a list of stack names.
+        :rtype: list
+        """
+        index = {}
+        lowlink = {}
+        on_stack = set()
+        stack = []
+        components = []
+
+        for root in sorted(self.dependencies):
+            if root in index:
+                continue
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(self._edges[root]))]
+            while work:
+                node, children = work[-1]
+                for child in children:
+                    if child not in index:
+                        index[child] = lowlink[child] = len(index)
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(self._edges[child])))
+                        break
+                    elif child in on_stack:
+                        lowlink[node] = min(lowlink[node], index[child])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+                    if lowlink[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        components.append(component)
+        return components
+
+    def get_topological_order(self):
+        """
+        Returns the stacks ordered so that every stack comes after the stacks
+        it depends on. Stacks which are part of a cycle are omitted.
+
+        :returns: A list of stack names.
+        :rtype: list
+        """
+        remaining = {
+            stack_name: len(dependencies)
+            for stack_name, dependencies in self._edges.items()
+        }
+        dependents = self.dependents
+        ready = deque(sorted(
+            stack_name for stack_name, count in remaining.items()
+            if count == 0
+        ))
+        order = []
+        while ready:
+            stack_name = ready.popleft()
+            order.append(stack_name)
+            for dependent in dependents[stack_name]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+        return order
+
+    def get_longest_downstream_paths(self, weights=None):
+        """
+        Returns the weighted length of the longest chain of stacks which
+        depend on each stack, including the stack itself.
+
+        :param weights: The weight of each stack, keyed by stack name. \
+            Defaults to one for every stack.
+        :type weights: dict
+        :returns: The length of each stack's longest downstream chain, keyed \
+            by stack name.
+        :rtype: dict
+        """
+        weights = {} if weights is None else weights
+        dependents = self.dependents
+        lengths = {}
+        for stack_name in reversed(self.get_topological_order()):
+            lengths[stack_name] = weights.get(stack_name, 1) + max(
+                [lengths[dependent] for dependent in dependents[stack_name]]
+                or [0]
+            )
+        return lengths
+
+    def get_waves(self):
+        """
+        Returns the stacks grouped into waves, where every stack in a wave
+        depends only on stacks in earlier waves. Each wave can be run in
+        parallel once the waves before it have completed. Stacks which are
+        part of a cycle are omitted.
+
+        :returns: A list of waves, each a sorted list of stack names.
+        :rtype: list
+        """
+        remaining = {
+            stack_name: len(dependencies)
+            for stack_name, dependencies in self._edges.items()
+        }
+        dependents = self.dependents
+        wave = sorted(
+            stack_name for stack_name, count in remaining.items()
+            if count == 0
+        )
+        waves = []
+        while wave:
+            waves.append(wave)
+            next_wave = []
+            for stack_name in wave:
+                for dependent in dependents[stack_name]:
+                    remaining[dependent] -= 1
+                    if remaining[dependent] == 0:
+                        next_wave.append(dependent)
+            wave = sorted(next_wave)
+        return waves
+
+    def get_critical_path(self, weights=None):
+        """
+        Returns the chain of dependent stacks with the greatest total weight,
+        which bounds how quickly the graph can be run however many stacks
+        are run at once.
+
+        :param weights: The weight of each stack, keyed by stack name. \
+            Defaults to one for every stack.
+        :type weights: dict
+        :returns: The stack names along the critical path, in the order \
+            they must be run.
+        :rtype: list
+        """
+        lengths = self.get_longest_downstream_paths(weights)
+        if not lengths:
+            return []
+        dependents = self.dependents
+
+        def by_length(stack_name):
+            return (-lengths[stack_name], stack_name)
+
+        path = [min(lengths, key=by_length)]
+        while True:
+            candidates = [
+                dependent for dependent in dependents[path[-1]]
+                if dependent in lengths
+            ]
+            if not candidates:
+                return path
+            path.append(min(candidates, key=by_length))
+
+    def _find_cycle(self, start, component):
+        """
+        Returns the shortest cycle from ``start`` back to itself, using only
+        the stacks in ``component``.
+
+        :param start: The stack the cycle starts and ends at.
+        :type start: str
+        :param component: The strongly connected component containing \
+            ``start``.
+        :type component: set
+        :returns: The cycle's path.
+        :rtype: list
+        """
+        parents = {start: None}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            for child in self._edges[node]:
+                if child == start:
+                    path = [start]
+                    while node is not None:
+                        path.append(node)
+                        node = parents[node]
+                    return list(reversed(path))
+                if child in component and child not in parents:
+                    parents[child] = node
+                    queue.append(child)
@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+
+"""
+sceptre.plugins
+
+This module implements a PluginRegistry class, which discovers and imports
+the resolver and hook classes available to Sceptre once per process.
+"""
+
+import imp
+import inspect
+import logging
+import os
+import sys
+import threading
+
+from .helpers import camel_to_snake_case
+from .helpers import get_subclasses
+
+
+def _iter_entry_points(group):
+    """
+    Returns the setuptools entry points registered under ``group`` by
+    installed packages.
+
+    :param group: The name of the entry point group.
+    :type group: str
+    :returns: The entry points.
+    :rtype: list
+    """
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:
+        try:
+            import pkg_resources
+        except ImportError:
+            return []
+        return list(pkg_resources.iter_entry_points(group))
+    all_entry_points = entry_points()
+    if hasattr(all_entry_points, "select"):
+        return list(all_entry_points.select(group=group))
+    return list(all_entry_points.get(group, []))
+
+
+class LazyPlugin(object):
+    """
+    LazyPlugin stands in for a plugin class whose module has not been
+    imported. The module is imported the first time the plugin is called,
+    so plugins which are never used are never imported.
+
+    :param module_name: The name of the plugin's module.
+    :type module_name: str
+    :param module_path: The path of the plugin's module.
+    :type module_path: str
+    :param class_name: The name of the plugin class.
+    :type class_name: str
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, module_name, module_path, class_name):
+        self.module_name = module_name
+        self.module_path = module_path
+        self.class_name = class_name
+        self._class = None
+
+    def __repr__(self):
+        return (
+            "sceptre.plugins.LazyPlugin(module_name='{0}', "
+            "module_path='{1}', class_name='{2}')".format(
+                self.module_name, self.module_path, self.class_name
+            )
+        )
+
+    def __call__(self, *args, **kwargs):
+        return self.load()(*args, **kwargs)
+
+    def load(self):
+        """
+        Imports and returns the plugin class. A module already imported
+        under the plugin's module name is only reused if it was loaded from
+        the plugin's module path, as plugin modules can share their name
+        with other modules, such as the ``cmd`` hook and the standard
+        library's ``cmd``. The other module is left in ``sys.modules``.
+
+        :returns: The plugin class.
+        :rtype: class
+        """
+        with self._lock:
+            if self._class is None:
+                module = sys.modules.get(self.module_name)
+                if not self._is_loaded_from_path(module):
+                    directory = os.path.dirname(self.module_path)
+                    if directory not in sys.path:
+                        sys.path.append(directory)
+                    previous = sys.modules.pop(self.module_name, None)
+                    try:
+                        module = imp.load_source(
+                            self.module_name, self.module_path
+                        )
+                    finally:
+                        if previous is not None:
+                            sys.modules[self.module_name] = previous
+                self._class = getattr(module, self.class_name)
+            return self._class
+
+    def _is_loaded_from_path(self, module):
+        """
+        Returns whether ``module`` was loaded from the plugin's module path.
+
+        :param module: A module, or None.
+        :type module: module
+        :returns: Whether the module is the plugin's module.
+        :rtype: bool
+        """
+        module_file = getattr(module, "__file__", None)
+        if module_file is None:
+            return False
+        if module_file.endswith((".pyc", ".pyo")):
+            module_file = module_file[:-1]
+        return os.path.realpath(module_file) == \
+            os.path.realpath(self.module_path)
+
+
+class PluginRegistry(object):
+    """
+    PluginRegistry stores the resolver and hook classes found in plugin
+    directories and setuptools entry points.
+
+    Each directory is searched, and its modules imported, the first time its
+    classes are requested. Later requests return the same classes, so
+    reading many configs does not import plugin modules again or grow
+    ``sys.path``. Entry point groups are loaded once in the same way.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+        self._classes = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "sceptre.plugins.PluginRegistry()"
+
+    def get_classes(self, base_type, directory):
+        """
+        Returns the classes in ``directory`` which inherit from
+        ``base_type``.
+
+        :param base_type: The base class of the plugins.
+        :type base_type: class
+        :param directory: The directory to search for plugins.
+        :type directory: str
+        :returns: The plugin classes, keyed by the class name in snake case.
+        :rtype: dict
+        """
+        key = (base_type, "directory", os.path.abspath(directory))
+        with self._lock:
+            if key not in self._classes:
+                self.logger.debug("Loading %s plugins from %s",
+                                  base_type.__name__, directory)
+                self._classes[key] = get_subclasses(
+                    directory=directory, class_type=base_type
+                )
+            return self._classes[key]
+
+    def get_entry_point_classes(self, base_type, group):
+        """
+        Returns the classes registered under the setuptools entry point
+        ``group`` which inherit from ``base_type``. Entry points which do not
+        load a subclass of ``base_type`` are ignored.
+
+        :param base_type: The base class of the plugins.
+        :type base_type: class
+        :param group: The name of the entry point group.
+        :type group: str
+        :returns: The plugin classes, keyed by the entry point name.
+        :rtype: dict
+        """
+        key = (base_type, "entry_points", group)
+        with self._lock:
+            if key not in self._classes:
+                classes = {}
+                for entry_point in _iter_entry_points(group):
+                    plugin = entry_point.load()
+                    if inspect.isclass(plugin) and \
+                            issubclass(plugin, base_type):
+                        classes[camel_to_snake_case(entry_point.name)] = \
+                            plugin
+                    else:
+                        self.logger.debug(
+                            "Ignoring entry point %s, which is not a %s",
+                            entry_point.name, base_type.__name__
+                        )
+                self._classes[key] = classes
+            return self._classes[key]
+
+    def get_plugin_map(self):
+        """
+        Returns where each plugin class loaded from a directory is defined.
+
+        :returns: The module name, module path and class name of each \
+            plugin, keyed by tag, keyed by a tuple of the base class name \
+            and the directory.
+        :rtype: dict
+        """
+        plugin_map = {}
+        with self._lock:
+            for (base_type, source, location), classes in \
+                    self._classes.items():
+                if source != "directory":
+                    continue
+                plugin_map[(base_type.__name__, location)] = {
+                    name: (
+                        getattr(plugin, "module_name", None) or
+                        plugin.__module__,
+                        getattr(plugin, "module_path", None) or
+                        inspect.getfile(plugin),
+                        getattr(plugin, "class_name", None) or
+                        plugin.__name__
+                    )
+                    for name, plugin in classes.items()
+                }
+        return plugin_map
+
+    def add_plugin_map(self, plugin_map, base_types):
+        """
+        Adds the plugins in ``plugin_map``, as returned by
+        ``get_plugin_map``, without importing them.
+
+        :param plugin_map: The plugin map.
+        :type plugin_map: dict
+        :param base_types: The base classes of the plugins, keyed by name.
+        :type base_types: dict
+        """
+        with self._lock:
+            for (base_type_name, directory), plugins in plugin_map.items():
+                key = (base_types[base_type_name], "directory", directory)
+                self._classes.setdefault(key, {
+                    name: LazyPlugin(*location)
+                    for name, location in plugins.items()
+                })
+
+    def clear(self):
+        """
+        Removes every loaded plugin class, so that plugins are searched for
+        again.
+        """
+        with self._lock:
+            self._classes.clear()
+
+
+plugin_registry = PluginRegistry()
@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+
+"""
+sceptre.poller
+
+This module implements a StatusPoller class, which waits for the operations
+of many stacks at once, and helpers to describe many stacks with as few API
+calls as possible.
+"""
+
+from concurrent.futures import Future, TimeoutError
+import logging
+import threading
+import time
+
+from botocore.exceptions import ClientError
+
+from .exceptions import StackDoesNotExistError
+from .exceptions import StackTimeoutError
+
+
+ACCESS_DENIED_CODES = frozenset([
+    "AccessDenied",
+    "AccessDeniedException",
+    "UnauthorizedOperation"
+])
+
+_denied_groups = set()
+
+
+def get_stack_statuses(stacks):
+    """
+    Returns the CloudFormation status of each of ``stacks``.
+
+    Stacks are grouped by the region and IAM role of their connection
+    manager, and each group is described with a single paginated
+    ``describe_stacks`` call, so the number of calls depends on the number of
+    accounts and regions rather than the number of stacks. Every stack
+    description returned, including its outputs, is added to the describe
+    cache, so later lookups of settled stacks make no calls.
+
+    Describing every stack requires ``cloudformation:DescribeStacks`` on all
+    stacks. If the call is denied, as it is for roles scoped to particular
+    stacks, the group's stacks are described one at a time instead, for the
+    rest of the run.
+
+    :param stacks: The stacks to describe.
+    :type stacks: list
+    :returns: The status of each stack, or None if the stack does not \
+        exist, keyed by the stack's name.
+    :rtype: dict
+    """
+    groups = {}
+    for stack in stacks:
+        connection_manager = stack.connection_manager
+        key = (connection_manager.region, connection_manager.iam_role)
+        groups.setdefault(key, (connection_manager, []))[1].append(stack)
+
+    response = {}
+    for key, (connection_manager, grouped_stacks) in groups.items():
+        if key not in _denied_groups:
+            try:
+                statuses = _describe_all_stacks(connection_manager)
+            except ClientError as exp:
+                if exp.response["Error"]["Code"] not in ACCESS_DENIED_CODES:
+                    raise
+                logging.getLogger(__name__).debug(
+                    "Describing all stacks in %s was denied, describing "
+                    "stacks one at a time", key
+                )
+                _denied_groups.add(key)
+            else:
+                for stack in grouped_stacks:
+                    response[stack.name] = statuses.get(stack.external_name)
+                continue
+        for stack in grouped_stacks:
+            try:
+                response[stack.name] = stack.get_status()
+            except StackDoesNotExistError:
+                response[stack.name] = None
+    return response
+
+
+def _describe_all_stacks(connection_manager):
+    """
+    Describes every stack visible to ``connection_manager``, adding each
+    description to the describe cache.
+
+    :param connection_manager: The connection manager to describe with.
+    :type connection_manager: sceptre.connection_manager.ConnectionManager
+    :returns: The status of each stack, keyed by the stack's external name.
+    :rtype: dict
+    :raises: botocore.exceptions.ClientError
+    """
+    statuses = {}
+    version = connection_manager.describe_cache.version
+    for page in connection_manager.paginate(
+        service="cloudformation", command="describe_stacks"
+    ):
+        for description in page.get("Stacks", []):
+            statuses[description["StackName"]] = description["StackStatus"]
+            connection_manager.describe_cache.set(
+                connection_manager.get_describe_cache_key(
+                    description["StackName"]
+                ),
+                {"Stacks": [description]},
+                version
+            )
+    return statuses
+
+
+class StatusPoller(object):
+    """
+    StatusPoller waits for the in-progress operations of many stacks.
+
+    Each stack waiting on the poller is tracked until its status is no longer
+    in progress. While any stack is waiting, a background thread refreshes
+    the statuses of every waiting stack once per ``interval`` using
+    ``get_stack_statuses``, and wakes each stack whose operation has
+    finished by resolving its future. Each refresh is counted as a tick,
+    which waiting stacks can wait for with ``wait_for_tick`` to do their own
+    work. Waiting stacks read their events only once every ``event_ticks``
+    refreshes, and once their operation has finished, so that the number of
+    calls made per refresh does not grow with the number of waiting stacks.
+
+    A refresh which fails, for example because it was throttled, is retried
+    on the next refresh. The waiting stacks are only failed once
+    ``max_errors`` refreshes in a row have failed.
+
+    :param interval: The number of seconds between refreshes.
+    :type interval: float
+    :param event_ticks: The number of refreshes between reads of each \
+        waiting stack's events.
+    :type event_ticks: int
+    :param max_errors: The number of refreshes in a row which may fail \
+        before the waiting stacks are failed.
+    :type max_errors: int
+    """
+
+    def __init__(self, interval=5, event_ticks=12, max_errors=3):
+        self.logger = logging.getLogger(__name__)
+
+        self.interval = interval
+        self.event_ticks = event_ticks
+        self.max_errors = max_errors
+        self._errors = 0
+        self._waiting = []
+        self._lock = threading.Lock()
+        self._ticked = threading.Condition(self._lock)
+        self._tick = 0
+        self._thread = None
+
+    def __repr__(self):
+        return (
+            "sceptre.poller.StatusPoller(interval={0}, event_ticks={1}, "
+            "max_errors={2})".format(
+                self.interval, self.event_ticks, self.max_errors
+            )
+        )
+
+    def watch(self, stack):
+        """
+        Starts tracking the operation in progress on ``stack``.
+
+        :param stack: The stack to track.
+        :type stack: sceptre.stack.Stack
+        :returns: A future resolved with the stack's final CloudFormation \
+            status once its operation has finished.
+        :rtype: concurrent.futures.Future
+        """
+        future = Future()
+        with self._lock:
+            self._waiting.append((stack, future))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run)
+                self._thread.daemon = True
+                self._thread.start()
+        return future
+
+    def unwatch(self, stack, future):
+        """
+        Stops tracking ``stack``, if it is still being tracked.
+
+        :param stack: The stack to stop tracking.
+        :type stack: sceptre.stack.Stack
+        :param future: The future returned when the stack was watched.
+        :type future: concurrent.futures.Future
+        """
+        with self._lock:
+            if (stack, future) in self._waiting:
+                self._waiting.remove((stack, future))
+
+    @property
+    def tick(self):
+        """
+        Returns the number of refreshes the poller has made.
+
+        :returns: The number of refreshes.
+        :rtype: int
+        """
+        with self._lock:
+            return self._tick
+
+    def wait_for_tick(self, tick, timeout=None):
+        """
+        Blocks until the poller has made a refresh after refresh number
+        ``tick``.
+
+        :param tick: The number of the last refresh seen by the caller.
+        :type tick: int
+        :param timeout: The number of seconds after which to stop waiting. \
+            Defaults to waiting indefinitely.
+        :type timeout: float
+        :returns: The number of the latest refresh.
+        :rtype: int
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        with self._ticked:
+            while self._tick <= tick:
+                remaining = None
+                if deadline is not None:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        break
+                self._ticked.wait(remaining)
+            return self._tick
+
+    def wait(self, stack, timeout=None):
+        """
+        Blocks until the operation in progress on ``stack`` has finished.
+
+        :param stack: The stack to wait for.
+        :type stack: sceptre.stack.Stack
+        :param timeout: The number of seconds after which to stop waiting. \
+            Defaults to waiting indefinitely.
+        :type timeout: float
+        :returns: The stack's final CloudFormation status.
+        :rtype: str
+        :raises: sceptre.exceptions.StackDoesNotExistError
+        :raises: sceptre.exceptions.StackTimeoutError
+        """
+        future = self.watch(stack)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            self.unwatch(stack, future)
+            raise StackTimeoutError(
+                "'{0}' did not finish within {1} seconds".format(
+                    stack.name, timeout
+                )
+            )
+
+    def _run(self):
+        """
+        Refreshes the statuses of the waiting stacks until none are left.
+        """
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._waiting:
+                    self._thread = None
+                    return
+                waiting = list(self._waiting)
+            self._poll(waiting)
+
+    def _poll(self, waiting):
+        """
+        Refreshes the statuses of ``waiting`` stacks, resolving the futures
+        of those which are no longer in progress. If the refresh fails, the
+        futures are left waiting for the next refresh, unless ``max_errors``
+        refreshes in a row have failed.
+
+        :param waiting: The waiting stacks and their futures.
+        :type waiting: list
+        """
+        self.logger.debug("Polling the status of %d stacks", len(waiting))
+        error = None
+        try:
+            statuses = get_stack_statuses(
+                list(set(stack for stack, _ in waiting))
+            )
+        except Exception as exp:
+            self._errors += 1
+            self.logger.warning(
+                "Failed to poll stack statuses (%d of %d attempts): %s",
+                self._errors, self.max_errors, exp
+            )
+            if self._errors < self.max_errors:
+                # Leave the stacks waiting for the next refresh.
+                waiting = []
+            else:
+                self._errors = 0
+                error = exp
+        else:
+            self._errors = 0
+
+        settled = []
+        for stack, future in waiting:
+            if error is not None:
+                future.set_exception(error)
+            elif statuses[stack.name] is None:
+                future.set_exception(StackDoesNotExistError(
+                    "Stack with id {0} does not exist".format(
+                        stack.external_name
+                    )
+                ))
+            elif not statuses[stack.name].endswith("_IN_PROGRESS"):
+                future.set_result(statuses[stack.name])
+            else:
+                continue
+            settled.append((stack, future))
+
+        with self._ticked:
+            for item in settled:
+                if item in self._waiting:
+                    self._waiting.remove(item)
+            self._tick += 1
+            self._ticked.notify_all()
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+
+"""
+sceptre.render_pool
+
+This module implements a RenderPool class, which renders Python templates in
+worker processes so that many templates can be rendered in parallel.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import importlib
+import logging
+import threading
+
+
+PRELOADED_MODULES = ("troposphere",)
+
+_render_pools = {}
+_render_pools_lock = threading.Lock()
+
+
+def get_render_pool(max_workers):
+    """
+    Returns the process-wide RenderPool with ``max_workers`` workers.
+
+    :param max_workers: The number of worker processes.
+    :type max_workers: int
+    :returns: The render pool.
+    :rtype: sceptre.render_pool.RenderPool
+    """
+    with _render_pools_lock:
+        if max_workers not in _render_pools:
+            _render_pools[max_workers] = RenderPool(max_workers)
+        return _render_pools[max_workers]
+
+
+def preload_modules(modules):
+    """
+    Imports each of ``modules`` which is installed.
+
+    :param modules: The names of the modules to import.
+    :type modules: tuple
+    """
+    for module in modules:
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            pass
+
+
+def render_python_template(path, sceptre_user_data):
+    """
+    Renders the Python template at ``path``. Called in worker processes.
+
+    :param path: The absolute path to the template.
+    :type path: str
+    :param sceptre_user_data: The template's sceptre_user_data.
+    :type sceptre_user_data: dict
+    :returns: The body of the CloudFormation template.
+    :rtype: str
+    """
+    from .template import Template
+    return Template(path, sceptre_user_data)._call_sceptre_handler()
+
+
+class RenderPool(object):
+    """
+    RenderPool renders Python templates in a pool of worker processes.
+
+    Python templates are CPU-bound, so rendering them in the threads which
+    launch stacks lets only one run at a time. RenderPool hands renders to
+    worker processes instead, and returns the rendered bodies to the calling
+    threads. The workers are started by ``start``, or else the first time a
+    template is rendered, and each imports ``preloaded_modules`` as it
+    starts, before it renders any templates. Where the executor does not
+    support initializers, as on Python 2, the modules are imported in the
+    calling process instead, and are inherited by the workers forked from
+    it. As workers are forked from the calling process, the pool should be
+    started before the process starts any threads.
+
+    The ``sceptre_user_data`` of templates rendered by the pool must be
+    picklable.
+
+    :param max_workers: The number of worker processes.
+    :type max_workers: int
+    :param preloaded_modules: The names of modules to import in each worker.
+    :type preloaded_modules: tuple
+    """
+
+    def __init__(self, max_workers, preloaded_modules=PRELOADED_MODULES):
+        self.logger = logging.getLogger(__name__)
+
+        self.max_workers = max_workers
+        self.preloaded_modules = preloaded_modules
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return (
+            "sceptre.render_pool.RenderPool(max_workers={0}, "
+            "preloaded_modules={1})".format(
+                self.max_workers, self.preloaded_modules
+            )
+        )
+
+    @property
+    def executor(self):
+        """
+        Returns the pool's executor, starting and warming its workers if
+        they have not been started.
+
+        :returns: The executor.
+        :rtype: concurrent.futures.ProcessPoolExecutor
+        """
+        return self.start()
+
+    def start(self):
+        """
+        Starts and warms the pool's workers, if they have not been started.
+
+        :returns: The pool's executor.
+        :rtype: concurrent.futures.ProcessPoolExecutor
+        """
+        with self._lock:
+            if self._executor is None:
+                self.logger.debug(
+                    "Starting %d template render workers", self.max_workers
+                )
+                try:
+                    executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        initializer=preload_modules,
+                        initargs=(self.preloaded_modules,)
+                    )
+                except TypeError:
+                    preload_modules(self.preloaded_modules)
+                    executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers
+                    )
+                # Workers are only forked once a task is submitted.
+                executor.submit(preload_modules, ())
+                self._executor = executor
+            return self._executor
+
+    def render(self, path, sceptre_user_data):
+        """
+        Renders the Python template at ``path`` in a worker process, blocking
+        until it is rendered.
+
+        :param path: The absolute path to the template.
+        :type path: str
+        :param sceptre_user_data: The template's sceptre_user_data.
+        :type sceptre_user_data: dict
+        :returns: The body of the CloudFormation template.
+        :rtype: str
+        """
+        self.logger.debug("Rendering %s in a worker process", path)
+        return self.executor.submit(
+            render_python_template, path, sceptre_user_data
+        ).result()
+
+    def shutdown(self):
+        """
+        Stops the pool's workers.
+        """
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
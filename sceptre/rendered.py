@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+
+"""
+sceptre.rendered
+
+This module implements helpers to write the rendered templates of an
+environment to disk, and to read them back, so that an environment can be
+rendered once and launched many times.
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+
+from .exceptions import RenderedTemplateError
+
+
+MANIFEST_FILE_NAME = "manifest.json"
+TEMPLATE_EXTENSION = ".template"
+
+logger = logging.getLogger(__name__)
+
+
+def _get_body_hash(body):
+    """
+    Returns the SHA-256 hash of ``body``, and its size in bytes.
+
+    :param body: A template body.
+    :type body: str
+    :returns: The hex digest of the body's hash, and its size.
+    :rtype: tuple
+    """
+    if not isinstance(body, bytes):
+        body = body.encode("utf-8")
+    return hashlib.sha256(body).hexdigest(), len(body)
+
+
+def write_rendered_templates(out_dir, environment_path, bodies):
+    """
+    Writes each of ``bodies`` to ``out_dir``, along with a manifest of their
+    hashes and sizes.
+
+    Each body is written to ``<out_dir>/<stack_name>.template``, and the
+    manifest to ``<out_dir>/manifest.json``.
+
+    :param out_dir: The directory to write to.
+    :type out_dir: str
+    :param environment_path: The path of the rendered environment.
+    :type environment_path: str
+    :param bodies: The rendered template bodies, keyed by stack name.
+    :type bodies: dict
+    :returns: The manifest.
+    :rtype: dict
+    """
+    manifest = {"environment": environment_path, "stacks": {}}
+    for stack_name, body in sorted(bodies.items()):
+        file_name = stack_name + TEMPLATE_EXTENSION
+        path = os.path.join(out_dir, *file_name.split("/"))
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        if isinstance(body, bytes):
+            body = body.decode("utf-8")
+        with io.open(path, "w", encoding="utf-8") as template_file:
+            template_file.write(body)
+        sha256, size = _get_body_hash(body)
+        manifest["stacks"][stack_name] = {
+            "file": file_name, "sha256": sha256, "size": size
+        }
+
+    with open(os.path.join(out_dir, MANIFEST_FILE_NAME), "w") as manifest_file:
+        json.dump(manifest, manifest_file, indent=2, sort_keys=True)
+    logger.debug("Wrote %d rendered templates to %s", len(bodies), out_dir)
+    return manifest
+
+
+def read_rendered_templates(rendered_dir):
+    """
+    Reads the templates written to ``rendered_dir`` by
+    ``write_rendered_templates``, checking each against the manifest.
+
+    :param rendered_dir: The directory to read from.
+    :type rendered_dir: str
+    :returns: The rendered template bodies, keyed by stack name.
+    :rtype: dict
+    :raises: sceptre.exceptions.RenderedTemplateError
+    """
+    manifest_path = os.path.join(rendered_dir, MANIFEST_FILE_NAME)
+    try:
+        with open(manifest_path) as manifest_file:
+            manifest = json.load(manifest_file)
+    except (IOError, OSError, ValueError) as exp:
+        raise RenderedTemplateError(
+            "Could not read manifest {0}: {1}".format(manifest_path, exp)
+        )
+
+    bodies = {}
+    for stack_name, entry in manifest.get("stacks", {}).items():
+        path = os.path.join(rendered_dir, *entry["file"].split("/"))
+        try:
+            with io.open(path, encoding="utf-8") as template_file:
+                body = template_file.read()
+        except (IOError, OSError) as exp:
+            raise RenderedTemplateError(
+                "Could not read rendered template {0}: {1}".format(path, exp)
+            )
+        if _get_body_hash(body) != (entry["sha256"], entry["size"]):
+            raise RenderedTemplateError(
+                "Rendered template {0} does not match its manifest".format(
+                    path
+                )
+            )
+        bodies[stack_name] = body
+    return bodies
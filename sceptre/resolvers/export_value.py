@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+
+from sceptre.exports import export_index
+from sceptre.resolvers import Resolver
+
+
+class ExportValue(Resolver):
+    """
+    Resolver for retrieving the value of a CloudFormation export in the
+    current Sceptre environment's account and region. The exports are listed
+    once per run, and shared by every ExportValue resolver.
+
+    :param argument: The name of the export.
+    :type argument: str
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(ExportValue, self).__init__(*args, **kwargs)
+
+    def resolve(self):
+        """
+        Retrieves the value of the export.
+
+        :returns: The value of the export.
+        :rtype: str
+        """
+        self.logger.debug("Resolving export value: {0}".format(self.argument))
+        return export_index.get_value(self.connection_manager, self.argument)
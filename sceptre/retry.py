@@ -0,0 +1,315 @@
+# -*- coding: utf-8 -*-
+
+"""
+sceptre.retry
+
+This module implements a RetryPolicy class, which determines which failed
+Boto3 calls are retried and how long Sceptre waits before retrying them,
+along with the budget and metrics shared by retries.
+"""
+
+import logging
+import random
+import threading
+
+
+THROTTLING_CODES = frozenset([
+    "BandwidthLimitExceeded",
+    "EC2ThrottledException",
+    "PriorRequestNotComplete",
+    "ProvisionedThroughputExceededException",
+    "RequestLimitExceeded",
+    "RequestThrottled",
+    "RequestThrottledException",
+    "SlowDown",
+    "Throttling",
+    "ThrottlingException",
+    "TooManyRequestsException"
+])
+
+TRANSIENT_CODES = frozenset([
+    "InternalError",
+    "InternalFailure",
+    "RequestTimeout",
+    "RequestTimeoutException",
+    "ServiceUnavailable"
+])
+
+SERVICE_CODES = {
+    "s3": frozenset(["OperationAborted"]),
+    "sts": frozenset(["IDPCommunicationError"])
+}
+
+
+class RetryMetrics(object):
+    """
+    RetryMetrics counts the retries made by Sceptre and the time spent
+    waiting before them. It is threadsafe, and shared by every RetryPolicy
+    in the process unless a policy is given its own.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def __repr__(self):
+        return "sceptre.retry.RetryMetrics()"
+
+    def record_retry(self, service, code, delay):
+        """
+        Records a retry of a call to ``service`` which failed with ``code``,
+        made after waiting ``delay`` seconds.
+
+        :param service: The Boto3 service called.
+        :type service: str
+        :param code: The error code of the failed call.
+        :type code: str
+        :param delay: The number of seconds waited before retrying.
+        :type delay: float
+        """
+        with self._lock:
+            self.retries += 1
+            self.sleep_time += delay
+            key = "{0}:{1}".format(service, code)
+            self.codes[key] = self.codes.get(key, 0) + 1
+
+    def record_exhausted(self):
+        """
+        Records a call which failed after its retries were exhausted.
+        """
+        with self._lock:
+            self.exhausted += 1
+
+    def get_summary(self):
+        """
+        Returns the metrics recorded so far.
+
+        :returns: The number of retries, the number of seconds spent waiting \
+            before them, the number of calls which exhausted their retries, \
+            and the number of retries of each service and error code.
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                "retries": self.retries,
+                "sleep_time": round(self.sleep_time, 3),
+                "exhausted": self.exhausted,
+                "codes": dict(self.codes)
+            }
+
+    def reset(self):
+        """
+        Clears the metrics.
+        """
+        with self._lock:
+            self.retries = 0
+            self.sleep_time = 0.0
+            self.exhausted = 0
+            self.codes = {}
+
+
+class RetryBudget(object):
+    """
+    RetryBudget limits the number of retries made while a service is
+    failing.
+
+    Each retry withdraws ``retry_cost`` from the budget, and each call which
+    succeeds returns ``success_refund`` to it, up to ``capacity``. When the
+    budget cannot cover a retry, failed calls are raised immediately rather
+    than adding load to a service which is already refusing requests.
+
+    :param capacity: The size of the budget.
+    :type capacity: int
+    :param retry_cost: The amount withdrawn by each retry.
+    :type retry_cost: int
+    :param success_refund: The amount returned by each successful call.
+    :type success_refund: int
+    """
+
+    def __init__(self, capacity=500, retry_cost=5, success_refund=1):
+        self.capacity = capacity
+        self.retry_cost = retry_cost
+        self.success_refund = success_refund
+        self.available = capacity
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return (
+            "sceptre.retry.RetryBudget(capacity={0}, retry_cost={1}, "
+            "success_refund={2})".format(
+                self.capacity, self.retry_cost, self.success_refund
+            )
+        )
+
+    def acquire(self):
+        """
+        Withdraws the cost of a retry from the budget.
+
+        :returns: Whether the budget covered the retry.
+        :rtype: bool
+        """
+        with self._lock:
+            if self.available < self.retry_cost:
+                return False
+            self.available -= self.retry_cost
+            return True
+
+    def release(self):
+        """
+        Returns the refund for a successful call to the budget.
+        """
+        with self._lock:
+            self.available = min(
+                self.capacity, self.available + self.success_refund
+            )
+
+
+retry_metrics = RetryMetrics()
+
+
+class RetryPolicy(object):
+    """
+    RetryPolicy decides whether a failed Boto3 call is retried, and how long
+    to wait before retrying it.
+
+    Calls are retried if they fail with a throttling or transient error
+    code, an error code configured for the called service, or an HTTP 5xx
+    status. Delays grow exponentially from ``base_delay`` up to
+    ``max_delay``, and each delay is drawn at random from zero up to that
+    limit ("full jitter"), so that the retries of many threads throttled
+    together are spread out rather than arriving at once.
+
+    :param max_attempts: The number of times a call is made before giving up.
+    :type max_attempts: int
+    :param base_delay: The limit of the delay before the first retry.
+    :type base_delay: float
+    :param max_delay: The longest number of seconds to wait between attempts.
+    :type max_delay: float
+    :param retryable_codes: Extra error codes to retry for every service.
+    :type retryable_codes: list
+    :param service_codes: Extra error codes to retry, keyed by service.
+    :type service_codes: dict
+    :param budget: The budget retries are withdrawn from. Defaults to no \
+        budget.
+    :type budget: sceptre.retry.RetryBudget
+    :param metrics: The metrics retries are recorded in. Defaults to the \
+        metrics shared by the process.
+    :type metrics: sceptre.retry.RetryMetrics
+    """
+
+    DEFAULTS = {
+        "max_attempts": 30,
+        "base_delay": 1,
+        "max_delay": 20,
+        "retryable_codes": None,
+        "service_codes": None
+    }
+
+    def __init__(
+            self, max_attempts=30, base_delay=1, max_delay=20,
+            retryable_codes=None, service_codes=None, budget=None,
+            metrics=None
+    ):
+        self.logger = logging.getLogger(__name__)
+
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retryable_codes = THROTTLING_CODES | TRANSIENT_CODES | \
+            frozenset(retryable_codes or [])
+        self.service_codes = dict(SERVICE_CODES)
+        for service, codes in (service_codes or {}).items():
+            self.service_codes[service] = \
+                self.service_codes.get(service, frozenset()) | \
+                frozenset(codes)
+        self.budget = budget
+        self.metrics = metrics if metrics is not None else retry_metrics
+
+    def __repr__(self):
+        return (
+            "sceptre.retry.RetryPolicy(max_attempts={0}, base_delay={1}, "
+            "max_delay={2}, budget={3})".format(
+                self.max_attempts, self.base_delay, self.max_delay,
+                self.budget
+            )
+        )
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Returns a RetryPolicy configured by the ``retry`` item of an
+        environment's config. Items which are not set take their default
+        values, and a ``budget`` item configures a RetryBudget.
+
+        :param config: The retry config.
+        :type config: dict
+        :returns: The retry policy.
+        :rtype: sceptre.retry.RetryPolicy
+        """
+        config = config or {}
+        budget = config.get("budget")
+        return cls(budget=RetryBudget(**budget) if budget else None, **{
+            key: config.get(key, default)
+            for key, default in cls.DEFAULTS.items()
+        })
+
+    def is_retryable(self, service, error):
+        """
+        Returns whether a call to ``service`` which raised ``error`` should
+        be retried.
+
+        :param service: The Boto3 service called.
+        :type service: str
+        :param error: The error raised by the call.
+        :type error: botocore.exceptions.ClientError
+        :returns: Whether the call should be retried.
+        :rtype: bool
+        """
+        response = getattr(error, "response", None) or {}
+        code = response.get("Error", {}).get("Code")
+        if code in self.retryable_codes or \
+                code in self.service_codes.get(service, ()):
+            return True
+        status = response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+        return isinstance(status, int) and 500 <= status < 600
+
+    def get_delay(self, attempt):
+        """
+        Returns the number of seconds to wait after ``attempt`` has failed.
+
+        :param attempt: The number of the failed attempt, starting from 1.
+        :type attempt: int
+        :returns: The delay, in seconds.
+        :rtype: float
+        """
+        limit = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, limit)
+
+    def can_retry(self, attempt):
+        """
+        Returns whether a retryable call may be retried after its failed
+        ``attempt``, withdrawing the retry from the budget if so.
+
+        :param attempt: The number of the failed attempt, starting from 1.
+        :type attempt: int
+        :returns: Whether the call may be retried.
+        :rtype: bool
+        """
+        if attempt >= self.max_attempts:
+            self.metrics.record_exhausted()
+            return False
+        if self.budget is not None and not self.budget.acquire():
+            self.logger.debug("Retry budget exhausted, not retrying")
+            self.metrics.record_exhausted()
+            return False
+        return True
+
+    def record_success(self):
+        """
+        Records a successful call, returning its refund to the budget.
+        """
+        if self.budget is not None:
+            self.budget.release()
+
+
+default_retry_policy = RetryPolicy()
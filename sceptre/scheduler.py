@@ -0,0 +1,399 @@
+# -*- coding: utf-8 -*-
+
+"""
+sceptre.scheduler
+
+This module implements a StackScheduler class, which launches or deletes a
+set of stacks in dependency order using a bounded pool of worker threads.
+"""
+
+import heapq
+import logging
+import time
+
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from .graph import StackGraph
+from .stack_status import StackStatus
+
+
+class FailurePolicy(object):
+    """
+    FailurePolicy stores the ways in which a StackScheduler can react to a
+    stack which does not complete.
+    """
+    CONTINUE = "continue"
+    STOP_DISPATCH = "stop-dispatch"
+    CANCEL_IN_FLIGHT = "cancel-in-flight"
+
+
+class StackScheduler(object):
+    """
+    StackScheduler runs a stack command (launch or delete) over every stack
+    in a dependency graph.
+
+    A single ready-queue holds the stacks whose dependencies have all
+    completed. Stacks are taken from the queue and dispatched to a worker
+    pool of at most ``max_concurrency`` threads, so no thread is ever blocked
+    waiting for a dependency. If a dependency does not complete, every stack
+    that depends on it, directly or indirectly, is marked as failed without
+    being run.
+
+    The ready-queue is ordered critical path first: a stack's priority is
+    the length of the longest chain of stacks which depend on it, including
+    itself. When ``durations`` are supplied, each stack in the chain is
+    weighted by its historical duration, otherwise each counts as one.
+
+    ``on_failure`` controls what happens to unrelated stacks when a stack
+    does not complete. With ``continue``, they are still run. With
+    ``stop-dispatch``, no further stacks are started, and the stacks which
+    were not started are left pending. ``cancel-in-flight`` additionally
+    cancels the updates of running stacks which are waiting for an update
+    they have started, rolling them back. Stacks which are being created,
+    or have not yet started their update, are left to finish.
+
+    :param stacks: The stacks to run the command on, keyed by stack name.
+    :type stacks: dict
+    :param dependencies: A list of the stacks that a particular stack depends
+        on, keyed by that stack's name.
+    :type dependencies: dict
+    :param max_concurrency: The maximum number of stack commands to run at \
+        once. Defaults to the number of stacks.
+    :type max_concurrency: int
+    :param durations: The historical duration of each stack in seconds, \
+        keyed by stack name.
+    :type durations: dict
+    :param on_failure: The sceptre.scheduler.FailurePolicy to apply when a \
+        stack does not complete. Defaults to ``continue``.
+    :type on_failure: str
+    """
+
+    def __init__(
+            self, stacks, dependencies, max_concurrency=None, durations=None,
+            on_failure=FailurePolicy.CONTINUE
+    ):
+        self.logger = logging.getLogger(__name__)
+
+        self.stacks = stacks
+        self.dependencies = dependencies
+        self.max_concurrency = max_concurrency or max(len(stacks), 1)
+        self.durations = {} if durations is None else durations
+        self.on_failure = on_failure
+        self.observed_durations = {}
+
+        self._graph = StackGraph({
+            stack_name: dependencies.get(stack_name, [])
+            for stack_name in stacks
+        })
+        self._priorities = None
+
+    def __repr__(self):
+        return (
+            "sceptre.scheduler.StackScheduler(stacks={0}, dependencies={1}, "
+            "max_concurrency={2})".format(
+                self.stacks, self.dependencies, self.max_concurrency
+            )
+        )
+
+    def run(self, command, stack_statuses):
+        """
+        Runs ``stack.<command>()`` on every stack, in dependency order.
+
+        :param command: The stack command to run. Can be (launch | delete), \
+            or a function which is called with each stack and returns the \
+            stack's status.
+        :type command: str or function
+        :param stack_statuses: A dict of stack statuses, keyed by stack name, \
+            which is updated in place with the result of each stack.
+        :type stack_statuses: dict
+        :returns: The updated stack statuses.
+        :rtype: dict
+        """
+        self.logger.debug(
+            "Running %s on %d stacks with a concurrency of %d",
+            getattr(command, "__name__", command), len(self.stacks),
+            self.max_concurrency
+        )
+        self._remaining = {
+            stack_name: set(
+                dependency
+                for dependency in self.dependencies.get(stack_name, [])
+                if dependency in self.stacks
+            )
+            for stack_name in self.stacks
+        }
+        self._dependents = self._graph.dependents
+        self._failed_dependencies = set()
+        self._stopped = False
+        self._ready = []
+        for stack_name, dependencies in self._remaining.items():
+            if not dependencies:
+                self._push_ready(stack_name)
+
+        in_flight = {}
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            while in_flight or (self._ready and not self._stopped):
+                while self._ready and not self._stopped and \
+                        len(in_flight) < self.max_concurrency:
+                    _, stack_name = heapq.heappop(self._ready)
+                    future = executor.submit(
+                        self._run_stack_command,
+                        self.stacks[stack_name], command
+                    )
+                    in_flight[future] = stack_name
+
+                done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+                for future in done:
+                    stack_name = in_flight.pop(future)
+                    status = future.result()
+                    self._settle(stack_name, status, stack_statuses)
+                    if status != StackStatus.COMPLETE:
+                        self._handle_failure(stack_name, in_flight.values())
+
+        return stack_statuses
+
+    def _handle_failure(self, stack_name, in_flight):
+        """
+        Applies the failure policy after ``stack_name`` did not complete.
+
+        :param stack_name: The name of the stack which did not complete.
+        :type stack_name: str
+        :param in_flight: The names of the stacks which are still running.
+        :type in_flight: list
+        """
+        if self.on_failure == FailurePolicy.CONTINUE or self._stopped:
+            return
+        self._stopped = True
+        self.logger.info(
+            "%s did not complete. No further stacks will be started.",
+            stack_name
+        )
+        if self.on_failure != FailurePolicy.CANCEL_IN_FLIGHT:
+            return
+        for running_stack_name in sorted(in_flight):
+            stack = self.stacks[running_stack_name]
+            if not stack.updating:
+                self.logger.info(
+                    "%s is not updating, so it cannot be cancelled",
+                    running_stack_name
+                )
+                continue
+            self.logger.info("Cancelling %s", running_stack_name)
+            try:
+                stack.cancel_update()
+            except Exception as exp:
+                self.logger.warning(
+                    "Failed to cancel %s: %s", running_stack_name, exp
+                )
+
+    def _run_stack_command(self, stack, command):
+        """
+        Runs ``stack.<command>()``, returning a failed status if it raises.
+
+        :param stack: The stack to run the command on.
+        :type stack: sceptre.stack.Stack
+        :param command: The stack command to run. Can be (launch | delete), \
+            or a function which is called with the stack.
+        :type command: str or function
+        :returns: The stack's status.
+        :rtype: sceptre.stack_status.StackStatus
+        """
+        start = time.time()
+        try:
+            if callable(command):
+                status = command(stack)
+            else:
+                status = getattr(stack, command)()
+        except Exception:
+            self.logger.exception(
+                "Stack %s failed to %s", stack.name,
+                getattr(command, "__name__", command)
+            )
+            return StackStatus.FAILED
+        if status == StackStatus.COMPLETE:
+            self.observed_durations[stack.name] = time.time() - start
+        return status
+
+    @property
+    def priorities(self):
+        """
+        Returns the priority of each stack.
+
+        A stack's priority is the weighted length of the longest chain of
+        stacks which depend on it, including itself. Stacks without a
+        historical duration are weighted by the mean of the known durations,
+        or by one if no durations are known.
+
+        :returns: The priority of each stack, keyed by stack name.
+        :rtype: dict
+        """
+        if self._priorities is None:
+            self._priorities = self._graph.get_longest_downstream_paths(
+                self._get_weights()
+            )
+        return self._priorities
+
+    def explain(self):
+        """
+        Returns the order in which ready stacks are dispatched.
+
+        :returns: A description of each stack's rank, priority and \
+            historical duration, highest priority first.
+        :rtype: list
+        """
+        ranked = sorted(
+            self.priorities.items(), key=lambda item: (-item[1], item[0])
+        )
+        return [
+            {
+                "rank": rank,
+                "stack": stack_name,
+                "priority": round(priority, 3),
+                "duration": self.durations.get(stack_name)
+            }
+            for rank, (stack_name, priority) in enumerate(ranked, 1)
+        ]
+
+    def plan(self):
+        """
+        Returns the execution plan of the stacks, without running them.
+
+        The plan contains the waves of stacks which can run in parallel, the
+        critical path and the largest number of stacks which are ever
+        running at once when concurrency is unlimited, beyond which extra
+        workers are never used. If historical durations are known, the plan
+        also estimates the wall-clock time of the run at
+        ``max_concurrency``, by simulating the scheduler with stacks
+        weighted as they are for prioritisation.
+
+        :returns: The execution plan.
+        :rtype: dict
+        """
+        weights = self._get_weights()
+        critical_path = self._graph.get_critical_path(weights)
+        _, max_parallelism = self._simulate(weights, len(self.stacks))
+        plan = {
+            "stacks": len(self.stacks),
+            "waves": self._graph.get_waves(),
+            "critical_path": critical_path,
+            "max_parallelism": max_parallelism,
+            "max_concurrency": self.max_concurrency,
+            "estimated_duration": None
+        }
+        if any(stack_name in self.durations for stack_name in self.stacks):
+            duration, _ = self._simulate(weights, self.max_concurrency)
+            plan["estimated_duration"] = round(duration, 3)
+        return plan
+
+    def _simulate(self, weights, max_concurrency):
+        """
+        Simulates running the stacks, with each stack taking its weight to
+        run.
+
+        :param weights: The weight of each stack, keyed by stack name.
+        :type weights: dict
+        :param max_concurrency: The number of stacks which can run at once.
+        :type max_concurrency: int
+        :returns: The total time taken, and the largest number of stacks \
+            running at once.
+        :rtype: tuple
+        """
+        remaining = {
+            stack_name: len(set(
+                dependency
+                for dependency in self.dependencies.get(stack_name, [])
+                if dependency in self.stacks
+            ))
+            for stack_name in self.stacks
+        }
+        dependents = self._graph.dependents
+        ready = [
+            (-self.priorities[stack_name], stack_name)
+            for stack_name, count in remaining.items() if count == 0
+        ]
+        heapq.heapify(ready)
+        running = []
+        now = 0
+        peak = 0
+        while ready or running:
+            while ready and len(running) < max(max_concurrency, 1):
+                _, stack_name = heapq.heappop(ready)
+                heapq.heappush(
+                    running, (now + weights[stack_name], stack_name)
+                )
+            peak = max(peak, len(running))
+            now, stack_name = heapq.heappop(running)
+            finished = [stack_name]
+            while running and running[0][0] == now:
+                finished.append(heapq.heappop(running)[1])
+            for stack_name in finished:
+                for dependent in dependents[stack_name]:
+                    remaining[dependent] -= 1
+                    if remaining[dependent] == 0:
+                        heapq.heappush(
+                            ready, (-self.priorities[dependent], dependent)
+                        )
+        return now, peak
+
+    def _get_weights(self):
+        """
+        Returns the weight of each stack in the priority calculation.
+
+        :returns: The weight of each stack, keyed by stack name.
+        :rtype: dict
+        """
+        known = [
+            self.durations[stack_name] for stack_name in self.stacks
+            if stack_name in self.durations
+        ]
+        default = float(sum(known)) / len(known) if known else 1
+        return {
+            stack_name: self.durations.get(stack_name, default)
+            for stack_name in self.stacks
+        }
+
+    def _push_ready(self, stack_name):
+        """
+        Adds ``stack_name`` to the ready-queue.
+
+        :param stack_name: The name of the stack which is ready to run.
+        :type stack_name: str
+        """
+        heapq.heappush(
+            self._ready, (-self.priorities[stack_name], stack_name)
+        )
+
+    def _settle(self, stack_name, status, stack_statuses):
+        """
+        Records the final status of ``stack_name`` and releases its
+        dependents.
+
+        Dependents whose dependencies have all settled are added to the
+        ready-queue, unless one of their dependencies did not complete, in
+        which case they are settled as failed themselves.
+
+        :param stack_name: The name of the stack which has finished.
+        :type stack_name: str
+        :param status: The stack's final status.
+        :type status: sceptre.stack_status.StackStatus
+        :param stack_statuses: A dict of stack statuses, keyed by stack name.
+        :type stack_statuses: dict
+        """
+        to_settle = [(stack_name, status)]
+        while to_settle:
+            stack_name, status = to_settle.pop()
+            stack_statuses[stack_name] = status
+            for dependent in self._dependents[stack_name]:
+                self._remaining[dependent].discard(stack_name)
+                if status != StackStatus.COMPLETE:
+                    self._failed_dependencies.add(dependent)
+                if self._remaining[dependent]:
+                    continue
+                if dependent in self._failed_dependencies:
+                    self.logger.debug(
+                        "A dependency of %s is not complete. Marking %s as "
+                        "failed.", dependent, dependent
+                    )
+                    to_settle.append((dependent, StackStatus.FAILED))
+                else:
+                    self._push_ready(dependent)
@@ -0,0 +1,326 @@
+# -*- coding: utf-8 -*-
+
+"""
+sceptre.snapshot
+
+This module implements a ProjectSnapshot class, which stores a compiled copy
+of a Sceptre project's config so that later commands can start without
+walking, rendering and parsing the config tree or importing plugins.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import sys
+
+import yaml
+
+from . import __version__
+from .cache import get_cache_dir
+from .config_cache import config_file_cache
+from .config_index import ConfigIndex
+from .config_index import is_directory_loop
+from .hooks import Hook
+from .plugins import plugin_registry
+from .resolvers import Resolver
+
+
+PLUGIN_BASE_TYPES = {"Resolver": Resolver, "Hook": Hook}
+
+
+def _get_file_hash(path):
+    """
+    Returns the SHA-256 hash of the file at ``path``.
+
+    :param path: The path of the file.
+    :type path: str
+    :returns: The hex digest of the file's hash.
+    :rtype: str
+    """
+    with open(path, "rb") as source_file:
+        return hashlib.sha256(source_file.read()).hexdigest()
+
+
+def _get_listing_hash(directory):
+    """
+    Returns a hash of the names of the entries in ``directory``.
+
+    :param directory: The path of the directory.
+    :type directory: str
+    :returns: The hex digest of the listing's hash, or None if the \\
+        directory does not exist.
+    :rtype: str
+    """
+    try:
+        names = sorted(os.listdir(directory))
+    except OSError:
+        return None
+    return hashlib.sha256("\n".join(names).encode("utf-8")).hexdigest()
+
+
+class ProjectSnapshot(object):
+    """
+    ProjectSnapshot stores a compiled copy of an environment tree in the
+    project's cache directory.
+
+    The snapshot holds the config index of the environment, the parsed YAML
+    of every config file read while loading its stacks, with resolvers and
+    hooks left as unconstructed tags, and the location of every plugin class.
+    Config files rendered from user variables or environment variables are
+    left out, so their values are never written to the project. The
+    dependency graph is not stored separately: each stack's dependencies are
+    read from its parsed config, so they come from the snapshot without any
+    rendering whenever the stack's config files do, and are never stale when
+    they do not.
+
+    When it is loaded, every config file, included template, plugin module
+    and config directory it was built from is checked, first by
+    modification time and size and then by content hash, so a snapshot is
+    only used while the project is unchanged. Files which have only been
+    touched, for example by a fresh checkout, do not invalidate it. A
+    snapshot which cannot be written or read is logged and skipped, and
+    commands fall back to reading the config tree.
+
+    :param sceptre_dir: The absolute path to the Sceptre directory.
+    :type sceptre_dir: str
+    """
+
+    FILE_NAME = "snapshot.pickle"
+    FORMAT = 3
+
+    def __init__(self, sceptre_dir):
+        self.logger = logging.getLogger(__name__)
+
+        self.sceptre_dir = sceptre_dir
+        self.path = os.path.join(get_cache_dir(sceptre_dir), self.FILE_NAME)
+
+    def __repr__(self):
+        return "sceptre.snapshot.ProjectSnapshot(sceptre_dir='{0}')".format(
+            self.sceptre_dir
+        )
+
+    def write(self, environment_path, index_entries):
+        """
+        Writes a snapshot of the environment ``environment_path``, whose
+        configs have been read in this process.
+
+        :param environment_path: The path of the compiled environment.
+        :type environment_path: str
+        :param index_entries: The entries of the environment's config index.
+        :type index_entries: dict
+        :returns: A summary of the snapshot, whose path is None if the \
+            snapshot could not be written.
+        :rtype: dict
+        """
+        config_entries = config_file_cache.get_entries()
+        plugin_map = plugin_registry.get_plugin_map()
+
+        file_paths = set(
+            key[0] for entries in config_entries.values() for key in entries
+        )
+        directories = set(self._get_config_directories(environment_path))
+        for (_, directory), plugins in plugin_map.items():
+            directories.add(directory)
+            file_paths.update(location[1] for location in plugins.values())
+
+        snapshot = {
+            "versions": self._get_versions(),
+            "environment": environment_path,
+            "files": dict(
+                (path, self._get_file_state(path)) for path in file_paths
+            ),
+            "directories": dict(
+                (directory, _get_listing_hash(directory))
+                for directory in directories
+            ),
+            "config_index": index_entries,
+            "config_cache": config_entries,
+            "plugins": plugin_map
+        }
+
+        cache_dir = os.path.dirname(self.path)
+        temporary_path = "{0}.{1}.tmp".format(self.path, os.getpid())
+        try:
+            if not os.path.isdir(cache_dir):
+                os.makedirs(cache_dir)
+            with open(temporary_path, "wb") as snapshot_file:
+                pickle.dump(snapshot, snapshot_file, pickle.HIGHEST_PROTOCOL)
+            os.rename(temporary_path, self.path)
+        except (IOError, OSError) as exp:
+            self.logger.warning(
+                "Could not write project snapshot to %s: %s", self.path, exp
+            )
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            path = None
+        else:
+            self.logger.debug("Wrote project snapshot to %s", self.path)
+            path = self.path
+
+        return {
+            "snapshot": path,
+            "environment": environment_path,
+            "config_files": len(file_paths),
+            "plugins": sorted(
+                name for plugins in plugin_map.values() for name in plugins
+            )
+        }
+
+    def load(self, environment_path):
+        """
+        Loads the snapshot, if it covers ``environment_path`` and the
+        project has not changed since it was written, adding its parsed
+        config files and plugins to the process-wide caches.
+
+        :param environment_path: The path of the environment to be loaded.
+        :type environment_path: str
+        :returns: The config index stored in the snapshot, or None if the \\
+            snapshot cannot be used.
+        :rtype: sceptre.config_index.ConfigIndex
+        """
+        try:
+            with open(self.path, "rb") as snapshot_file:
+                snapshot = pickle.load(snapshot_file)
+        except (IOError, OSError, EOFError, ValueError, pickle.PickleError,
+                AttributeError, ImportError):
+            return None
+
+        if snapshot.get("versions") != self._get_versions():
+            self.logger.debug("Project snapshot is from another version")
+            return None
+        root = snapshot["environment"]
+        if environment_path != root and \
+                not environment_path.startswith(root + "/"):
+            self.logger.debug(
+                "Project snapshot does not include '%s'", environment_path
+            )
+            return None
+
+        try:
+            moved = self._check(snapshot)
+        except (IOError, OSError) as exp:
+            self.logger.warning(
+                "Could not check project snapshot %s: %s", self.path, exp
+            )
+            return None
+        if moved is None:
+            self.logger.debug("Project snapshot is out of date")
+            return None
+
+        config_file_cache.add_entries(dict(
+            (name, dict(
+                (self._move_key(key, moved), value)
+                for key, value in entries.items()
+            ))
+            for name, entries in snapshot["config_cache"].items()
+        ))
+        plugin_registry.add_plugin_map(snapshot["plugins"], PLUGIN_BASE_TYPES)
+        self.logger.debug("Loaded project snapshot from %s", self.path)
+        return ConfigIndex(self.sceptre_dir, root, snapshot["config_index"])
+
+    def _check(self, snapshot):
+        """
+        Checks that the files and directories the snapshot was built from
+        are unchanged.
+
+        :param snapshot: The loaded snapshot.
+        :type snapshot: dict
+        :returns: The new modification time of each file which was touched \\
+            without being changed, keyed by path, or None if the snapshot \\
+            is out of date.
+        :rtype: dict
+        """
+        for directory, listing_hash in snapshot["directories"].items():
+            if _get_listing_hash(directory) != listing_hash:
+                return None
+
+        moved = {}
+        for path, (mtime, size, sha256) in snapshot["files"].items():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return None
+            if (stat.st_mtime, stat.st_size) == (mtime, size):
+                continue
+            if stat.st_size != size or _get_file_hash(path) != sha256:
+                return None
+            moved[path] = stat.st_mtime
+        return moved
+
+    def _get_config_directories(self, environment_path):
+        """
+        Returns the config directories which make up the environment
+        ``environment_path``: the environment's directory tree, and its
+        parent directories up to the config directory.
+
+        :param environment_path: The path of the environment.
+        :type environment_path: str
+        :returns: The absolute directory paths.
+        :rtype: list
+        """
+        config_dir = os.path.join(self.sceptre_dir, "config")
+        root = os.path.join(config_dir, environment_path)
+        directories = []
+        parent = root
+        while parent != config_dir and parent.startswith(config_dir):
+            parent = os.path.dirname(parent)
+            directories.append(parent)
+        for directory, sub_directories, _ in os.walk(root, followlinks=True):
+            sub_directories[:] = [
+                name for name in sub_directories
+                if not name.startswith(".")
+                and not is_directory_loop(directory, name)
+            ]
+            directories.append(directory)
+        return directories
+
+    @staticmethod
+    def _get_file_state(path):
+        """
+        Returns the modification time, size and content hash of a file.
+
+        :param path: The path of the file.
+        :type path: str
+        :returns: The file's state.
+        :rtype: tuple
+        """
+        stat = os.stat(path)
+        return stat.st_mtime, stat.st_size, _get_file_hash(path)
+
+    @classmethod
+    def _get_versions(cls):
+        """
+        Returns the snapshot format and the versions of Sceptre, Python and
+        PyYAML, which must match for a snapshot to be loaded.
+
+        :returns: The versions.
+        :rtype: tuple
+        """
+        return (
+            cls.FORMAT, __version__, tuple(sys.version_info[:2]),
+            yaml.__version__
+        )
+
+    @classmethod
+    def _move_key(cls, key, moved):
+        """
+        Returns a config cache key, with the modification time of its file
+        replaced if the file was touched since the snapshot was written.
+
+        :param key: A config cache key.
+        :type key: tuple
+        :param moved: The new modification times of touched files, keyed by \\
+            path.
+        :type moved: dict
+        :returns: The updated key.
+        :rtype: tuple
+        """
+        if key[0] in moved:
+            key = (key[0], moved[key[0]]) + tuple(key[2:])
+        if len(key) > 6:
+            key = tuple(key[:6]) + (tuple(
+                cls._move_key(include, moved)
+                for include in key[6]
+            ),)
+        return key
@@ -9,6 +9,8 @@ with a particular stack.
 """
 
 import datetime
+import hashlib
+import json
 import logging
 import os
 import time
@@ -17,11 +19,16 @@ import threading
 from dateutil.tz import tzutc
 import botocore
 
+from .cache import get_cache_dir
+from .cache import RenderCache
 from .config import Config
+from .event_stream import StackEventStream
+from .render_pool import get_render_pool
 from .resolvers import ResolvableProperty
 from .stack_status import StackStatus
 from .stack_status import StackChangeSetStatus
 from .template import Template
+from .wait import WaitStrategy
 
 from .hooks import add_stack_hooks
 from .helpers import get_name_tuple
@@ -32,6 +39,7 @@ from .exceptions import UnknownStackStatusError
 from .exceptions import UnknownStackChangeSetStatusError
 from .exceptions import StackDoesNotExistError
 from .exceptions import ProtectedStackError
+from .exceptions import StackTimeoutError
 
 
 class Stack(object):
@@ -48,8 +56,6 @@ class Stack(object):
     :param connection_manager: A connection manager, used to make Boto3 calls.
     :type connection_manager: sceptre.connection_manager.ConnectionManager
     """
-    _config_lock = threading.Lock()
-
     parameters = ResolvableProperty("parameters")
     sceptre_user_data = ResolvableProperty("sceptre_user_data")
 
@@ -58,6 +64,7 @@ class Stack(object):
 
         self.name = name
         self.environment_config = environment_config
+        self._config_lock = threading.Lock()
 
         self._environment_path = self.environment_config.environment_path
         self.project = self.environment_config["project_code"]
@@ -70,6 +77,10 @@ class Stack(object):
         self._hooks = None
         self._dependencies = None
         self._external_name = None
+        self._wait_strategy = None
+        self.status_poller = None
+        self.event_stream = None
+        self.updating = False
 
     def __repr__(self):
         return (
@@ -89,16 +100,17 @@ class Stack(object):
         """
         if self._config is None:
             with self._config_lock:
-                self._config = Config.with_yaml_constructors(
-                    sceptre_dir=self.environment_config.sceptre_dir,
-                    environment_path=self.environment_config.environment_path,
-                    base_file_name=get_name_tuple(self.name)[-1],
-                    environment_config=self.environment_config,
-                    connection_manager=self.connection_manager
-                )
-                self._config.read(
-                    self.environment_config.get("user_variables")
-                )
+                if self._config is None:
+                    environment_config = self.environment_config
+                    config = Config.with_yaml_constructors(
+                        sceptre_dir=environment_config.sceptre_dir,
+                        environment_path=environment_config.environment_path,
+                        base_file_name=get_name_tuple(self.name)[-1],
+                        environment_config=environment_config,
+                        connection_manager=self.connection_manager
+                    )
+                    config.read(environment_config.get("user_variables"))
+                    self._config = config
 
         return self._config
 
@@ -152,17 +164,55 @@ class Stack(object):
         :rtype: str
         """
         if self._template is None:
-            abs_template_path = os.path.join(
-                self.environment_config.sceptre_dir,
-                self.config["template_path"],
-            )
+            cache_dir = get_cache_dir(self.environment_config.sceptre_dir)
+            render_cache = None
+            if self.environment_config.get("render_cache", True):
+                render_cache = RenderCache(cache_dir)
+            render_pool = None
+            if self.environment_config.get("render_processes"):
+                render_pool = get_render_pool(
+                    self.environment_config["render_processes"]
+                )
 
             self._template = Template(
-                path=abs_template_path,
-                sceptre_user_data=self.sceptre_user_data
+                path=self._get_template_path(),
+                sceptre_user_data=self.sceptre_user_data,
+                cache_dir=cache_dir,
+                render_cache=render_cache,
+                render_pool=render_pool
             )
         return self._template
 
+    def use_rendered_template(self, body):
+        """
+        Uses ``body``, rendered ahead of time, as the stack's template. The
+        template is not rendered again, so the stack's sceptre_user_data is
+        not resolved.
+
+        :param body: The rendered body of the stack's template.
+        :type body: str
+        """
+        template = Template(
+            path=self._get_template_path(), sceptre_user_data={}
+        )
+        template.body = body
+        self._template = template
+
+    @property
+    def wait_strategy(self):
+        """
+        Returns the strategy used to poll the stack while an operation is in
+        progress, configured by the ``wait`` item of the stack's config.
+
+        :returns: The stack's wait strategy.
+        :rtype: sceptre.wait.WaitStrategy
+        """
+        if self._wait_strategy is None:
+            self._wait_strategy = WaitStrategy.from_config(
+                self.config.get("wait")
+            )
+        return self._wait_strategy
+
     @property
     def external_name(self):
         """
@@ -200,6 +250,7 @@ class Stack(object):
         }
         create_stack_kwargs.update(self._get_template_details())
         create_stack_kwargs.update(self._get_role_arn())
+        self._start_event_stream(existing=False)
         response = self.connection_manager.call(
             service="cloudformation",
             command="create_stack",
@@ -234,6 +285,7 @@ class Stack(object):
         }
         update_stack_kwargs.update(self._get_template_details())
         update_stack_kwargs.update(self._get_role_arn())
+        self._start_event_stream()
         response = self.connection_manager.call(
             service="cloudformation",
             command="update_stack",
@@ -243,7 +295,11 @@ class Stack(object):
             "%s - Update stack response: %s", self.name, response
         )
 
-        status = self._wait_for_completion()
+        self.updating = True
+        try:
+            status = self._wait_for_completion()
+        finally:
+            self.updating = False
 
         return status
 
@@ -326,6 +382,7 @@ class Stack(object):
 
         delete_stack_kwargs = {"StackName": self.external_name}
         delete_stack_kwargs.update(self._get_role_arn())
+        self._start_event_stream()
         self.connection_manager.call(
             service="cloudformation",
             command="delete_stack",
@@ -447,6 +504,34 @@ class Stack(object):
             self.name
         )
 
+    def cancel_update(self):
+        """
+        Cancels an in-progress update of the stack, which rolls the stack
+        back to its previous configuration. ``updating`` is True while the
+        stack waits for an update it has started.
+
+        :returns: Whether the cancellation was initiated. An update can only \
+            be cancelled while the stack is in the UPDATE_IN_PROGRESS state.
+        :rtype: bool
+        """
+        self.logger.debug("%s - Cancelling update", self.name)
+        try:
+            self.connection_manager.call(
+                service="cloudformation",
+                command="cancel_update_stack",
+                kwargs={"StackName": self.external_name}
+            )
+        except botocore.exceptions.ClientError as exp:
+            self.logger.info(
+                "%s - Update could not be cancelled: %s", self.name,
+                exp.response["Error"]["Message"]
+            )
+            return False
+        self.logger.info(
+            "%s - Successfully initiated cancellation of update", self.name
+        )
+        return True
+
     def set_policy(self, policy_path):
         """
         Applies a stack policy.
@@ -598,6 +683,7 @@ class Stack(object):
         self.logger.debug(
             "%s - Executing change set '%s'", self.name, change_set_name
         )
+        self._start_event_stream()
         self.connection_manager.call(
             service="cloudformation",
             command="execute_change_set",
@@ -626,6 +712,39 @@ class Stack(object):
             }
         )
 
+    def get_fingerprint(self, dependency_fingerprints=None):
+        """
+        Returns a fingerprint of everything that determines the deployed
+        state of the stack.
+
+        The fingerprint is a SHA-256 hash of the stack's rendered template,
+        resolved parameters, tags, role ARN, name, region and IAM role, and
+        of the fingerprints of the stacks it depends on, so that a change to
+        any upstream stack changes the fingerprint of every stack downstream
+        of it.
+
+        :param dependency_fingerprints: The fingerprints of the stacks this \
+            stack depends on, keyed by stack name.
+        :type dependency_fingerprints: dict
+        :returns: The stack's fingerprint.
+        :rtype: str
+        """
+        state = {
+            "name": self.external_name,
+            "region": self.region,
+            "iam_role": self.connection_manager.iam_role,
+            "template_body": self.template.body,
+            "parameters": sorted(
+                self._format_parameters(self.parameters),
+                key=lambda parameter: parameter["ParameterKey"]
+            ),
+            "tags": self.config.get("stack_tags", {}),
+            "role_arn": self._get_role_arn(),
+            "dependencies": dependency_fingerprints or {}
+        }
+        serialised_state = json.dumps(state, sort_keys=True, default=str)
+        return hashlib.sha256(serialised_state.encode("utf-8")).hexdigest()
+
     def get_status(self):
         """
         Returns the stack's status.
@@ -665,6 +784,18 @@ class Stack(object):
 
         return formatted_parameters
 
+    def _get_template_path(self):
+        """
+        Returns the absolute path to the stack's template.
+
+        :returns: The path to the template.
+        :rtype: str
+        """
+        return os.path.join(
+            self.environment_config.sceptre_dir,
+            self.config["template_path"],
+        )
+
     def _get_template_details(self):
         """
         Returns the CloudFormation template location.
@@ -680,8 +811,6 @@ class Stack(object):
                 self.region,
                 self.environment_config["template_bucket_name"],
                 self.environment_config.get("template_key_prefix", ""),
-                self._environment_path,
-                self.external_name,
                 self.connection_manager
             )
             return {"TemplateURL": template_url}
@@ -717,24 +846,128 @@ class Stack(object):
                 "currently enabled".format(self.name)
             )
 
+    def _start_event_stream(self, existing=True):
+        """
+        Starts a new event stream for the stack before an operation is
+        started, so that waiting for the operation only reads, and only
+        finishes on, the operation's own events.
+
+        :param existing: Whether the stack may already have events.
+        :type existing: bool
+        """
+        self.event_stream = StackEventStream(
+            connection_manager=self.connection_manager,
+            stack_name=self.external_name
+        )
+        if existing:
+            self.event_stream.skip_existing()
+
     def _wait_for_completion(self):
         """
         Waits for a stack operation to finish. Prints CloudFormation events
         while it waits.
 
+        Events are read from the stream started by ``_start_event_stream``
+        before the operation. Without one, events from the last three
+        seconds onwards are read.
+
+        If the stack has a ``status_poller``, the stack waits on the poller,
+        which polls many stacks at once, and the stack's new events are
+        printed once every ``event_ticks`` refreshes of the poller and once
+        the operation has finished. Otherwise the stack is
+        polled according to its wait strategy. Each poll only fetches the
+        stack's events: the operation's status is taken from the latest event
+        of the stack itself, so the stack is only described if no such event
+        has been seen yet.
+
         :returns: The final stack status.
         :rtype: sceptre.stack_status.StackStatus
-        """
-        status = StackStatus.IN_PROGRESS
+        :raises: sceptre.exceptions.StackTimeoutError
+        """
+        wait_strategy = self.wait_strategy
+        start = time.time()
+
+        if self.event_stream is None:
+            self.event_stream = StackEventStream(
+                connection_manager=self.connection_manager,
+                stack_name=self.external_name,
+                since=(
+                    datetime.datetime.now(tzutc()) -
+                    datetime.timedelta(seconds=3)
+                )
+            )
+        try:
+            if self.status_poller is not None:
+                return self._wait_on_status_poller(
+                    wait_strategy.timeout, start
+                )
 
-        self.most_recent_event_datetime = (
-            datetime.datetime.now(tzutc()) - datetime.timedelta(seconds=3)
-        )
-        while status == StackStatus.IN_PROGRESS:
-            status = self._get_simplified_status(self.get_status())
-            self._log_new_events()
-            time.sleep(4)
-        return status
+            stack_event_status = None
+            for delay in wait_strategy.get_delays():
+                time.sleep(delay)
+                stack_event_status = \
+                    self._log_new_events() or stack_event_status
+                status = self._get_simplified_status(
+                    stack_event_status or self.get_status()
+                )
+                if status != StackStatus.IN_PROGRESS:
+                    return status
+                self._check_timeout(wait_strategy.timeout, start)
+        finally:
+            self.event_stream = None
+
+    def _wait_on_status_poller(self, timeout, start):
+        """
+        Waits on the stack's status poller for the stack's operation to
+        finish. The operation's status is taken from the poller alone, and
+        the stack's new events are only printed once every ``event_ticks``
+        refreshes of the poller, and once the operation has finished.
+
+        :param timeout: The number of seconds after which to stop waiting, \
+            or None to wait indefinitely.
+        :type timeout: float
+        :param start: The time at which the wait started.
+        :type start: float
+        :returns: The final stack status.
+        :rtype: sceptre.stack_status.StackStatus
+        :raises: sceptre.exceptions.StackTimeoutError
+        """
+        tick = events_tick = self.status_poller.tick
+        future = self.status_poller.watch(self)
+        try:
+            while True:
+                remaining = None
+                if timeout is not None:
+                    remaining = max(timeout - (time.time() - start), 0)
+                tick = self.status_poller.wait_for_tick(tick, remaining)
+                if future.done():
+                    self._log_new_events()
+                    return self._get_simplified_status(future.result())
+                if tick - events_tick >= self.status_poller.event_ticks:
+                    self._log_new_events()
+                    events_tick = tick
+                self._check_timeout(timeout, start)
+        finally:
+            self.status_poller.unwatch(self, future)
+
+    def _check_timeout(self, timeout, start):
+        """
+        Raises a StackTimeoutError if more than ``timeout`` seconds have
+        passed since ``start``.
+
+        :param timeout: The number of seconds after which to stop waiting, \
+            or None to wait indefinitely.
+        :type timeout: float
+        :param start: The time at which the wait started.
+        :type start: float
+        :raises: sceptre.exceptions.StackTimeoutError
+        """
+        if timeout is not None and time.time() - start >= timeout:
+            raise StackTimeoutError(
+                "'{0}' did not finish within {1} seconds".format(
+                    self.name, timeout
+                )
+            )
 
     @staticmethod
     def _get_simplified_status(status):
@@ -769,14 +1002,13 @@ class Stack(object):
     def _log_new_events(self):
         """
         Log the latest stack events while the stack is being built.
+
+        :returns: The status in the latest new event of the stack itself, \
+            rather than one of its resources, if there is one.
+        :rtype: str
         """
-        events = self.describe_events()["StackEvents"]
-        events.reverse()
-        new_events = [
-            event for event in events
-            if event["Timestamp"] > self.most_recent_event_datetime
-        ]
-        for event in new_events:
+        stack_event_status = None
+        for event in self.event_stream.read():
             self.logger.info(" ".join([
                 event["Timestamp"].replace(microsecond=0).isoformat(),
                 self.name,
@@ -785,7 +1017,10 @@ class Stack(object):
                 event["ResourceStatus"],
                 event.get("ResourceStatusReason", "")
             ]))
-            self.most_recent_event_datetime = event["Timestamp"]
+            if event["LogicalResourceId"] == self.external_name and \
+                    event["ResourceType"] == "AWS::CloudFormation::Stack":
+                stack_event_status = event["ResourceStatus"]
+        return stack_event_status
 
     def wait_for_cs_completion(self, change_set_name):
         """
@@ -7,11 +7,14 @@ This module implements a Template class, which stores a CloudFormation template
 and implements methods for uploading it to S3.
 """
 
-from datetime import datetime
+import ast
+import hashlib
 import imp
+import json
 import logging
 import os
 import sys
+import sysconfig
 import threading
 
 import botocore
@@ -20,6 +23,72 @@ from .exceptions import UnsupportedTemplateFileTypeError
 from .exceptions import TemplateSceptreHandlerError
 
 
+_jinja_environments = {}
+_jinja_environments_lock = threading.Lock()
+_file_hashes = {}
+_file_imports = {}
+_source_paths = {}
+_module_paths = {}
+
+
+class _BytecodeCache(jinja2.FileSystemBytecodeCache):
+    """
+    A Jinja bytecode cache which skips, rather than fails on, compiled
+    templates which cannot be written, as they can always be compiled again.
+    """
+
+    def dump_bytecode(self, bucket):
+        try:
+            super(_BytecodeCache, self).dump_bytecode(bucket)
+        except (IOError, OSError) as exp:
+            logging.getLogger(__name__).debug(
+                "Could not cache compiled template: %s", exp
+            )
+
+
+def get_jinja_environment(template_dir, cache_dir=None):
+    """
+    Returns the Jinja environment used to render templates in
+    ``template_dir``.
+
+    One environment is shared by every template in a directory, so compiled
+    templates and the macros they include are reused between renders. If
+    ``cache_dir`` is given, compiled templates are also cached on disk under
+    ``<cache_dir>/jinja``, so that later runs skip compiling them. If the
+    cache directory cannot be created, templates are compiled in memory
+    only.
+
+    :param template_dir: The directory containing the templates.
+    :type template_dir: str
+    :param cache_dir: The project's cache directory.
+    :type cache_dir: str
+    :returns: The Jinja environment.
+    :rtype: jinja2.Environment
+    """
+    key = (template_dir, cache_dir)
+    with _jinja_environments_lock:
+        if key not in _jinja_environments:
+            bytecode_cache = None
+            if cache_dir is not None:
+                bytecode_dir = os.path.join(cache_dir, "jinja")
+                try:
+                    if not os.path.isdir(bytecode_dir):
+                        os.makedirs(bytecode_dir)
+                except OSError as exp:
+                    logging.getLogger(__name__).warning(
+                        "Could not create %s, compiled templates will not be "
+                        "cached: %s", bytecode_dir, exp
+                    )
+                else:
+                    bytecode_cache = _BytecodeCache(bytecode_dir)
+            _jinja_environments[key] = jinja2.Environment(
+                loader=jinja2.FileSystemLoader(template_dir),
+                undefined=jinja2.StrictUndefined,
+                bytecode_cache=bytecode_cache
+            )
+        return _jinja_environments[key]
+
+
 class Template(object):
     """
     Template represents an AWS CloudFormation template. It is responsible for
@@ -31,15 +100,32 @@ class Template(object):
     :param sceptre_user_data: A dictionary of arbitrary data to be passed to \
         a handler function in an external Python script.
     :type sceptre_user_data: dict
+    :param cache_dir: The project's cache directory, used to cache compiled \
+        Jinja templates between runs.
+    :type cache_dir: str
+    :param render_cache: A cache of rendered template bodies.
+    :type render_cache: sceptre.cache.RenderCache
+    :param render_pool: A pool of processes to render Python templates in.
+    :type render_pool: sceptre.render_pool.RenderPool
     """
 
-    _boto_s3_lock = threading.Lock()
+    _registry_lock = threading.Lock()
+    _verified_buckets = set()
+    _bucket_locks = {}
+    _uploaded_keys = set()
+    _upload_locks = {}
 
-    def __init__(self, path, sceptre_user_data):
+    def __init__(
+            self, path, sceptre_user_data, cache_dir=None, render_cache=None,
+            render_pool=None
+    ):
         self.logger = logging.getLogger(__name__)
 
         self.path = path
         self.sceptre_user_data = sceptre_user_data
+        self.cache_dir = cache_dir
+        self.render_cache = render_cache
+        self.render_pool = render_pool
         self.name = os.path.basename(path).split(".")[0]
         self._body = None
 
@@ -65,14 +151,8 @@ class Template(object):
             if file_extension in {".json", ".yaml"}:
                 with open(self.path) as template_file:
                     self._body = template_file.read()
-            elif file_extension == ".j2":
-                self._body = self._render_jinja_template(
-                    os.path.dirname(self.path),
-                    os.path.basename(self.path),
-                    {"sceptre_user_data": self.sceptre_user_data}
-                )
-            elif file_extension == ".py":
-                self._body = self._call_sceptre_handler()
+            elif file_extension in {".j2", ".py"}:
+                self._body = self._render()
 
             else:
                 raise UnsupportedTemplateFileTypeError(
@@ -82,6 +162,284 @@ class Template(object):
                 )
         return self._body
 
+    @body.setter
+    def body(self, body):
+        self._body = body
+
+    def get_render_key(self):
+        """
+        Returns a key which identifies the inputs of the template's render:
+        the contents of every file in the template's directory, which
+        includes the template and the helper modules and files it uses, and
+        the template's ``sceptre_user_data``. The key of a Python template
+        also covers the Python version and the source of every module it
+        imports from outside the standard library. Directories are walked
+        and modules are found once per process, so each key only hashes the
+        files whose size or modification time has changed.
+
+        :returns: The hex digest of the render's inputs.
+        :rtype: str
+        """
+        digest = hashlib.sha256()
+        template_dir = os.path.dirname(self.path)
+        for path in self._get_source_paths(template_dir):
+            digest.update(os.path.relpath(path, template_dir).encode("utf-8"))
+            digest.update(self._get_file_hash(path).encode("utf-8"))
+        if self.path.endswith(".py"):
+            digest.update(sys.version.encode("utf-8"))
+            for path in self._get_module_paths():
+                digest.update(path.encode("utf-8"))
+                digest.update(self._get_file_hash(path).encode("utf-8"))
+        digest.update(json.dumps(
+            self.sceptre_user_data, sort_keys=True, default=repr
+        ).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _render(self):
+        """
+        Renders a Jinja or Python template, using the render cache if the
+        template has one.
+
+        :returns: The body of the CloudFormation template.
+        :rtype: str
+        """
+        render_key = None
+        if self.render_cache is not None:
+            render_key = self.get_render_key()
+            body = self.render_cache.get(render_key)
+            if body is not None:
+                return body
+
+        if self.path.endswith(".j2"):
+            body = self._render_jinja_template(
+                os.path.dirname(self.path),
+                os.path.basename(self.path),
+                {"sceptre_user_data": self.sceptre_user_data},
+                self.cache_dir
+            )
+        elif self.render_pool is not None:
+            body = self.render_pool.render(self.path, self.sceptre_user_data)
+        else:
+            body = self._call_sceptre_handler()
+
+        if render_key is not None and isinstance(body, (bytes, type(u""))):
+            self.render_cache.set(render_key, body)
+        return body
+
+    @staticmethod
+    def _get_source_paths(template_dir):
+        """
+        Returns the paths of the files in ``template_dir`` and its
+        subdirectories, excluding hidden directories and compiled Python.
+        Each directory is only walked once per process.
+
+        :param template_dir: The directory containing the template.
+        :type template_dir: str
+        :returns: The sorted file paths.
+        :rtype: list
+        """
+        if template_dir not in _source_paths:
+            paths = []
+            for directory, subdirectories, filenames in os.walk(template_dir):
+                subdirectories[:] = [
+                    subdirectory for subdirectory in subdirectories
+                    if not subdirectory.startswith(".") and
+                    subdirectory != "__pycache__"
+                ]
+                paths.extend(
+                    os.path.join(directory, filename)
+                    for filename in filenames
+                    if not filename.endswith((".pyc", ".pyo"))
+                )
+            _source_paths[template_dir] = sorted(paths)
+        return _source_paths[template_dir]
+
+    def _get_module_paths(self):
+        """
+        Returns the source files of the modules which a Python template
+        imports, and of the modules which they import in turn. Modules from
+        the standard library are left out. Installed packages are included
+        whole, but the modules they import are not followed.
+
+        :returns: The sorted file paths.
+        :rtype: list
+        """
+        template_dir = os.path.dirname(self.path)
+        search_path = [template_dir]
+        directory = template_dir
+        while os.path.dirname(directory) != directory and \
+                directory != os.getcwd():
+            directory = os.path.dirname(directory)
+            search_path.append(directory)
+        search_path.extend(path or os.getcwd() for path in sys.path)
+
+        paths = set()
+        unread = [self.path]
+        read = set()
+        while unread:
+            path = unread.pop()
+            if path in read:
+                continue
+            read.add(path)
+            for name, module_search_path in self._get_imports(
+                    path, search_path
+            ):
+                for module_path in self._find_module(
+                        name, module_search_path
+                ):
+                    paths.add(module_path)
+                    if not self._is_installed(module_path) and \
+                            module_path.endswith(".py"):
+                        unread.append(module_path)
+        paths.discard(self.path)
+        return sorted(paths)
+
+    @staticmethod
+    def _get_imports(path, search_path):
+        """
+        Returns the top-level names of the modules imported by the Python
+        file at ``path``. Imports are memoised for as long as the file's
+        size and modification time are unchanged.
+
+        :param path: The path of the file.
+        :type path: str
+        :param search_path: The directories to find absolute imports in.
+        :type search_path: list
+        :returns: Each module name, with the directories to find it in.
+        :rtype: list
+        """
+        stat = os.stat(path)
+        key = (path, stat.st_mtime, stat.st_size)
+        if key not in _file_imports:
+            try:
+                with open(path, "rb") as source_file:
+                    nodes = list(ast.walk(
+                        ast.parse(source_file.read(), path)
+                    ))
+            except (SyntaxError, ValueError):
+                nodes = []
+            imports = []
+            for node in nodes:
+                if isinstance(node, ast.Import):
+                    imports.extend(
+                        (alias.name.split(".")[0], None)
+                        for alias in node.names
+                    )
+                elif isinstance(node, ast.ImportFrom) and node.level:
+                    package_dir = os.path.dirname(path)
+                    for _ in range(node.level - 1):
+                        package_dir = os.path.dirname(package_dir)
+                    names = [node.module.split(".")[0]] if node.module \
+                        else [alias.name for alias in node.names]
+                    imports.extend((name, package_dir) for name in names)
+                elif isinstance(node, ast.ImportFrom):
+                    imports.append((node.module.split(".")[0], None))
+            _file_imports[key] = imports
+        return [
+            (name, search_path if package_dir is None else [package_dir])
+            for name, package_dir in _file_imports[key]
+        ]
+
+    @classmethod
+    def _find_module(cls, name, search_path):
+        """
+        Returns the source files of the module ``name``, or nothing if it is
+        built in, part of the standard library or cannot be found. Modules
+        are only found once per process for each search path.
+
+        :param name: The top-level name of the module.
+        :type name: str
+        :param search_path: The directories to find the module in.
+        :type search_path: list
+        :returns: The file paths.
+        :rtype: list
+        """
+        key = (name, tuple(search_path))
+        if key not in _module_paths:
+            _module_paths[key] = cls._resolve_module(name, search_path)
+        return _module_paths[key]
+
+    @classmethod
+    def _resolve_module(cls, name, search_path):
+        """
+        Finds the source files of the module ``name``.
+
+        :param name: The top-level name of the module.
+        :type name: str
+        :param search_path: The directories to find the module in.
+        :type search_path: list
+        :returns: The file paths.
+        :rtype: list
+        """
+        if name in sys.builtin_module_names:
+            return []
+        try:
+            module_file, path, _ = imp.find_module(name, search_path)
+        except ImportError:
+            return []
+        if module_file is not None:
+            module_file.close()
+        if cls._is_standard_library(path):
+            return []
+        if os.path.isfile(path):
+            return [path]
+        return [
+            source_path for source_path in cls._get_source_paths(path)
+            if source_path.endswith(".py")
+        ]
+
+    @staticmethod
+    def _is_installed(path):
+        """
+        Returns whether ``path`` belongs to an installed package.
+
+        :param path: A file path.
+        :type path: str
+        :returns: Whether the file is in a site-packages directory.
+        :rtype: bool
+        """
+        parts = path.split(os.path.sep)
+        return "site-packages" in parts or "dist-packages" in parts
+
+    @classmethod
+    def _is_standard_library(cls, path):
+        """
+        Returns whether ``path`` belongs to the standard library.
+
+        :param path: A file path.
+        :type path: str
+        :returns: Whether the file is part of the standard library.
+        :rtype: bool
+        """
+        if cls._is_installed(path):
+            return False
+        paths = sysconfig.get_paths()
+        return any(
+            path.startswith(paths[name] + os.path.sep)
+            for name in ("stdlib", "platstdlib")
+        )
+
+    @staticmethod
+    def _get_file_hash(path):
+        """
+        Returns the SHA-256 hash of the file at ``path``. Hashes are
+        memoised for as long as the file's size and modification time are
+        unchanged.
+
+        :param path: The path of the file.
+        :type path: str
+        :returns: The hex digest of the file's hash.
+        :rtype: str
+        """
+        stat = os.stat(path)
+        key = (path, stat.st_mtime, stat.st_size)
+        if key not in _file_hashes:
+            with open(path, "rb") as source_file:
+                _file_hashes[key] = hashlib.sha256(
+                    source_file.read()
+                ).hexdigest()
+        return _file_hashes[key]
+
     def _call_sceptre_handler(self):
         """
         Calls the function `sceptre_handler` within templates that are python
@@ -128,14 +486,16 @@ class Template(object):
         return body
 
     def upload_to_s3(
-            self, region, bucket_name, key_prefix, environment_path,
-            stack_name, connection_manager
+            self, region, bucket_name, key_prefix, connection_manager
     ):
         """
         Uploads the template to ``bucket_name`` and returns its URL.
 
         The template is uploaded with the key
-        ``<key_prefix>/<region>/<environment_path>/<stack_name>-<timestamp>.json``.
+        ``<key_prefix>/<region>/<sha256>.json``, where ``sha256`` is the hash
+        of the template's body, so stacks with identical templates share an
+        object. The upload is skipped if the object has already been uploaded
+        during this run, or already exists in the bucket.
 
         :param region: The AWS region to create the bucket in.
         :type region: str
@@ -144,10 +504,6 @@ class Template(object):
         :param key_prefix: A string to prefix to the key used to store the
             template in S3.
         :type key_prefix: str
-        :param environment_path: The environment that the stack belongs to.
-        :type env_path: str
-        :param stack_name: The name of the stack that this template creates.
-        :type stack_name: str
         :param connection_manager: The connection manager used to make
             AWS calls.
         :type connection_manager: sceptre.connection_manager.ConnectionManager
@@ -158,9 +514,7 @@ class Template(object):
         """
         self.logger.debug("%s - Uploading template to S3...", self.name)
 
-        with self._boto_s3_lock:
-            if not self._bucket_exists(bucket_name, connection_manager):
-                self._create_bucket(region, bucket_name, connection_manager)
+        self._ensure_bucket(region, bucket_name, connection_manager)
 
         # Remove any leading or trailing slashes the user may have added.
         key_prefix = key_prefix.strip("/")
@@ -168,27 +522,39 @@ class Template(object):
         template_key = "/".join([
             key_prefix,
             region,
-            environment_path,
-            "{stack_name}-{time_stamp}.json".format(
-                stack_name=stack_name,
-                time_stamp=datetime.utcnow().strftime("%Y-%m-%d-%H-%M-%S-%fZ")
-            )
+            "{0}.json".format(self.get_body_hash())
         ])
 
-        self.logger.debug(
-            "%s - Uploading template to: 's3://%s/%s'",
-            self.name, bucket_name, template_key
-        )
-        connection_manager.call(
-            service="s3",
-            command="put_object",
-            kwargs={
-                "Bucket": bucket_name,
-                "Key": template_key,
-                "Body": self.body,
-                "ServerSideEncryption": "AES256"
-            }
-        )
+        with self._registry_lock:
+            upload_lock = self._upload_locks.setdefault(
+                (bucket_name, template_key), threading.Lock()
+            )
+        with upload_lock:
+            if (bucket_name, template_key) in self._uploaded_keys:
+                self.logger.debug(
+                    "%s - Template already uploaded to: 's3://%s/%s'",
+                    self.name, bucket_name, template_key
+                )
+            elif self._object_exists(
+                bucket_name, template_key, connection_manager
+            ):
+                self._uploaded_keys.add((bucket_name, template_key))
+            else:
+                self.logger.debug(
+                    "%s - Uploading template to: 's3://%s/%s'",
+                    self.name, bucket_name, template_key
+                )
+                connection_manager.call(
+                    service="s3",
+                    command="put_object",
+                    kwargs={
+                        "Bucket": bucket_name,
+                        "Key": template_key,
+                        "Body": self.body,
+                        "ServerSideEncryption": "AES256"
+                    }
+                )
+                self._uploaded_keys.add((bucket_name, template_key))
 
         url = "https://{0}.s3.amazonaws.com/{1}".format(
             bucket_name, template_key
@@ -198,6 +564,90 @@ class Template(object):
 
         return url
 
+    def get_body_hash(self):
+        """
+        Returns the SHA-256 hash of the template's body.
+
+        :returns: The hex digest of the body's hash.
+        :rtype: str
+        """
+        body = self.body
+        if not isinstance(body, bytes):
+            body = body.encode("utf-8")
+        return hashlib.sha256(body).hexdigest()
+
+    def _ensure_bucket(self, region, bucket_name, connection_manager):
+        """
+        Creates the bucket ``bucket_name`` in the region ``region`` if it
+        does not exist.
+
+        Buckets are verified once per process. Verified buckets are recorded
+        in a registry keyed by bucket name and region, so later uploads to
+        them make no calls and take no locks.
+
+        :param region: The AWS region to create the bucket in.
+        :type region: str
+        :param bucket_name: The name of the bucket to create.
+        :type bucket_name: str
+        :param connection_manager: The connection manager used to make
+            AWS calls.
+        :type connection_manager: sceptre.connection_manager.ConnectionManager
+        :raises: botocore.exception.ClientError
+
+        """
+        key = (bucket_name, region)
+        if key in self._verified_buckets:
+            return
+        with self._registry_lock:
+            bucket_lock = self._bucket_locks.setdefault(key, threading.Lock())
+        with bucket_lock:
+            if key in self._verified_buckets:
+                return
+            if not self._bucket_exists(bucket_name, connection_manager):
+                self._create_bucket(region, bucket_name, connection_manager)
+            self._verified_buckets.add(key)
+
+    def _object_exists(self, bucket_name, key, connection_manager):
+        """
+        Checks if the object ``key`` exists in the bucket ``bucket_name``.
+        If the object cannot be read, as with roles which may put but not get
+        objects, it is treated as absent so that it is uploaded.
+
+        :param bucket_name: The name of the bucket to check.
+        :type bucket_name: str
+        :param key: The key of the object to check.
+        :type key: str
+        :param connection_manager: The connection manager used to make
+            AWS calls.
+        :type connection_manager: sceptre.connection_manager.ConnectionManager
+        :returns: Boolean whether the object exists
+        :rtype: bool
+        :raises: botocore.exception.ClientError
+
+        """
+        try:
+            connection_manager.call(
+                service="s3",
+                command="head_object",
+                kwargs={"Bucket": bucket_name, "Key": key}
+            )
+        except botocore.exceptions.ClientError as exp:
+            code = exp.response["Error"]["Code"]
+            if code in ("403", "AccessDenied"):
+                self.logger.debug(
+                    "%s - Cannot check for template at 's3://%s/%s', "
+                    "uploading it", self.name, bucket_name, key
+                )
+                return False
+            if code in ("404", "NoSuchKey"):
+                return False
+            raise
+        self.logger.debug(
+            "%s - Template already exists at: 's3://%s/%s'",
+            self.name, bucket_name, key
+        )
+        return True
+
     def _bucket_exists(self, bucket_name, connection_manager):
         """
         Checks if the bucket ``bucket_name`` exists.
@@ -271,7 +721,9 @@ class Template(object):
             )
 
     @staticmethod
-    def _render_jinja_template(template_dir, filename, jinja_vars):
+    def _render_jinja_template(
+            template_dir, filename, jinja_vars, cache_dir=None
+    ):
         """
         Renders a jinja template.
 
@@ -284,15 +736,14 @@ class Template(object):
         :type filename: str
         :param jinja_vars: Dict of variables to render into the template.
         :type jinja_vars: dict
+        :param cache_dir: The project's cache directory.
+        :type cache_dir: str
         :returns: The body of the CloudFormation template.
         :rtype: string
         """
         logger = logging.getLogger(__name__)
         logger.debug("%s Rendering CloudFormation template", filename)
-        env = jinja2.Environment(
-            loader=jinja2.FileSystemLoader(template_dir),
-            undefined=jinja2.StrictUndefined
-        )
+        env = get_jinja_environment(template_dir, cache_dir)
         template = env.get_template(filename)
         body = template.render(**jinja_vars)
         return body
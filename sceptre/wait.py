@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+"""
+sceptre.wait
+
+This module implements a WaitStrategy class, which determines how often
+Sceptre polls CloudFormation while it waits for a stack operation to finish.
+"""
+
+import random
+
+
+class WaitStrategy(object):
+    """
+    WaitStrategy yields the delays between polls of a stack operation.
+
+    Polling starts quickly, so that short operations finish promptly, and
+    backs off exponentially up to ``max_delay`` so that long operations do
+    not exhaust CloudFormation's request limits. Each delay is randomised by
+    up to ``jitter`` of its length, so that stacks launched together do not
+    poll in lockstep.
+
+    :param initial_delay: The number of seconds to wait before the first \
+        poll.
+    :type initial_delay: float
+    :param max_delay: The longest number of seconds to wait between polls.
+    :type max_delay: float
+    :param backoff: The factor by which the delay grows after each poll.
+    :type backoff: float
+    :param jitter: The fraction of each delay by which it is randomised.
+    :type jitter: float
+    :param timeout: The number of seconds after which to stop waiting. \
+        Defaults to waiting indefinitely.
+    :type timeout: float
+    """
+
+    DEFAULTS = {
+        "initial_delay": 1,
+        "max_delay": 20,
+        "backoff": 1.5,
+        "jitter": 0.2,
+        "timeout": None
+    }
+
+    def __init__(
+            self, initial_delay=1, max_delay=20, backoff=1.5, jitter=0.2,
+            timeout=None
+    ):
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.backoff = backoff
+        self.jitter = jitter
+        self.timeout = timeout
+
+    def __repr__(self):
+        return (
+            "sceptre.wait.WaitStrategy(initial_delay={0}, max_delay={1}, "
+            "backoff={2}, jitter={3}, timeout={4})".format(
+                self.initial_delay, self.max_delay, self.backoff,
+                self.jitter, self.timeout
+            )
+        )
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Returns a WaitStrategy configured by the ``wait`` item of a stack's
+        config. Items which are not set take their default values.
+
+        :param config: The wait config.
+        :type config: dict
+        :returns: The wait strategy.
+        :rtype: sceptre.wait.WaitStrategy
+        """
+        config = config or {}
+        return cls(**{
+            key: config.get(key, default)
+            for key, default in cls.DEFAULTS.items()
+        })
+
+    def get_delays(self):
+        """
+        Returns a generator of the delays between polls.
+
+        :returns: A generator of delays, in seconds.
+        :rtype: generator
+        """
+        delay = self.initial_delay
+        while True:
+            yield min(
+                self.max_delay,
+                delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+            )
+            delay = min(self.max_delay, delay * self.backoff)
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import shutil
+import tempfile
+
+from sceptre.cache import get_cache_dir
+from sceptre.cache import JsonStore
+from sceptre.cache import RenderCache
+from sceptre.cache import StackDurations
+
+
+class TestJsonStore(object):
+
+    def setup_method(self, test_method):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "nested", "store.json")
+        self.store = JsonStore(self.path)
+
+    def teardown_method(self, test_method):
+        shutil.rmtree(self.directory)
+
+    def test_get_with_missing_file(self):
+        assert self.store.get("key", "default") == "default"
+
+    def test_get_with_invalid_file(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "w") as store_file:
+            store_file.write("not json")
+        assert self.store.data == {}
+
+    def test_set_and_save(self):
+        self.store.set("key", "value")
+        self.store.save()
+
+        with open(self.path) as store_file:
+            assert json.load(store_file) == {"key": "value"}
+        assert JsonStore(self.path).get("key") == "value"
+
+    def test_save_with_unwritable_directory(self):
+        with open(os.path.join(self.directory, "nested"), "w"):
+            pass
+        self.store.set("key", "value")
+        self.store.save()
+
+        assert self.store.get("key") == "value"
+
+
+class TestStackDurations(object):
+
+    def setup_method(self, test_method):
+        self.sceptre_dir = tempfile.mkdtemp()
+        self.durations = StackDurations(self.sceptre_dir)
+
+    def teardown_method(self, test_method):
+        shutil.rmtree(self.sceptre_dir)
+
+    def test_path_is_in_cache_dir(self):
+        assert self.durations.path == os.path.join(
+            get_cache_dir(self.sceptre_dir), "durations.json"
+        )
+
+    def test_record_averages_durations(self):
+        self.durations.record("launch", {"dev/vpc": 10.0})
+        self.durations.record("launch", {"dev/vpc": 20.0, "dev/app": 4.0})
+
+        assert self.durations.get_durations("launch") == {
+            "dev/vpc": 15.0, "dev/app": 4.0
+        }
+        assert self.durations.get_durations("delete") == {}
+
+
+class TestRenderCache(object):
+
+    def setup_method(self, test_method):
+        self.directory = tempfile.mkdtemp()
+        self.render_cache = RenderCache(self.directory, max_size=10)
+
+    def teardown_method(self, test_method):
+        shutil.rmtree(self.directory)
+
+    def test_get_with_missing_entry(self):
+        assert self.render_cache.get("key") is None
+
+    def test_set_and_get(self):
+        self.render_cache.set("key", u"body")
+        assert self.render_cache.get("key") == u"body"
+
+    def test_set_evicts_least_recently_used_entries(self):
+        self.render_cache.set("a", u"aaaa")
+        self.render_cache.set("b", u"bbbb")
+        os.utime(os.path.join(self.render_cache.path, "a"), (1, 1))
+        os.utime(os.path.join(self.render_cache.path, "b"), (2, 2))
+
+        self.render_cache.set("c", u"cccc")
+
+        assert self.render_cache.get("a") is None
+        assert self.render_cache.get("b") == u"bbbb"
+        assert self.render_cache.get("c") == u"cccc"
+
+    def test_set_with_unwritable_cache_dir(self):
+        path = os.path.join(self.directory, "cache")
+        with open(path, "w") as cache_file:
+            cache_file.write("")
+        render_cache = RenderCache(path)
+
+        render_cache.set("key", u"body")
+
+        assert render_cache.get("key") is None
@@ -1,4 +1,6 @@
 import logging
+import os
+import tempfile
 import yaml
 import datetime
 
@@ -157,7 +159,20 @@ class TestCli(object):
         mock_getcwd.return_value = sentinel.cwd
         self.runner.invoke(cli, ["launch-env", "dev"])
         mock_get_env.assert_called_with(sentinel.cwd, "dev", {})
-        mock_get_env.return_value.launch.assert_called_with()
+        mock_get_env.return_value.launch.assert_called_with(
+            max_concurrency=None, explain_schedule=False, incremental=False,
+            on_failure="continue", rendered_dir=None
+        )
+
+    @patch("sceptre.cli.get_env")
+    def test_launch_env_with_on_failure(self, mock_get_env):
+        self.runner.invoke(
+            cli, ["launch-env", "--on-failure", "cancel-in-flight", "dev"]
+        )
+        mock_get_env.return_value.launch.assert_called_with(
+            max_concurrency=None, explain_schedule=False, incremental=False,
+            on_failure="cancel-in-flight", rendered_dir=None
+        )
 
     @patch("sceptre.cli.get_env")
     def test_launch_env_returns_zero_correctly(self, mock_get_env):
@@ -183,7 +198,10 @@ class TestCli(object):
             sentinel.response
         self.runner.invoke(cli, ["delete-env", "dev"])
         mock_get_env.assert_called_with(sentinel.cwd, "dev", {})
-        mock_get_env.return_value.delete.assert_called_with()
+        mock_get_env.return_value.delete.assert_called_with(
+            max_concurrency=None, explain_schedule=False,
+            on_failure="continue"
+        )
 
     @patch("sceptre.cli.get_env")
     def test_delete_env_returns_zero_correctly(self, mock_get_env):
@@ -201,6 +219,50 @@ class TestCli(object):
         result = self.runner.invoke(cli, ["delete-env", "environment"])
         assert result.exit_code == 1
 
+    @patch("sceptre.cli.get_env")
+    def test_launch_env_from_rendered(self, mock_get_env):
+        rendered_dir = tempfile.mkdtemp()
+        self.runner.invoke(
+            cli, ["launch-env", "--from-rendered", rendered_dir, "dev"]
+        )
+        os.rmdir(rendered_dir)
+        mock_get_env.return_value.launch.assert_called_with(
+            max_concurrency=None, explain_schedule=False, incremental=False,
+            on_failure="continue", rendered_dir=rendered_dir
+        )
+
+    @patch("sceptre.cli.os.getcwd")
+    @patch("sceptre.cli.get_env")
+    def test_generate_env(self, mock_get_env, mock_getcwd):
+        mock_getcwd.return_value = sentinel.cwd
+        mock_get_env.return_value.generate.return_value = {
+            "environment": "dev"
+        }
+        result = self.runner.invoke(
+            cli, ["generate-env", "--out", "rendered", "dev"]
+        )
+        mock_get_env.assert_called_with(sentinel.cwd, "dev", {})
+        mock_get_env.return_value.generate.assert_called_with(
+            "rendered", max_concurrency=None
+        )
+        assert result.output == "environment: dev\n\n"
+
+    @patch("sceptre.cli.os.getcwd")
+    @patch("sceptre.cli.get_env")
+    def test_plan_env(self, mock_get_env, mock_getcwd):
+        mock_getcwd.return_value = sentinel.cwd
+        mock_get_env.return_value.plan.return_value = {
+            "waves": [["dev/vpc"]]
+        }
+        result = self.runner.invoke(
+            cli, ["plan-env", "--command", "delete", "dev"]
+        )
+        mock_get_env.assert_called_with(sentinel.cwd, "dev", {})
+        mock_get_env.return_value.plan.assert_called_with(
+            command="delete", max_concurrency=None
+        )
+        assert result.output == '{"waves": [["dev/vpc"]]}\n'
+
     @patch("sceptre.cli.os.getcwd")
     @patch("sceptre.cli.get_env")
     def test_continue_update_rollback(self, mock_get_env, mock_getcwd):
@@ -501,21 +563,40 @@ class TestCli(object):
         result = self.runner.invoke(cli, ["get-stack-policy", "dev", "vpc"])
         assert result.output == "{}\n"
 
+    @patch("sceptre.cli.ProjectSnapshot")
     @patch("sceptre.cli.os.getcwd")
     @patch("sceptre.cli.Environment")
-    def test_get_env(self, mock_Environment, mock_getcwd):
+    def test_get_env(self, mock_Environment, mock_getcwd, mock_Snapshot):
         mock_Environment.return_value = sentinel.environment
         mock_getcwd.return_value = sentinel.cwd
+        mock_Snapshot.return_value.load.return_value = sentinel.config_index
         response = sceptre.cli.get_env(
             sentinel.cwd, sentinel.environment_path, sentinel.options
         )
+        mock_Snapshot.assert_called_once_with(sentinel.cwd)
+        mock_Snapshot.return_value.load.assert_called_once_with(
+            sentinel.environment_path
+        )
         mock_Environment.assert_called_once_with(
             sceptre_dir=sentinel.cwd,
             environment_path=sentinel.environment_path,
-            options=sentinel.options
+            options=sentinel.options,
+            config_index=sentinel.config_index
         )
         assert response == sentinel.environment
 
+    @patch("sceptre.cli.os.getcwd")
+    @patch("sceptre.cli.get_env")
+    def test_compile(self, mock_get_env, mock_getcwd):
+        mock_getcwd.return_value = sentinel.cwd
+        mock_get_env.return_value.compile.return_value = {
+            "environment": "dev"
+        }
+        result = self.runner.invoke(cli, ["compile", "dev"])
+        mock_get_env.assert_called_with(sentinel.cwd, "dev", {})
+        mock_get_env.return_value.compile.assert_called_once_with()
+        assert result.output == "environment: dev\n\n"
+
     def test_setup_logging_with_debug(self):
         logger = sceptre.cli.setup_logging(True, False)
         assert logger.getEffectiveLevel() == logging.DEBUG
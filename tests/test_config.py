@@ -5,6 +5,7 @@ from tempfile import mkdtemp
 import shutil
 import os
 from mock import patch, sentinel, call, Mock, ANY
+import yaml
 import pytest
 
 from sceptre.config import Config
@@ -137,6 +138,44 @@ class TestConfig(object):
             'dependencies': []
         }
 
+    def test_read_constructs_cached_file_for_each_config(self):
+        self.config.sceptre_dir = os.path.join(
+            os.getcwd(), "tests", "fixtures"
+        )
+        self.config.environment_path = os.path.join(
+            "account", "environment", "region"
+        )
+        self.config.name = "vpc"
+        self.config.read()
+        self.config["parameters"][0]["param1"] = "modified"
+
+        self.config.read()
+
+        assert self.config["parameters"] == [{'param1': 'val1'}]
+
+    def test_construct_does_not_modify_cached_node(self):
+        node = yaml.compose(
+            "base: &base\n  a: 1\nmerged:\n  <<: *base\n  b: 2\n",
+            Loader=yaml.SafeLoader
+        )
+        merged_node = node.value[1][1]
+        keys = [key.value for key, _ in merged_node.value]
+
+        assert self.config._construct(node) == {
+            "base": {"a": 1}, "merged": {"a": 1, "b": 2}
+        }
+        assert [key.value for key, _ in merged_node.value] == keys
+        assert self.config._construct(node)["merged"] == {"a": 1, "b": 2}
+
+    def test_get_directory_paths(self):
+        self.config.sceptre_dir = "sceptre_dir"
+
+        assert self.config._get_directory_paths("config/account/env") == [
+            "sceptre_dir/config",
+            "sceptre_dir/config/account",
+            "sceptre_dir/config/account/env"
+        ]
+
     def test_check_env_path_exists_with_valid_dir(self):
         with self._create_temp_dir() as temp_dir:
             self.config._check_env_path_exists(temp_dir)
@@ -152,12 +191,12 @@ class TestConfig(object):
         with pytest.raises(VersionIncompatibleError):
             self.config._check_version()
 
-    @patch("sceptre.config.get_subclasses")
+    @patch("sceptre.config.plugin_registry")
     @patch("sceptre.config.yaml.SafeLoader.add_constructor")
     def test_add_yaml_constructors(
-        self, mock_add_constructors, mock_get_subclasses
+        self, mock_add_constructors, mock_plugin_registry
     ):
-        mock_get_subclasses.return_value = {
+        mock_plugin_registry.get_classes.return_value = {
             "class_1": sentinel.class_1,
             "class_2": sentinel.class_2,
             "class_3": sentinel.class_3,
@@ -170,6 +209,46 @@ class TestConfig(object):
                  call(u'!class_2', "class"),
                  call(u'!class_3', "class")]
         mock_add_constructors.assert_has_calls(calls, any_order=True)
+        mock_plugin_registry.get_classes.assert_called_once_with(
+            base_type, directory
+        )
+
+    @patch("sceptre.config.plugin_registry")
+    def test_add_yaml_constructors_is_isolated_per_config(
+        self, mock_plugin_registry
+    ):
+        mock_plugin_registry.get_classes.return_value = {
+            "custom_tag": sentinel.class_1
+        }
+        with patch("sceptre.config.Config._check_env_path_exists"):
+            other_config = Config("sceptre_dir", "environment", "vpc")
+
+        self.config.add_yaml_constructors(
+            "directory/path", str, Mock(return_value=sentinel.constructor)
+        )
+
+        assert self.config.loader_class.yaml_constructors[u"!custom_tag"] \
+            == sentinel.constructor
+        assert u"!custom_tag" not in other_config.loader_class \
+            .yaml_constructors
+        assert u"!custom_tag" not in yaml.SafeLoader.yaml_constructors
+
+    @patch("sceptre.config.plugin_registry")
+    @patch("sceptre.config.yaml.SafeLoader.add_constructor")
+    def test_add_entry_point_constructors(
+        self, mock_add_constructors, mock_plugin_registry
+    ):
+        mock_plugin_registry.get_entry_point_classes.return_value = {
+            "class_1": sentinel.class_1
+        }
+        function = Mock(return_value="class")
+        self.config.add_entry_point_constructors(
+            "sceptre.resolvers", Resolver, function
+        )
+        mock_plugin_registry.get_entry_point_classes.assert_called_once_with(
+            Resolver, "sceptre.resolvers"
+        )
+        mock_add_constructors.assert_called_once_with(u'!class_1', "class")
 
     @patch("sceptre.config.os.path.dirname")
     @patch("sceptre.config.Config.add_yaml_constructors")
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+
+from mock import patch
+
+from sceptre.config_cache import ConfigFileCache
+
+
+class TestConfigFileCache(object):
+
+    def setup_method(self, test_method):
+        self.directory = tempfile.mkdtemp()
+        self.config_file_cache = ConfigFileCache()
+
+    def teardown_method(self, test_method):
+        shutil.rmtree(self.directory)
+
+    def write(self, content, file_name="config.yaml"):
+        with open(os.path.join(self.directory, file_name), "w") as f:
+            f.write(content)
+
+    def test_get_node_parses_file_once(self):
+        self.write("region: eu-west-1")
+
+        with patch("sceptre.config_cache.yaml.compose") as mock_compose:
+            for environment_path in ["dev", "prod"]:
+                self.config_file_cache.get_node(
+                    self.directory, "config.yaml", environment_path,
+                    {"key": "value"}
+                )
+
+        assert mock_compose.call_count == 1
+
+    def test_get_node_renders_each_environment_path_when_used(self):
+        self.write("name: {{ environment_path[0] }}")
+
+        nodes = [
+            self.config_file_cache.get_node(
+                self.directory, "config.yaml", environment_path
+            )
+            for environment_path in ["dev", "prod"]
+        ]
+
+        assert [node.value[0][1].value for node in nodes] == ["dev", "prod"]
+
+    def test_get_node_renders_each_user_variables_when_used(self):
+        self.write("name: {{ var.name }}")
+
+        nodes = [
+            self.config_file_cache.get_node(
+                self.directory, "config.yaml", "dev", {"name": name}
+            )
+            for name in ["a", "b"]
+        ]
+
+        assert [node.value[0][1].value for node in nodes] == ["a", "b"]
+
+    def test_get_node_with_empty_file(self):
+        self.write("# no config")
+
+        assert self.config_file_cache.get_node(
+            self.directory, "config.yaml", "dev"
+        ) is None
+
+    def test_get_node_keys_only_on_environment_variables_used(self):
+        self.write("home: {{ environment_variable.HOME }}")
+
+        with patch("sceptre.config_cache.yaml.compose") as mock_compose:
+            for token in ["a", "b"]:
+                with patch.dict(os.environ, {"HOME": "/h", "TOKEN": token}):
+                    self.config_file_cache.get_node(
+                        self.directory, "config.yaml", "dev"
+                    )
+
+        assert mock_compose.call_count == 1
+
+    def test_get_node_does_not_key_on_variable_values(self):
+        self.write("home: {{ environment_variable['HOME'] }}")
+
+        with patch.dict(os.environ, {"HOME": "hunter2xyz"}):
+            self.config_file_cache.get_node(
+                self.directory, "config.yaml", "dev"
+            )
+
+        key, = self.config_file_cache._nodes
+        assert "hunter2xyz" not in repr(key)
+
+    def test_get_node_keys_on_all_variables_when_read_dynamically(self):
+        self.write("name: {{ var.get('name') }}")
+
+        nodes = [
+            self.config_file_cache.get_node(
+                self.directory, "config.yaml", "dev", {"name": name}
+            )
+            for name in ["a", "b"]
+        ]
+
+        assert [node.value[0][1].value for node in nodes] == ["a", "b"]
+
+    def test_get_entries_omits_variable_dependent_nodes(self):
+        self.write("home: {{ environment_variable.HOME }}")
+        self.config_file_cache.get_node(self.directory, "config.yaml", "dev")
+
+        assert self.config_file_cache.get_entries()["nodes"] == {}
+
+    def test_get_node_keys_on_variables_of_included_files(self):
+        self.write("{% include 'name.j2' %}")
+        self.write("name: {{ var.name }}", "name.j2")
+
+        nodes = [
+            self.config_file_cache.get_node(
+                self.directory, "config.yaml", "dev", {"name": name}
+            )
+            for name in ["a", "b"]
+        ]
+
+        assert [node.value[0][1].value for node in nodes] == ["a", "b"]
+        assert self.config_file_cache.get_entries()["nodes"] == {}
+
+    def test_get_node_renders_again_when_included_file_changes(self):
+        self.write("{% include 'name.j2' %}")
+        self.write("name: a", "name.j2")
+        self.config_file_cache.get_node(self.directory, "config.yaml", "dev")
+        self.write("name: bb", "name.j2")
+
+        node = self.config_file_cache.get_node(
+            self.directory, "config.yaml", "dev"
+        )
+
+        assert node.value[0][1].value == "bb"
+
+    def test_get_node_does_not_cache_dynamic_includes(self):
+        self.write("{% include var.file %}")
+        self.write("name: a", "name.j2")
+
+        node = self.config_file_cache.get_node(
+            self.directory, "config.yaml", "dev", {"file": "name.j2"}
+        )
+
+        assert node.value[0][1].value == "a"
+        assert self.config_file_cache._nodes == {}
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+
+from mock import patch
+
+from sceptre.config_index import ConfigIndex
+
+
+class TestConfigIndex(object):
+
+    def setup_method(self, test_method):
+        self.sceptre_dir = os.path.join(os.getcwd(), "tests", "fixtures")
+        self.config_index = ConfigIndex(self.sceptre_dir, "account")
+
+    def test_get_environment_paths(self):
+        assert self.config_index.get_environment_paths("account") == [
+            "account/environment"
+        ]
+
+    def test_get_stack_names(self):
+        stack_names = self.config_index.get_stack_names(
+            "account/environment/region"
+        )
+        assert stack_names == [
+            "account/environment/region/security_groups",
+            "account/environment/region/subnets",
+            "account/environment/region/vpc"
+        ]
+
+    def test_is_leaf(self):
+        assert self.config_index.is_leaf("account/environment/region")
+        assert not self.config_index.is_leaf("account/environment")
+
+    def test_unknown_environment_is_an_empty_leaf(self):
+        assert self.config_index.is_leaf("account/missing")
+        assert self.config_index.get_stack_names("account/missing") == []
+
+    @patch("sceptre.config_index.os.walk", wraps=os.walk)
+    def test_tree_is_walked_once(self, mock_walk):
+        self.config_index.get_stack_names("account/environment/region")
+        self.config_index.is_leaf("account/environment")
+        self.config_index.get_environment_paths("account")
+
+        mock_walk.assert_called_once_with(
+            os.path.join(self.sceptre_dir, "config", "account"),
+            followlinks=True
+        )
+
+    def test_symlinked_environments_are_followed(self):
+        sceptre_dir = tempfile.mkdtemp()
+        shared = tempfile.mkdtemp()
+        try:
+            environment = os.path.join(sceptre_dir, "config", "prod")
+            os.makedirs(environment)
+            open(os.path.join(shared, "vpc.yaml"), "w").close()
+            os.symlink(shared, os.path.join(environment, "net"))
+            os.symlink(environment, os.path.join(environment, "loop"))
+
+            config_index = ConfigIndex(sceptre_dir, "prod")
+
+            assert config_index.get_stack_names("prod/net") == [
+                "prod/net/vpc"
+            ]
+            assert config_index.get_environment_paths("prod") == [
+                "prod/net"
+            ]
+        finally:
+            shutil.rmtree(sceptre_dir)
+            shutil.rmtree(shared)
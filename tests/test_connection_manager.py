@@ -1,9 +1,11 @@
 # -*- coding: utf-8 -*-
 import pytest
-from mock import Mock, patch, sentinel, MagicMock
+from mock import ANY, Mock, patch, sentinel, MagicMock
 from moto import mock_s3
 
 from sceptre.connection_manager import ConnectionManager, _retry_boto_call
+from sceptre.describe_cache import DescribeCache
+from sceptre.exceptions import RetryBudgetExhaustedError
 from sceptre.exceptions import RetryLimitExceededError
 from boto3.session import Session
 import botocore
@@ -135,6 +137,75 @@ class TestConnectionManager(object):
         return_value = self.connection_manager.call(service, command, {})
         assert return_value['ResponseMetadata']['HTTPStatusCode'] == 200
 
+    def _get_cached_connection_manager(self, status="CREATE_COMPLETE"):
+        self.connection_manager.describe_cache = DescribeCache()
+        mock_client = Mock()
+        mock_client.describe_stacks.return_value = {
+            "Stacks": [{"StackName": "prj-vpc", "StackStatus": status}]
+        }
+        self.connection_manager.clients["cloudformation"] = mock_client
+        return mock_client
+
+    def test_call_caches_describe_stacks_of_settled_stack(self):
+        mock_client = self._get_cached_connection_manager()
+
+        for _ in range(3):
+            response = self.connection_manager.call(
+                "cloudformation", "describe_stacks", {"StackName": "prj-vpc"}
+            )
+
+        assert response["Stacks"][0]["StackStatus"] == "CREATE_COMPLETE"
+        mock_client.describe_stacks.assert_called_once_with(
+            StackName="prj-vpc"
+        )
+
+    def test_call_does_not_cache_describe_stacks_of_stack_in_progress(self):
+        mock_client = self._get_cached_connection_manager(
+            "UPDATE_IN_PROGRESS"
+        )
+
+        for _ in range(2):
+            self.connection_manager.call(
+                "cloudformation", "describe_stacks", {"StackName": "prj-vpc"}
+            )
+
+        assert mock_client.describe_stacks.call_count == 2
+
+    def test_call_with_mutating_command_invalidates_describe_cache(self):
+        mock_client = self._get_cached_connection_manager()
+        kwargs = {"StackName": "prj-vpc"}
+
+        self.connection_manager.call(
+            "cloudformation", "describe_stacks", kwargs
+        )
+        self.connection_manager.call("cloudformation", "update_stack", kwargs)
+        self.connection_manager.call(
+            "cloudformation", "describe_stacks", kwargs
+        )
+
+        mock_client.update_stack.assert_called_once_with(StackName="prj-vpc")
+        assert mock_client.describe_stacks.call_count == 2
+
+    @patch("sceptre.connection_manager.ConnectionManager.call")
+    def test_paginate_follows_next_token(self, mock_call):
+        mock_call.side_effect = [
+            {"Stacks": [sentinel.stack_1], "NextToken": "token"},
+            {"Stacks": [sentinel.stack_2]}
+        ]
+
+        pages = list(self.connection_manager.paginate(
+            "cloudformation", "describe_stacks", {"StackName": "name"}
+        ))
+
+        assert pages == [
+            {"Stacks": [sentinel.stack_1], "NextToken": "token"},
+            {"Stacks": [sentinel.stack_2]}
+        ]
+        assert mock_call.call_args_list[1][0] == (
+            "cloudformation", "describe_stacks",
+            {"StackName": "name", "NextToken": "token"}
+        )
+
 
 class TestRetry():
 
@@ -146,10 +217,12 @@ class TestRetry():
 
         assert response == sentinel.response
 
+    @patch("sceptre.retry.random.uniform")
     @patch("sceptre.connection_manager.time.sleep")
     def test_retry_boto_call_pauses_when_request_limit_hit(
-            self, mock_sleep
+            self, mock_sleep, mock_uniform
     ):
+        mock_uniform.return_value = 0.5
         mock_func = Mock()
         mock_func.side_effect = [
             ClientError(
@@ -167,7 +240,59 @@ class TestRetry():
         mock_func.__name__ = "mock_func"
 
         _retry_boto_call(mock_func)()
-        mock_sleep.assert_called_once_with(1)
+        mock_uniform.assert_called_once_with(0, 1)
+        mock_sleep.assert_called_once_with(0.5)
+
+    @patch("sceptre.connection_manager.time.sleep")
+    def test_retry_boto_call_uses_connection_managers_retry_policy(
+            self, mock_sleep
+    ):
+        mock_policy = Mock()
+        mock_policy.is_retryable.return_value = True
+        mock_policy.can_retry.return_value = True
+        mock_policy.get_delay.return_value = 0.5
+        mock_func = Mock()
+        mock_func.side_effect = [
+            ClientError(
+                {"Error": {"Code": "SlowDown", "Message": "Slow down"}},
+                sentinel.operation
+            ),
+            sentinel.response
+        ]
+        mock_func.__name__ = "mock_func"
+        connection_manager = ConnectionManager(
+            region="eu-west-1", retry_policy=mock_policy
+        )
+
+        response = _retry_boto_call(mock_func)(connection_manager, "s3")
+
+        assert response == sentinel.response
+        mock_policy.is_retryable.assert_called_once_with("s3", ANY)
+        mock_policy.can_retry.assert_called_once_with(1)
+        mock_policy.metrics.record_retry.assert_called_once_with(
+            "s3", "SlowDown", 0.5
+        )
+        mock_sleep.assert_called_once_with(0.5)
+        mock_policy.record_success.assert_called_once_with()
+
+    def test_retry_boto_call_raises_when_retry_budget_is_exhausted(self):
+        mock_policy = Mock()
+        mock_policy.max_attempts = 30
+        mock_policy.is_retryable.return_value = True
+        mock_policy.can_retry.return_value = False
+        mock_func = Mock()
+        mock_func.side_effect = ClientError(
+            {"Error": {"Code": "Throttling", "Message": "Rate exceeded"}},
+            sentinel.operation
+        )
+        mock_func.__name__ = "mock_func"
+        connection_manager = ConnectionManager(
+            region="eu-west-1", retry_policy=mock_policy
+        )
+
+        with pytest.raises(RetryBudgetExhaustedError) as e:
+            _retry_boto_call(mock_func)(connection_manager, "s3")
+        assert "budget" in str(e.value)
 
     def test_retry_boto_call_raises_non_throttling_error(self):
         mock_func = Mock()
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+
+import threading
+
+import pytest
+from mock import Mock
+
+from sceptre.describe_cache import DescribeCache
+
+
+class TestDescribeCache(object):
+
+    def setup_method(self, test_method):
+        self.describe_cache = DescribeCache()
+        self.key = ("eu-west-1", None, "prj-vpc")
+
+    def _get_response(self, status):
+        return {"Stacks": [{"StackName": "prj-vpc", "StackStatus": status}]}
+
+    def test_get_with_missing_key(self):
+        assert self.describe_cache.get(self.key) is None
+
+    def test_set_caches_settled_stack(self):
+        response = self._get_response("UPDATE_ROLLBACK_COMPLETE")
+        self.describe_cache.set(self.key, response)
+
+        assert self.describe_cache.get(self.key) == response
+
+    def test_set_ignores_stack_in_progress(self):
+        self.describe_cache.set(
+            self.key, self._get_response("UPDATE_COMPLETE_CLEANUP_IN_PROGRESS")
+        )
+
+        assert self.describe_cache.get(self.key) is None
+
+    def test_invalidate(self):
+        self.describe_cache.set(
+            self.key, self._get_response("CREATE_COMPLETE")
+        )
+        self.describe_cache.invalidate(self.key)
+        self.describe_cache.invalidate(self.key)
+
+        assert self.describe_cache.get(self.key) is None
+
+    def test_invalidate_removes_stack_under_every_iam_role(self):
+        role_key = ("eu-west-1", "arn:aws:iam::1:role/r", "prj-vpc")
+        other_key = ("eu-west-1", None, "prj-subnets")
+        for key in [self.key, role_key, other_key]:
+            self.describe_cache.set(
+                key, self._get_response("CREATE_COMPLETE")
+            )
+
+        self.describe_cache.invalidate(self.key)
+
+        assert self.describe_cache.get(role_key) is None
+        assert self.describe_cache.get(other_key) is not None
+
+    def test_set_drops_responses_requested_before_invalidation(self):
+        version = self.describe_cache.version
+        self.describe_cache.invalidate(self.key)
+
+        self.describe_cache.set(
+            self.key, self._get_response("CREATE_COMPLETE"), version
+        )
+
+        assert self.describe_cache.get(self.key) is None
+
+    def test_set_keeps_responses_requested_after_invalidation(self):
+        self.describe_cache.invalidate(self.key)
+        version = self.describe_cache.version
+
+        self.describe_cache.set(
+            self.key, self._get_response("CREATE_COMPLETE"), version
+        )
+
+        assert self.describe_cache.get(self.key) is not None
+
+    def test_clear(self):
+        self.describe_cache.set(
+            self.key, self._get_response("CREATE_COMPLETE")
+        )
+        self.describe_cache.clear()
+
+        assert self.describe_cache.get(self.key) is None
+
+    def test_get_or_load_loads_and_caches(self):
+        response = self._get_response("CREATE_COMPLETE")
+        load = Mock(return_value=response)
+
+        assert self.describe_cache.get_or_load(self.key, load) == response
+        assert self.describe_cache.get_or_load(self.key, load) == response
+        load.assert_called_once_with()
+
+    def test_get_or_load_shares_concurrent_loads(self):
+        release = threading.Event()
+        response = self._get_response("CREATE_COMPLETE")
+        calls = []
+
+        def load():
+            calls.append(1)
+            release.wait(5)
+            return response
+
+        responses = []
+        threads = [
+            threading.Thread(target=lambda: responses.append(
+                self.describe_cache.get_or_load(self.key, load)
+            ))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        while not calls:
+            threading.Event().wait(0.01)
+        threading.Event().wait(0.05)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert responses == [response] * 5
+
+    def test_get_or_load_does_not_cache_after_invalidation_in_flight(self):
+        response = self._get_response("CREATE_COMPLETE")
+
+        def load():
+            self.describe_cache.invalidate(self.key)
+            return response
+
+        assert self.describe_cache.get_or_load(self.key, load) == response
+        assert self.describe_cache.get(self.key) is None
+
+    def test_get_or_load_raises_load_errors(self):
+        load = Mock(side_effect=ValueError)
+
+        with pytest.raises(ValueError):
+            self.describe_cache.get_or_load(self.key, load)
+        with pytest.raises(ValueError):
+            self.describe_cache.get_or_load(self.key, load)
+        assert load.call_count == 2
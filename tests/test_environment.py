@@ -1,14 +1,16 @@
 # -*- coding: utf-8 -*-
 
+import datetime
 import os
 import pytest
-from mock import patch, sentinel, Mock, PropertyMock
+from mock import patch, sentinel, Mock
 
 from botocore.exceptions import ClientError
 
 from sceptre.exceptions import CircularDependenciesError
-from sceptre.exceptions import StackDoesNotExistError
+from sceptre.exceptions import DependencyStackNotFoundError
 from sceptre.exceptions import InvalidEnvironmentPathError
+from sceptre.exceptions import RenderedTemplateError
 
 from sceptre.environment import Environment
 from sceptre.stack_status import StackStatus
@@ -16,17 +18,8 @@ from sceptre.stack_status import StackStatus
 
 class TestEnvironment(object):
 
-    @patch("sceptre.environment.Environment._load_stacks")
-    @patch(
-        "sceptre.environment.Environment.is_leaf", new_callable=PropertyMock
-    )
     @patch("sceptre.environment.Environment._validate_path")
-    def setup_method(
-            self, test_method, mock_validate_path,
-            mock_is_leaf, mock_load_stacks
-    ):
-        mock_is_leaf.return_value = True
-        mock_load_stacks.return_value = sentinel.stacks
+    def setup_method(self, test_method, mock_validate_path):
         mock_validate_path.return_value = "environment_path"
 
         self.environment = Environment(
@@ -38,32 +31,41 @@ class TestEnvironment(object):
         # Run the rest of the tests against a leaf environment
         self.environment._is_leaf = True
 
-    def test_initialise_environment(self):
+    @patch("sceptre.environment.Environment._load_stacks")
+    def test_initialise_environment(self, mock_load_stacks):
+        mock_load_stacks.return_value = sentinel.stacks
+
         assert self.environment.sceptre_dir == "sceptre_dir"
         assert self.environment.path == "environment_path"
         assert self.environment._options == sentinel.options
         assert self.environment.is_leaf is True
+
+        # Stacks are only loaded on first access
+        assert mock_load_stacks.call_count == 0
         assert self.environment.stacks == sentinel.stacks
+        assert self.environment.stacks == sentinel.stacks
+        mock_load_stacks.assert_called_once_with()
 
     @patch("sceptre.environment.Environment._load_environments")
-    @patch(
-        "sceptre.environment.Environment.is_leaf", new_callable=PropertyMock
-    )
-    @patch("sceptre.environment.Environment._validate_path")
     def test_initialise_environment_with_non_leaf_directory(
-            self, mock_validate_path,
-            mock_is_leaf, mock_load_environments
+            self, mock_load_environments
     ):
-        mock_is_leaf.return_value = False
         mock_load_environments.return_value = sentinel.environments
+        self.environment._is_leaf = False
 
-        environment = Environment(
-            sceptre_dir="sceptre_dir",
-            environment_path="environment_path",
-            options=sentinel.options
-        )
+        assert mock_load_environments.call_count == 0
+        assert self.environment.environments == sentinel.environments
+        mock_load_environments.assert_called_once_with()
 
-        assert environment.environments == sentinel.environments
+    @patch("sceptre.environment.ConfigIndex")
+    def test_config_index_is_created_on_first_access(self, mock_ConfigIndex):
+        mock_ConfigIndex.return_value = sentinel.config_index
+
+        assert self.environment.config_index == sentinel.config_index
+        assert self.environment.config_index == sentinel.config_index
+        mock_ConfigIndex.assert_called_once_with(
+            "sceptre_dir", "environment_path"
+        )
 
     def test_repr(self):
         self.environment.path = "path"
@@ -132,72 +134,173 @@ class TestEnvironment(object):
         assert self.environment.is_leaf is False
 
     @patch("sceptre.environment.Environment._build")
-    @patch("sceptre.environment.Environment._check_for_circular_dependencies")
+    @patch("sceptre.environment.Environment._check_dependencies")
     @patch("sceptre.environment.Environment._get_launch_dependencies")
     @patch("sceptre.environment.Environment._get_initial_statuses")
-    @patch("sceptre.environment.Environment._get_threading_events")
     def test_launch_calls_build_with_correct_args(
-            self, mock_get_threading_events, mock_get_initial_statuses,
-            mock_get_launch_dependencies, mock_check_for_circular_dependencies,
+            self, mock_get_initial_statuses,
+            mock_get_launch_dependencies, mock_check_dependencies,
             mock_build
     ):
-        mock_get_threading_events.return_value = sentinel.threading_events
         mock_get_initial_statuses.return_value = sentinel.stack_statuses
         mock_get_launch_dependencies.return_value = \
             sentinel.dependencies
 
-        self.environment.launch()
+        self.environment.launch(
+            max_concurrency=sentinel.max_concurrency,
+            on_failure=sentinel.on_failure
+        )
 
-        mock_check_for_circular_dependencies.assert_called_once_with(
+        mock_check_dependencies.assert_called_once_with(
             sentinel.dependencies
         )
         mock_build.assert_called_once_with(
-            "launch", sentinel.threading_events,
-            sentinel.stack_statuses, sentinel.dependencies
+            "launch", sentinel.stack_statuses, sentinel.dependencies,
+            sentinel.max_concurrency, False, False, sentinel.on_failure
         )
 
     @patch("sceptre.environment.Environment._build")
-    @patch("sceptre.environment.Environment._check_for_circular_dependencies")
+    @patch("sceptre.environment.Environment._check_dependencies")
+    @patch("sceptre.environment.Environment._get_launch_dependencies")
+    @patch("sceptre.environment.Environment._get_initial_statuses")
+    @patch("sceptre.environment.Environment._use_rendered_templates")
+    def test_launch_with_rendered_dir(
+            self, mock_use_rendered_templates, mock_get_initial_statuses,
+            mock_get_launch_dependencies, mock_check_dependencies,
+            mock_build
+    ):
+        self.environment.launch(rendered_dir=sentinel.rendered_dir)
+
+        mock_use_rendered_templates.assert_called_once_with(
+            sentinel.rendered_dir
+        )
+
+    def test_get_launch_dependencies_filters_other_environments(self):
+        self.environment.stacks = {
+            "vpc": Mock(dependencies=["dev/sg", "dev2/vpc", "prod/vpc"])
+        }
+        self.environment.stacks["vpc"].name = "dev/vpc"
+
+        assert self.environment._get_launch_dependencies("dev") == {
+            "dev/vpc": ["dev/sg"]
+        }
+
+    @patch("sceptre.environment.Environment._start_render_pools")
+    @patch("sceptre.environment.write_rendered_templates")
+    @patch("sceptre.environment.Environment._get_stacks")
+    def test_generate_renders_every_stack(
+            self, mock_get_stacks, mock_write_rendered_templates,
+            mock_start_render_pools
+    ):
+        mock_get_stacks.return_value = {
+            "dev/vpc": Mock(template=Mock(body="vpc")),
+            "dev/subnets": Mock(template=Mock(body="subnets"))
+        }
+        mock_write_rendered_templates.return_value = sentinel.manifest
+
+        response = self.environment.generate(sentinel.out_dir)
+
+        mock_write_rendered_templates.assert_called_once_with(
+            sentinel.out_dir, "environment_path",
+            {"dev/vpc": "vpc", "dev/subnets": "subnets"}
+        )
+        assert response == sentinel.manifest
+
+    @patch("sceptre.environment.get_render_pool")
+    def test_start_render_pools(self, mock_get_render_pool):
+        stacks = [
+            Mock(environment_config={"render_processes": 2}),
+            Mock(environment_config={"render_processes": 2}),
+            Mock(environment_config={})
+        ]
+
+        self.environment._start_render_pools(stacks)
+
+        mock_get_render_pool.assert_called_once_with(2)
+        mock_get_render_pool.return_value.start.assert_called_once_with()
+
+    @patch("sceptre.environment.read_rendered_templates")
+    @patch("sceptre.environment.Environment._get_stacks")
+    def test_use_rendered_templates(
+            self, mock_get_stacks, mock_read_rendered_templates
+    ):
+        mock_stack = Mock()
+        mock_get_stacks.return_value = {"dev/vpc": mock_stack}
+        mock_read_rendered_templates.return_value = {"dev/vpc": "body"}
+
+        self.environment._use_rendered_templates(sentinel.rendered_dir)
+
+        mock_stack.use_rendered_template.assert_called_once_with("body")
+
+    @patch("sceptre.environment.read_rendered_templates")
+    @patch("sceptre.environment.Environment._get_stacks")
+    def test_use_rendered_templates_with_missing_stack(
+            self, mock_get_stacks, mock_read_rendered_templates
+    ):
+        mock_get_stacks.return_value = {"dev/vpc": Mock()}
+        mock_read_rendered_templates.return_value = {}
+
+        with pytest.raises(RenderedTemplateError):
+            self.environment._use_rendered_templates("rendered")
+
+    @patch("sceptre.environment.Environment._build")
+    @patch("sceptre.environment.Environment._check_dependencies")
     @patch("sceptre.environment.Environment._get_delete_dependencies")
     @patch("sceptre.environment.Environment._get_initial_statuses")
-    @patch("sceptre.environment.Environment._get_threading_events")
     def test_delete_calls_build_with_correct_args(
-            self, mock_get_threading_events, mock_get_initial_statuses,
-            mock_get_delete_dependencies, mock_check_for_circular_dependencies,
+            self, mock_get_initial_statuses,
+            mock_get_delete_dependencies, mock_check_dependencies,
             mock_build
     ):
-        mock_get_threading_events.return_value = sentinel.threading_events
         mock_get_initial_statuses.return_value = sentinel.stack_statuses
         mock_get_delete_dependencies.return_value = \
             sentinel.dependencies
 
-        self.environment.delete()
+        self.environment.delete(
+            max_concurrency=sentinel.max_concurrency,
+            on_failure=sentinel.on_failure
+        )
 
-        mock_check_for_circular_dependencies.assert_called_once_with(
+        mock_check_dependencies.assert_called_once_with(
             sentinel.dependencies
         )
         mock_build.assert_called_once_with(
-            "delete", sentinel.threading_events,
-            sentinel.stack_statuses, sentinel.dependencies
+            "delete", sentinel.stack_statuses, sentinel.dependencies,
+            sentinel.max_concurrency, False, on_failure=sentinel.on_failure
         )
 
-    def test_describe_with_running_stack(self):
+    def _get_described_stack(self, name, external_name, region="eu-west-1"):
         mock_stack = Mock()
-        mock_stack.name = "stack"
-        mock_stack.get_status.return_value = "status"
-        self.environment.stacks = {"name": mock_stack}
+        mock_stack.name = name
+        mock_stack.external_name = external_name
+        mock_stack.connection_manager.region = region
+        mock_stack.connection_manager.iam_role = None
+        return mock_stack
+
+    def test_describe_with_running_and_missing_stacks(self):
+        mock_vpc = self._get_described_stack("dev/vpc", "prj-dev-vpc")
+        mock_app = self._get_described_stack("dev/app", "prj-dev-app")
+        mock_vpc.connection_manager = mock_app.connection_manager
+        mock_vpc.connection_manager.paginate.return_value = [
+            {"Stacks": [
+                {"StackName": "prj-dev-vpc", "StackStatus": "CREATE_COMPLETE"}
+            ]},
+            {"Stacks": [
+                {"StackName": "other", "StackStatus": "UPDATE_COMPLETE"}
+            ]}
+        ]
+        self.environment.stacks = {"vpc": mock_vpc, "app": mock_app}
 
         response = self.environment.describe()
-        assert response == {"stack": "status"}
-
-    def test_describe_with_missing_stack(self):
-        mock_stack = Mock()
-        mock_stack.name = "stack"
-        mock_stack.get_status.side_effect = StackDoesNotExistError
-        self.environment.stacks = {"stack": mock_stack}
 
-        response = self.environment.describe()
-        assert response == {"stack": "PENDING"}
+        assert response == {
+            "dev/vpc": "CREATE_COMPLETE",
+            "dev/app": "PENDING"
+        }
+        mock_vpc.connection_manager.paginate.assert_called_once_with(
+            service="cloudformation", command="describe_stacks"
+        )
+        assert mock_vpc.get_status.call_count == 0
 
     def test_describe_resources_forms_response(self):
         mock_stack = Mock()
@@ -254,98 +357,279 @@ class TestEnvironment(object):
         with pytest.raises(ClientError):
             self.environment.describe_resources()
 
-    @patch("sceptre.environment.wait")
-    @patch("sceptre.environment.ThreadPoolExecutor")
-    def test_build(self, mock_ThreadPoolExecutor, mock_wait):
-        self.environment.stacks = {"mock_stack": sentinel.stack}
-        mock_ThreadPoolExecutor.return_value.__enter__.return_value\
-            .submit.return_value = sentinel.future
+    @patch("sceptre.environment.StackDurations")
+    @patch("sceptre.environment.StackScheduler")
+    @patch("sceptre.environment.Environment._get_stacks")
+    @patch("sceptre.environment.Environment._check_dependencies")
+    @patch("sceptre.environment.Environment._get_delete_dependencies")
+    def test_plan_delete(
+            self, mock_get_delete_dependencies, mock_check_dependencies,
+            mock_get_stacks, mock_StackScheduler, mock_StackDurations
+    ):
+        mock_get_stacks.return_value = sentinel.stacks
+        mock_get_delete_dependencies.return_value = sentinel.dependencies
+        mock_StackDurations.return_value.get_durations.return_value = \
+            sentinel.durations
+        mock_StackScheduler.return_value.plan.return_value = {
+            "waves": [["dev/app"], ["dev/vpc"]]
+        }
+
+        response = self.environment.plan("delete", sentinel.max_concurrency)
 
-        self.environment._build(
-            sentinel.command, sentinel.threading_events,
-            sentinel.stack_statuses, sentinel.dependencies
+        mock_check_dependencies.assert_called_once_with(sentinel.dependencies)
+        mock_StackDurations.return_value.get_durations.assert_called_once_with(
+            "delete"
+        )
+        mock_StackScheduler.assert_called_once_with(
+            stacks=sentinel.stacks,
+            dependencies=sentinel.dependencies,
+            max_concurrency=sentinel.max_concurrency,
+            durations=sentinel.durations
+        )
+        assert response == {
+            "environment": "environment_path",
+            "command": "delete",
+            "waves": [["dev/app"], ["dev/vpc"]]
+        }
+
+    @patch("sceptre.environment.Environment._start_render_pools")
+    @patch("sceptre.environment.StatusPoller")
+    @patch("sceptre.environment.StackDurations")
+    @patch("sceptre.environment.StackScheduler")
+    @patch("sceptre.environment.Environment._get_stacks")
+    def test_build(
+            self, mock_get_stacks, mock_StackScheduler, mock_StackDurations,
+            mock_StatusPoller, mock_start_render_pools
+    ):
+        mock_stack = Mock()
+        mock_get_stacks.return_value = {"dev/vpc": mock_stack}
+        status_pollers = []
+        mock_durations = mock_StackDurations.return_value
+        mock_durations.get_durations.return_value = sentinel.durations
+        mock_scheduler = mock_StackScheduler.return_value
+        mock_scheduler.observed_durations = {"dev/vpc": 1.0}
+        mock_scheduler.run.side_effect = lambda *args: status_pollers.append(
+            mock_stack.status_poller
         )
 
-        mock_wait.assert_called_once_with([sentinel.future])
+        self.environment._build(
+            sentinel.command, sentinel.stack_statuses,
+            sentinel.dependencies, sentinel.max_concurrency,
+            on_failure=sentinel.on_failure
+        )
 
-    def test_manage_stack_build_with_failed_dependency(self):
-        threading_events = {"stack_1": Mock(), "stack_2": Mock()}
-        stack_statuses = {
-            "stack_1": StackStatus.FAILED,
-            "stack_2": StackStatus.PENDING
+        assert list(mock_start_render_pools.call_args[0][0]) == [mock_stack]
+        mock_StackDurations.assert_called_once_with("sceptre_dir")
+        mock_durations.get_durations.assert_called_once_with(
+            sentinel.command
+        )
+        mock_StackScheduler.assert_called_once_with(
+            stacks={"dev/vpc": mock_stack},
+            dependencies=sentinel.dependencies,
+            max_concurrency=sentinel.max_concurrency,
+            durations=sentinel.durations,
+            on_failure=sentinel.on_failure
+        )
+        assert status_pollers == [mock_StatusPoller.return_value]
+        assert mock_stack.status_poller is None
+        mock_scheduler.run.assert_called_once_with(
+            sentinel.command, sentinel.stack_statuses
+        )
+        mock_durations.record.assert_called_once_with(
+            sentinel.command, {"dev/vpc": 1.0}
+        )
+        mock_durations.save.assert_called_once_with()
+        assert mock_scheduler.explain.call_count == 0
+
+    @patch("sceptre.environment.Environment._start_render_pools")
+    @patch("sceptre.environment.get_stack_statuses")
+    @patch("sceptre.environment.StackDurations")
+    @patch("sceptre.environment.StackScheduler")
+    @patch("sceptre.environment.Environment._get_stacks")
+    def test_build_prefetches_descriptions_of_large_environments(
+            self, mock_get_stacks, mock_StackScheduler, mock_StackDurations,
+            mock_get_stack_statuses, mock_start_render_pools
+    ):
+        stacks = {
+            "dev/stack-{0}".format(index): Mock() for index in range(10)
         }
-        dependencies = {"stack_1": [], "stack_2": ["stack_1"]}
+        mock_get_stacks.return_value = stacks
+        mock_StackScheduler.return_value.observed_durations = {}
 
-        mock_stack_2 = Mock()
-        mock_stack_2.name = "stack_2"
+        self.environment._build(
+            "launch", sentinel.stack_statuses, sentinel.dependencies
+        )
+
+        assert mock_get_stack_statuses.call_count == 1
+        assert list(mock_get_stack_statuses.call_args[0][0]) == \
+            list(stacks.values())
+
+    @patch("sceptre.environment.StackDurations")
+    @patch("sceptre.environment.StackScheduler")
+    @patch("sceptre.environment.Environment._get_stacks")
+    def test_build_with_explain_schedule(
+            self, mock_get_stacks, mock_StackScheduler, mock_StackDurations
+    ):
+        mock_scheduler = mock_StackScheduler.return_value
+        mock_scheduler.explain.return_value = [{
+            "rank": 1, "stack": "dev/vpc", "priority": 2, "duration": None
+        }]
 
-        self.environment._manage_stack_build(
-            mock_stack_2,
-            sentinel.command,
-            threading_events,
-            stack_statuses,
-            dependencies
+        self.environment._build(
+            sentinel.command, sentinel.stack_statuses,
+            sentinel.dependencies, explain_schedule=True
         )
 
-        assert stack_statuses["stack_2"] == StackStatus.FAILED
-        # Check that that stack's event is set
-        threading_events["stack_2"].set.assert_called_once_with()
+        mock_scheduler.explain.assert_called_once_with()
 
-    def test_manage_stack_build_with_sucessful_command(self):
-        threading_events = {"stack": Mock()}
-        stack_statuses = {"stack": StackStatus.PENDING}
-        dependencies = {"stack": []}
+    @patch("sceptre.environment.StackFingerprints")
+    @patch("sceptre.environment.StackDurations")
+    @patch("sceptre.environment.StackScheduler")
+    @patch("sceptre.environment.Environment._get_stacks")
+    def test_build_with_incremental(
+            self, mock_get_stacks, mock_StackScheduler, mock_StackDurations,
+            mock_StackFingerprints
+    ):
+        mock_scheduler = mock_StackScheduler.return_value
+        mock_scheduler.observed_durations = {}
 
+        self.environment._build(
+            "launch", sentinel.stack_statuses,
+            sentinel.dependencies, incremental=True
+        )
+
+        command = mock_scheduler.run.call_args[0][0]
+        assert command.func == self.environment._launch_if_changed
+        assert command.keywords["fingerprints"] == \
+            mock_StackFingerprints.return_value
+        mock_StackFingerprints.return_value.save.assert_called_once_with()
+
+    @patch("sceptre.environment.StackFingerprints")
+    @patch("sceptre.environment.StackDurations")
+    @patch("sceptre.environment.StackScheduler")
+    @patch("sceptre.environment.Environment._get_stacks")
+    def test_build_with_incremental_saves_fingerprints_on_error(
+            self, mock_get_stacks, mock_StackScheduler, mock_StackDurations,
+            mock_StackFingerprints
+    ):
+        mock_StackScheduler.return_value.run.side_effect = ValueError
+
+        with pytest.raises(ValueError):
+            self.environment._build(
+                "launch", sentinel.stack_statuses,
+                sentinel.dependencies, incremental=True
+            )
+
+        mock_StackFingerprints.return_value.save.assert_called_once_with()
+
+    def _get_incremental_stack(self, status="UPDATE_COMPLETE"):
         mock_stack = Mock()
-        mock_stack.name = "stack"
+        mock_stack.name = "dev/app"
+        mock_stack.dependencies = {"dev/vpc"}
+        mock_stack.get_fingerprint.return_value = "new"
+        mock_stack.describe.return_value = {"Stacks": [{
+            "StackId": "arn:app",
+            "StackStatus": status,
+            "LastUpdatedTime": datetime.datetime(2017, 1, 1)
+        }]}
         mock_stack.launch.return_value = StackStatus.COMPLETE
+        return mock_stack
+
+    def _get_fingerprints(self, fingerprint="new", stack_id="arn:app"):
+        mock_fingerprints = Mock()
+        mock_fingerprints.get.side_effect = {"dev/app": {
+            "fingerprint": fingerprint,
+            "deployment": [stack_id, "2017-01-01T00:00:00"]
+        }}.get
+        return mock_fingerprints
+
+    def test_launch_if_changed_skips_unchanged_stack(self):
+        mock_stack = self._get_incremental_stack()
+        fingerprints = self._get_fingerprints()
+        computed_fingerprints = {"dev/vpc": "vpc"}
+        skipped = set()
+
+        status = self.environment._launch_if_changed(
+            mock_stack, fingerprints, computed_fingerprints, skipped
+        )
+
+        assert status == StackStatus.COMPLETE
+        assert skipped == {"dev/app"}
+        assert mock_stack.launch.call_count == 0
+        mock_stack.get_fingerprint.assert_called_once_with({"dev/vpc": "vpc"})
+        assert computed_fingerprints["dev/app"] == "new"
 
-        self.environment._manage_stack_build(
-            mock_stack,
-            "launch",
-            threading_events,
-            stack_statuses,
-            dependencies
+    def test_launch_if_changed_launches_changed_stack(self):
+        mock_stack = self._get_incremental_stack()
+        mock_fingerprints = self._get_fingerprints("old")
+        skipped = set()
+
+        status = self.environment._launch_if_changed(
+            mock_stack, mock_fingerprints, {}, skipped
         )
 
-        assert stack_statuses["stack"] == StackStatus.COMPLETE
-        # Check that that stack's event is set
-        threading_events["stack"].set.assert_called_once_with()
+        assert status == StackStatus.COMPLETE
+        assert skipped == set()
+        mock_stack.launch.assert_called_once_with()
+        mock_fingerprints.set.assert_called_once_with("dev/app", {
+            "fingerprint": "new",
+            "deployment": ["arn:app", "2017-01-01T00:00:00"]
+        })
 
-    def test_manage_stack_build_with_unsucessful_command(self):
-        threading_events = {"stack": Mock()}
-        stack_statuses = {"stack": StackStatus.PENDING}
-        dependencies = {"stack": []}
+    def test_launch_if_changed_launches_stack_deployed_elsewhere(self):
+        mock_stack = self._get_incremental_stack()
 
-        mock_stack = Mock()
-        mock_stack.name = "stack"
-        mock_stack.launch.side_effect = Exception()
+        self.environment._launch_if_changed(
+            mock_stack, self._get_fingerprints(stack_id="arn:other"), {},
+            set()
+        )
+
+        mock_stack.launch.assert_called_once_with()
 
-        self.environment._manage_stack_build(
-            mock_stack,
-            "launch",
-            threading_events,
-            stack_statuses,
-            dependencies
+    def test_launch_if_changed_launches_stack_with_old_fingerprint(self):
+        mock_stack = self._get_incremental_stack()
+
+        mock_fingerprints = Mock()
+        mock_fingerprints.get.return_value = "new"
+
+        self.environment._launch_if_changed(
+            mock_stack, mock_fingerprints, {}, set()
         )
 
-        assert stack_statuses["stack"] == StackStatus.FAILED
-        # Check that that stack's event is set
-        threading_events["stack"].set.assert_called_once_with()
+        mock_stack.launch.assert_called_once_with()
 
-    @patch("sceptre.environment.threading.Event")
-    def test_get_threading_events(self, mock_Event):
-        mock_stack = Mock()
-        mock_stack.name = "name"
+    def test_launch_if_changed_launches_rolled_back_stack(self):
+        mock_stack = self._get_incremental_stack("UPDATE_ROLLBACK_COMPLETE")
 
-        self.environment.stacks = {"mock_stack": mock_stack}
+        self.environment._launch_if_changed(
+            mock_stack, self._get_fingerprints(), {}, set()
+        )
 
-        mock_Event.return_value = sentinel.event
+        mock_stack.launch.assert_called_once_with()
 
-        response = self.environment._get_threading_events()
-        assert response == {
-            "name": sentinel.event
-        }
+    def test_launch_if_changed_launches_missing_stack(self):
+        mock_stack = self._get_incremental_stack()
+        mock_stack.describe.side_effect = ClientError(
+            {"Error": {"Code": "ValidationError",
+                       "Message": "Stack with id app does not exist"}},
+            sentinel.operation
+        )
+        mock_stack.launch.return_value = StackStatus.FAILED
+
+        self.environment._launch_if_changed(
+            mock_stack, self._get_fingerprints(), {}, set()
+        )
+
+        mock_stack.launch.assert_called_once_with()
+
+    def test_get_stacks(self):
+        mock_stack = Mock()
+        mock_stack.name = "dev/name"
+
+        self.environment.stacks = {"name": mock_stack}
+
+        response = self.environment._get_stacks()
+        assert response == {"dev/name": mock_stack}
 
     def test_get_initial_statuses(self):
         mock_stack = Mock()
@@ -392,23 +676,41 @@ class TestEnvironment(object):
             "dev/mock_stack_3": [],
         }
 
-    def test_check_for_circular_dependencies_with_circular_dependencies(self):
+    def test_check_dependencies_with_circular_dependencies(self):
         dependencies = {
             "stack-1": ["stack-2"],
             "stack-2": ["stack-1"]
         }
 
         with pytest.raises(CircularDependenciesError):
-            self.environment._check_for_circular_dependencies(dependencies)
+            self.environment._check_dependencies(dependencies)
+
+    def test_check_dependencies_with_indirect_circular_dependencies(self):
+        dependencies = {
+            "stack-1": ["stack-2"],
+            "stack-2": ["stack-3"],
+            "stack-3": ["stack-1"]
+        }
+
+        with pytest.raises(CircularDependenciesError):
+            self.environment._check_dependencies(dependencies)
+
+    def test_check_dependencies_with_missing_dependency(self):
+        dependencies = {
+            "stack-1": ["stack-2"]
+        }
+
+        with pytest.raises(DependencyStackNotFoundError):
+            self.environment._check_dependencies(dependencies)
 
-    def test_check_for_circular_dependencies_without_find_dependencies(self):
+    def test_check_dependencies_without_circular_dependencies(self):
         dependencies = {
             "stack-1": ["stack-2"],
             "stack-2": []
         }
 
         # Check this runs without throwing an exception
-        self.environment._check_for_circular_dependencies(dependencies)
+        self.environment._check_dependencies(dependencies)
 
     @patch("sceptre.environment.Config")
     def test_get_config(self, mock_Config):
@@ -467,7 +769,8 @@ class TestEnvironment(object):
         # Check ConnectionManager() is called with correct arguments
         mock_ConnectionManager.assert_called_once_with(
             region=sentinel.region,
-            iam_role=sentinel.iam_role
+            iam_role=sentinel.iam_role,
+            retry_policy=None
         )
 
         # Check Stack() is called with correct arguments
@@ -479,6 +782,22 @@ class TestEnvironment(object):
         # Check _load_stacks() returns list of stacks
         assert response == {'stack_name': sentinel.stack}
 
+    def test_get_retry_policy_is_shared_with_sub_environments(self):
+        sub_environment = Environment(
+            sceptre_dir="sceptre_dir",
+            environment_path="env",
+            retry_policies=self.environment._retry_policies
+        )
+        retry_config = {"max_attempts": 5, "budget": {"capacity": 10}}
+
+        retry_policy = self.environment._get_retry_policy(retry_config)
+
+        assert sub_environment._get_retry_policy(dict(retry_config)) is \
+            retry_policy
+        assert retry_policy.budget.capacity == 10
+        assert self.environment._get_retry_policy({"max_attempts": 6}) is \
+            not retry_policy
+
     def test_get_available_environments(self):
         self.environment.path = "account"
         self.environment.sceptre_dir = os.path.join(
@@ -495,5 +814,14 @@ class TestEnvironment(object):
         mock_get_available_environments.return_value = ["env"]
         mock_Environment.return_value = sentinel.environment
 
+        self.environment._config_index = sentinel.config_index
+
         response = self.environment._load_environments()
         assert response == {"env": sentinel.environment}
+        mock_Environment.assert_called_once_with(
+            sceptre_dir="sceptre_dir",
+            environment_path="env",
+            options=sentinel.options,
+            config_index=sentinel.config_index,
+            retry_policies=self.environment._retry_policies
+        )
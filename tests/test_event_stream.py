@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+import datetime
+
+from botocore.exceptions import ClientError
+from dateutil.tz import tzutc
+from mock import Mock
+
+from sceptre.event_stream import StackEventStream
+
+
+def get_event(event_id, second=0):
+    return {
+        "EventId": event_id,
+        "Timestamp": datetime.datetime(
+            2016, 3, 15, 14, 0, second, 0, tzinfo=tzutc()
+        )
+    }
+
+
+class TestStackEventStream(object):
+
+    def setup_method(self, test_method):
+        self.connection_manager = Mock()
+        self.event_stream = StackEventStream(
+            connection_manager=self.connection_manager,
+            stack_name="prj-stack",
+            since=datetime.datetime(2016, 3, 15, 14, 0, 10, 0, tzinfo=tzutc())
+        )
+
+    def test_read_starts_after_since(self):
+        self.connection_manager.paginate.return_value = iter([
+            {"StackEvents": [
+                get_event("c", 20), get_event("b", 15), get_event("a", 5)
+            ]}
+        ])
+
+        events = list(self.event_stream.read())
+
+        assert [event["EventId"] for event in events] == ["b", "c"]
+        assert self.event_stream.last_event_id == "c"
+        self.connection_manager.paginate.assert_called_once_with(
+            service="cloudformation",
+            command="describe_stack_events",
+            kwargs={"StackName": "prj-stack"}
+        )
+
+    def test_read_follows_pages_until_last_seen_event(self):
+        self.event_stream.last_event_id = "b"
+        pages = [
+            {"StackEvents": [get_event("e", 40), get_event("d", 40)]},
+            {"StackEvents": [get_event("c", 40), get_event("b", 30)]},
+            {"StackEvents": [get_event("a", 20)]}
+        ]
+        read_pages = []
+
+        def paginate(**kwargs):
+            for page in pages:
+                read_pages.append(page)
+                yield page
+
+        self.connection_manager.paginate.side_effect = paginate
+
+        events = list(self.event_stream.read())
+
+        # Events with identical timestamps are all returned, in order.
+        assert [event["EventId"] for event in events] == ["c", "d", "e"]
+        assert len(read_pages) == 2
+        assert self.event_stream.last_event_id == "e"
+
+    def test_read_with_no_new_events(self):
+        self.event_stream.last_event_id = "a"
+        self.connection_manager.paginate.return_value = iter([
+            {"StackEvents": [get_event("a", 20)]}
+        ])
+
+        assert list(self.event_stream.read()) == []
+        assert self.event_stream.last_event_id == "a"
+
+    def test_skip_existing_starts_after_newest_event(self):
+        self.connection_manager.call.return_value = {
+            "StackEvents": [get_event("b", 30), get_event("a", 20)]
+        }
+        self.event_stream.skip_existing()
+        self.connection_manager.paginate.return_value = iter([
+            {"StackEvents": [
+                get_event("c", 40), get_event("b", 30), get_event("a", 20)
+            ]}
+        ])
+
+        events = list(self.event_stream.read())
+
+        assert [event["EventId"] for event in events] == ["c"]
+
+    def test_skip_existing_with_stack_which_does_not_exist(self):
+        self.connection_manager.call.side_effect = ClientError(
+            {"Error": {"Code": "ValidationError",
+                       "Message": "Stack with id prj-stack does not exist"}},
+            "DescribeStackEvents"
+        )
+        self.event_stream.skip_existing()
+        self.connection_manager.paginate.return_value = iter([
+            {"StackEvents": [get_event("a", 5)]}
+        ])
+
+        events = list(self.event_stream.read())
+
+        assert [event["EventId"] for event in events] == ["a"]
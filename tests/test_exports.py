@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+from mock import Mock
+
+from sceptre.exceptions import ExportNotFoundError
+from sceptre.exports import ExportIndex
+
+
+class TestExportIndex(object):
+
+    def setup_method(self, test_method):
+        self.export_index = ExportIndex()
+        self.connection_manager = Mock(region="eu-west-1", iam_role=None)
+        self.pages = [
+            {"Exports": [{"Name": "vpc-id", "Value": "vpc-123"}]},
+            {"Exports": [{"Name": "subnet-id", "Value": "subnet-123"}]}
+        ]
+        self.connection_manager.paginate.side_effect = \
+            lambda **kwargs: iter(self.pages)
+
+    def test_get_value_lists_exports_once(self):
+        assert self.export_index.get_value(
+            self.connection_manager, "vpc-id"
+        ) == "vpc-123"
+        assert self.export_index.get_value(
+            self.connection_manager, "subnet-id"
+        ) == "subnet-123"
+
+        self.connection_manager.paginate.assert_called_once_with(
+            service="cloudformation", command="list_exports"
+        )
+
+    def test_get_value_lists_exports_again_for_missing_export(self):
+        self.export_index.get_value(self.connection_manager, "vpc-id")
+        self.pages = [{"Exports": [{"Name": "new-id", "Value": "new"}]}]
+
+        assert self.export_index.get_value(
+            self.connection_manager, "new-id"
+        ) == "new"
+        assert self.connection_manager.paginate.call_count == 2
+
+    def test_get_value_with_missing_export(self):
+        with pytest.raises(ExportNotFoundError):
+            self.export_index.get_value(self.connection_manager, "missing")
+
+    def test_get_value_indexes_regions_separately(self):
+        other_connection_manager = Mock(region="us-east-1", iam_role=None)
+        other_connection_manager.paginate.return_value = iter([
+            {"Exports": [{"Name": "vpc-id", "Value": "vpc-456"}]}
+        ])
+
+        self.export_index.get_value(self.connection_manager, "vpc-id")
+
+        assert self.export_index.get_value(
+            other_connection_manager, "vpc-id"
+        ) == "vpc-456"
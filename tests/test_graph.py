@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+
+import time
+
+import pytest
+
+from sceptre.exceptions import CircularDependenciesError
+from sceptre.exceptions import DependencyStackNotFoundError
+from sceptre.graph import StackGraph
+
+
+class TestStackGraph(object):
+
+    def test_dependents(self):
+        graph = StackGraph({
+            "vpc": [],
+            "subnets": ["vpc"],
+            "app": ["vpc", "subnets", "external"]
+        })
+        assert graph.dependents == {
+            "vpc": ["app", "subnets"],
+            "subnets": ["app"],
+            "app": []
+        }
+
+    def test_reversed(self):
+        graph = StackGraph({"vpc": [], "subnets": ["vpc"]}).reversed()
+        assert graph.dependencies == {"vpc": ["subnets"], "subnets": []}
+
+    def test_get_missing_dependencies(self):
+        graph = StackGraph({"app": ["vpc", "db"], "db": []})
+        assert graph.get_missing_dependencies() == {"app": ["vpc"]}
+
+    def test_check_with_missing_dependency(self):
+        graph = StackGraph({"app": ["vpc"]})
+        with pytest.raises(DependencyStackNotFoundError) as excinfo:
+            graph.check()
+        assert "app depends on vpc" in str(excinfo.value)
+
+    def test_check_with_indirect_cycle_reports_full_path(self):
+        graph = StackGraph({"a": ["b"], "b": ["c"], "c": ["a"], "d": ["a"]})
+        with pytest.raises(CircularDependenciesError) as excinfo:
+            graph.check()
+        assert "a -> b -> c -> a" in str(excinfo.value)
+
+    def test_check_without_problems(self):
+        StackGraph({"a": ["b"], "b": []}).check()
+
+    def test_find_cycles_reports_every_cycle(self):
+        graph = StackGraph({
+            "a": ["b"], "b": ["a"],
+            "x": ["y"], "y": ["z"], "z": ["x"],
+            "self": ["self"],
+            "ok": ["a"]
+        })
+        assert graph.find_cycles() == [
+            ["a", "b", "a"],
+            ["self", "self"],
+            ["x", "y", "z", "x"]
+        ]
+
+    def test_get_strongly_connected_components(self):
+        graph = StackGraph({"a": ["b"], "b": ["a"], "c": ["a"]})
+        components = sorted(
+            sorted(component)
+            for component in graph.get_strongly_connected_components()
+        )
+        assert components == [["a", "b"], ["c"]]
+
+    def test_get_topological_order(self):
+        graph = StackGraph({
+            "app": ["subnets"],
+            "subnets": ["vpc"],
+            "vpc": [],
+            "dns": []
+        })
+        assert graph.get_topological_order() == [
+            "dns", "vpc", "subnets", "app"
+        ]
+
+    def test_get_longest_downstream_paths(self):
+        graph = StackGraph({"vpc": [], "subnets": ["vpc"], "app": ["vpc"]})
+        assert graph.get_longest_downstream_paths() == {
+            "vpc": 2, "subnets": 1, "app": 1
+        }
+        assert graph.get_longest_downstream_paths({"app": 5}) == {
+            "vpc": 6, "subnets": 1, "app": 5
+        }
+
+    def test_get_waves(self):
+        graph = StackGraph({
+            "vpc": [],
+            "dns": [],
+            "subnets": ["vpc"],
+            "db": ["subnets"],
+            "app": ["subnets", "dns"]
+        })
+        assert graph.get_waves() == [
+            ["dns", "vpc"], ["subnets"], ["app", "db"]
+        ]
+
+    def test_get_critical_path(self):
+        graph = StackGraph({
+            "vpc": [],
+            "dns": [],
+            "subnets": ["vpc"],
+            "db": ["subnets"],
+            "app": ["dns"]
+        })
+        assert graph.get_critical_path() == ["vpc", "subnets", "db"]
+        assert graph.get_critical_path({"dns": 10}) == ["dns", "app"]
+
+    def test_get_critical_path_of_empty_graph(self):
+        assert StackGraph({}).get_critical_path() == []
+
+    def test_check_is_fast_on_large_graphs(self):
+        dependencies = {
+            "stack-{0}".format(index): ["stack-{0}".format(index + 1)]
+            for index in range(10000)
+        }
+        dependencies["stack-10000"] = ["stack-0"]
+        graph = StackGraph(dependencies)
+
+        start = time.time()
+        with pytest.raises(CircularDependenciesError):
+            graph.check()
+        assert time.time() - start < 1
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+
+from mock import patch, sentinel, Mock
+
+from sceptre.hooks import Hook
+from sceptre.plugins import LazyPlugin
+from sceptre.plugins import PluginRegistry
+from sceptre.resolvers import Resolver
+
+
+class CustomResolver(Resolver):
+
+    def resolve(self):
+        return self.argument
+
+
+class TestLazyPlugin(object):
+
+    def test_call_loads_class_from_module(self):
+        lazy_plugin = LazyPlugin(
+            "sceptre.resolvers.environment_variable",
+            os.path.join("sceptre", "resolvers", "environment_variable.py"),
+            "EnvironmentVariable"
+        )
+
+        resolver = lazy_plugin("HOME", None, None, None)
+
+        assert type(resolver).__name__ == "EnvironmentVariable"
+        assert resolver.argument == "HOME"
+
+    def test_load_does_not_reuse_other_module_with_same_name(self):
+        import cmd
+        lazy_plugin = LazyPlugin(
+            "cmd", os.path.join("sceptre", "hooks", "cmd.py"), "Cmd"
+        )
+
+        stdlib_cmd_class = cmd.Cmd
+
+        with patch.dict(sys.modules, {"cmd": cmd}):
+            plugin_class = lazy_plugin.load()
+            assert sys.modules["cmd"] is cmd
+
+        assert issubclass(plugin_class, Hook)
+        assert cmd.Cmd is stdlib_cmd_class
+
+
+class TestPluginRegistry(object):
+
+    def setup_method(self, test_method):
+        self.plugin_registry = PluginRegistry()
+
+    @patch("sceptre.plugins.get_subclasses")
+    def test_get_classes_loads_directory_once(self, mock_get_subclasses):
+        mock_get_subclasses.return_value = sentinel.classes
+
+        for _ in range(3):
+            classes = self.plugin_registry.get_classes(Resolver, "resolvers")
+
+        assert classes == sentinel.classes
+        mock_get_subclasses.assert_called_once_with(
+            directory="resolvers", class_type=Resolver
+        )
+
+    @patch("sceptre.plugins.get_subclasses")
+    def test_get_classes_loads_each_directory(self, mock_get_subclasses):
+        self.plugin_registry.get_classes(Resolver, "resolvers")
+        self.plugin_registry.get_classes(
+            Resolver, os.path.join("project", "resolvers")
+        )
+
+        assert mock_get_subclasses.call_count == 2
+
+    @patch("sceptre.plugins._iter_entry_points")
+    def test_get_entry_point_classes(self, mock_iter_entry_points):
+        valid_entry_point = Mock()
+        valid_entry_point.name = "CustomResolver"
+        valid_entry_point.load.return_value = CustomResolver
+        invalid_entry_point = Mock()
+        invalid_entry_point.name = "not_a_resolver"
+        invalid_entry_point.load.return_value = object
+        mock_iter_entry_points.return_value = [
+            valid_entry_point, invalid_entry_point
+        ]
+
+        for _ in range(2):
+            classes = self.plugin_registry.get_entry_point_classes(
+                Resolver, "sceptre.resolvers"
+            )
+
+        assert classes == {"custom_resolver": CustomResolver}
+        mock_iter_entry_points.assert_called_once_with("sceptre.resolvers")
+
+    def test_get_plugin_map_and_add_plugin_map(self):
+        self.plugin_registry._classes[
+            (Resolver, "directory", "/resolvers")
+        ] = {"custom_resolver": CustomResolver}
+
+        plugin_map = self.plugin_registry.get_plugin_map()
+        other_registry = PluginRegistry()
+        other_registry.add_plugin_map(plugin_map, {"Resolver": Resolver})
+
+        assert plugin_map == {
+            ("Resolver", "/resolvers"): {
+                "custom_resolver": (
+                    __name__, __file__.replace(".pyc", ".py"),
+                    "CustomResolver"
+                )
+            }
+        }
+        with patch("sceptre.plugins.get_subclasses") as mock_get_subclasses:
+            classes = other_registry.get_classes(Resolver, "/resolvers")
+        mock_get_subclasses.assert_not_called()
+        assert classes["custom_resolver"].load() is CustomResolver
+
+    @patch("sceptre.plugins.get_subclasses")
+    def test_clear(self, mock_get_subclasses):
+        self.plugin_registry.get_classes(Resolver, "resolvers")
+        self.plugin_registry.clear()
+        self.plugin_registry.get_classes(Resolver, "resolvers")
+
+        assert mock_get_subclasses.call_count == 2
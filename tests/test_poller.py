@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+
+from botocore.exceptions import ClientError
+import pytest
+from mock import Mock
+
+from sceptre.exceptions import StackDoesNotExistError
+from sceptre.exceptions import StackTimeoutError
+from sceptre.poller import StatusPoller
+from sceptre.poller import _denied_groups
+from sceptre.poller import get_stack_statuses
+
+
+def get_stack(name, external_name, connection_manager):
+    stack = Mock()
+    stack.name = name
+    stack.external_name = external_name
+    stack.connection_manager = connection_manager
+    return stack
+
+
+def get_connection_manager(region, pages):
+    connection_manager = Mock()
+    connection_manager.region = region
+    connection_manager.iam_role = None
+    connection_manager.paginate.side_effect = lambda **kwargs: iter(pages)
+    return connection_manager
+
+
+class TestGetStackStatuses(object):
+
+    def setup_method(self, test_method):
+        _denied_groups.clear()
+
+    def test_get_stack_statuses_makes_one_call_per_region(self):
+        eu_connection_manager = get_connection_manager("eu-west-1", [
+            {"Stacks": [
+                {"StackName": "prj-vpc", "StackStatus": "CREATE_COMPLETE"}
+            ]},
+            {"Stacks": [
+                {"StackName": "prj-db", "StackStatus": "UPDATE_COMPLETE"}
+            ]}
+        ])
+        us_connection_manager = get_connection_manager("us-east-1", [
+            {"Stacks": []}
+        ])
+        stacks = [
+            get_stack("dev/vpc", "prj-vpc", eu_connection_manager),
+            get_stack("dev/db", "prj-db", Mock(
+                region="eu-west-1", iam_role=None
+            )),
+            get_stack("dev/app", "prj-app", us_connection_manager)
+        ]
+
+        response = get_stack_statuses(stacks)
+
+        assert response == {
+            "dev/vpc": "CREATE_COMPLETE",
+            "dev/db": "UPDATE_COMPLETE",
+            "dev/app": None
+        }
+        eu_connection_manager.paginate.assert_called_once_with(
+            service="cloudformation", command="describe_stacks"
+        )
+        assert us_connection_manager.paginate.call_count == 1
+
+    def test_get_stack_statuses_fills_describe_cache(self):
+        description = {
+            "StackName": "prj-vpc", "StackStatus": "CREATE_COMPLETE"
+        }
+        connection_manager = get_connection_manager(
+            "eu-west-1", [{"Stacks": [description]}]
+        )
+        connection_manager.get_describe_cache_key.side_effect = \
+            lambda stack_name: ("eu-west-1", None, stack_name)
+
+        get_stack_statuses([
+            get_stack("dev/vpc", "prj-vpc", connection_manager)
+        ])
+
+        connection_manager.describe_cache.set.assert_called_once_with(
+            ("eu-west-1", None, "prj-vpc"), {"Stacks": [description]},
+            connection_manager.describe_cache.version
+        )
+
+    def test_get_stack_statuses_falls_back_when_access_is_denied(self):
+        connection_manager = Mock(region="eu-west-1", iam_role=None)
+        connection_manager.paginate.side_effect = ClientError(
+            {"Error": {"Code": "AccessDenied", "Message": "Denied"}},
+            "DescribeStacks"
+        )
+        stack = get_stack("dev/vpc", "prj-vpc", connection_manager)
+        stack.get_status.return_value = "CREATE_COMPLETE"
+        missing_stack = get_stack("dev/db", "prj-db", connection_manager)
+        missing_stack.get_status.side_effect = StackDoesNotExistError()
+
+        for _ in range(2):
+            response = get_stack_statuses([stack, missing_stack])
+
+        assert response == {"dev/vpc": "CREATE_COMPLETE", "dev/db": None}
+        assert connection_manager.paginate.call_count == 1
+
+    def test_get_stack_statuses_raises_other_client_errors(self):
+        connection_manager = Mock(region="eu-west-1", iam_role=None)
+        connection_manager.paginate.side_effect = ClientError(
+            {"Error": {"Code": "ValidationError", "Message": "Boom!"}},
+            "DescribeStacks"
+        )
+        stack = get_stack("dev/vpc", "prj-vpc", connection_manager)
+
+        with pytest.raises(ClientError):
+            get_stack_statuses([stack])
+
+
+class TestStatusPoller(object):
+
+    def setup_method(self, test_method):
+        self.status_poller = StatusPoller(interval=0)
+        _denied_groups.clear()
+
+    def test_wait_returns_final_status(self):
+        responses = iter([
+            [{"Stacks": [
+                {"StackName": "prj-vpc", "StackStatus": "CREATE_IN_PROGRESS"},
+                {"StackName": "prj-app", "StackStatus": "CREATE_IN_PROGRESS"}
+            ]}],
+            [{"Stacks": [
+                {"StackName": "prj-vpc", "StackStatus": "CREATE_COMPLETE"}
+            ]}]
+        ])
+        connection_manager = Mock(region="eu-west-1", iam_role=None)
+        connection_manager.paginate.side_effect = \
+            lambda **kwargs: next(responses)
+        stack = get_stack("dev/vpc", "prj-vpc", connection_manager)
+
+        assert self.status_poller.wait(stack) == "CREATE_COMPLETE"
+        assert connection_manager.paginate.call_count == 2
+
+    def test_wait_raises_if_stack_does_not_exist(self):
+        stack = get_stack("dev/vpc", "prj-vpc", get_connection_manager(
+            "eu-west-1", [{"Stacks": []}]
+        ))
+
+        with pytest.raises(StackDoesNotExistError):
+            self.status_poller.wait(stack)
+
+    def test_wait_raises_repeated_errors_from_describe_stacks(self):
+        connection_manager = Mock(region="eu-west-1", iam_role=None)
+        connection_manager.paginate.side_effect = ValueError("Boom!")
+        stack = get_stack("dev/vpc", "prj-vpc", connection_manager)
+
+        with pytest.raises(ValueError):
+            self.status_poller.wait(stack)
+        assert connection_manager.paginate.call_count == 3
+
+    def test_wait_retries_errors_from_describe_stacks(self):
+        responses = iter([
+            ValueError("Boom!"),
+            [{"Stacks": [
+                {"StackName": "prj-vpc", "StackStatus": "CREATE_COMPLETE"}
+            ]}]
+        ])
+
+        def paginate(**kwargs):
+            response = next(responses)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        connection_manager = Mock(region="eu-west-1", iam_role=None)
+        connection_manager.paginate.side_effect = paginate
+        stack = get_stack("dev/vpc", "prj-vpc", connection_manager)
+
+        assert self.status_poller.wait(stack) == "CREATE_COMPLETE"
+
+    def test_wait_raises_after_timeout(self):
+        stack = get_stack("dev/vpc", "prj-vpc", get_connection_manager(
+            "eu-west-1", [{"Stacks": [
+                {"StackName": "prj-vpc", "StackStatus": "UPDATE_IN_PROGRESS"}
+            ]}]
+        ))
+        self.status_poller.interval = 0.01
+
+        with pytest.raises(StackTimeoutError):
+            self.status_poller.wait(stack, timeout=0.05)
+        assert self.status_poller._waiting == []
+
+    def test_unwatch_stops_tracking_stack(self):
+        stack = get_stack("dev/vpc", "prj-vpc", get_connection_manager(
+            "eu-west-1", [{"Stacks": [
+                {"StackName": "prj-vpc", "StackStatus": "UPDATE_IN_PROGRESS"}
+            ]}]
+        ))
+        self.status_poller.interval = 0.01
+
+        future = self.status_poller.watch(stack)
+        self.status_poller.unwatch(stack, future)
+
+        assert self.status_poller._waiting == []
+        assert not future.done()
+
+    def test_wait_for_tick_returns_after_refresh(self):
+        stack = get_stack("dev/vpc", "prj-vpc", get_connection_manager(
+            "eu-west-1", [{"Stacks": [
+                {"StackName": "prj-vpc", "StackStatus": "UPDATE_IN_PROGRESS"}
+            ]}]
+        ))
+        self.status_poller.interval = 0.01
+        tick = self.status_poller.tick
+
+        future = self.status_poller.watch(stack)
+        try:
+            assert self.status_poller.wait_for_tick(tick, timeout=5) > tick
+        finally:
+            self.status_poller.unwatch(stack, future)
+
+    def test_wait_for_tick_returns_after_timeout(self):
+        assert self.status_poller.wait_for_tick(0, timeout=0.01) == 0
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+from mock import patch, sentinel, Mock
+
+from sceptre.render_pool import get_render_pool
+from sceptre.render_pool import preload_modules
+from sceptre.render_pool import render_python_template
+from sceptre.render_pool import RenderPool
+
+
+class TestRenderPool(object):
+
+    def setup_method(self, test_method):
+        self.render_pool = RenderPool(2, preloaded_modules=("json",))
+
+    def teardown_method(self, test_method):
+        self.render_pool.shutdown()
+
+    def test_repr(self):
+        assert self.render_pool.__repr__() == (
+            "sceptre.render_pool.RenderPool(max_workers=2, "
+            "preloaded_modules=('json',))"
+        )
+
+    @patch("sceptre.render_pool.ProcessPoolExecutor")
+    def test_executor_starts_and_warms_workers_once(
+        self, mock_ProcessPoolExecutor
+    ):
+        mock_executor = mock_ProcessPoolExecutor.return_value
+
+        assert self.render_pool.executor == mock_executor
+        assert self.render_pool.executor == mock_executor
+
+        mock_ProcessPoolExecutor.assert_called_once_with(
+            max_workers=2, initializer=preload_modules, initargs=(("json",),)
+        )
+        mock_executor.submit.assert_called_once_with(preload_modules, ())
+
+    @patch("sceptre.render_pool.preload_modules")
+    @patch("sceptre.render_pool.ProcessPoolExecutor")
+    def test_executor_without_initializer_preloads_in_parent(
+        self, mock_ProcessPoolExecutor, mock_preload_modules
+    ):
+        mock_executor = Mock()
+        mock_ProcessPoolExecutor.side_effect = [TypeError(), mock_executor]
+
+        assert self.render_pool.executor == mock_executor
+
+        mock_preload_modules.assert_called_once_with(("json",))
+        mock_ProcessPoolExecutor.assert_called_with(max_workers=2)
+
+    @patch("sceptre.render_pool.ProcessPoolExecutor")
+    def test_start_starts_workers(self, mock_ProcessPoolExecutor):
+        assert self.render_pool.start() == \
+            mock_ProcessPoolExecutor.return_value
+        assert self.render_pool.executor == \
+            mock_ProcessPoolExecutor.return_value
+
+        assert mock_ProcessPoolExecutor.call_count == 1
+
+    def test_render_returns_body_from_worker(self):
+        self.render_pool._executor = Mock()
+        future = self.render_pool._executor.submit.return_value
+        future.result.return_value = sentinel.body
+
+        body = self.render_pool.render(sentinel.path, sentinel.user_data)
+
+        assert body == sentinel.body
+        self.render_pool._executor.submit.assert_called_once_with(
+            render_python_template, sentinel.path, sentinel.user_data
+        )
+
+    def test_render_in_worker_process(self):
+        path = os.path.join(
+            os.getcwd(), "tests/fixtures/templates/vpc_sud.py"
+        )
+
+        body = self.render_pool.render(path, {"cidr_block": "10.0.0.0/16"})
+
+        assert "10.0.0.0/16" in body
+
+
+def test_preload_modules_ignores_missing_modules():
+    preload_modules(("json", "sceptre_missing_module"))
+
+
+def test_get_render_pool_is_shared():
+    assert get_render_pool(3) is get_render_pool(3)
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import shutil
+import tempfile
+
+import pytest
+
+from sceptre.exceptions import RenderedTemplateError
+from sceptre.rendered import read_rendered_templates
+from sceptre.rendered import write_rendered_templates
+
+
+class TestRenderedTemplates(object):
+
+    def setup_method(self, test_method):
+        self.directory = tempfile.mkdtemp()
+        self.bodies = {"dev/vpc": u"vpc body", "dev/subnets": u"subnets"}
+
+    def teardown_method(self, test_method):
+        shutil.rmtree(self.directory)
+
+    def test_write_rendered_templates_writes_manifest(self):
+        manifest = write_rendered_templates(self.directory, "dev", self.bodies)
+
+        with open(os.path.join(self.directory, "manifest.json")) as f:
+            assert json.load(f) == manifest
+        assert manifest["environment"] == "dev"
+        assert manifest["stacks"]["dev/vpc"]["file"] == "dev/vpc.template"
+        assert manifest["stacks"]["dev/vpc"]["size"] == 8
+        assert os.path.isfile(
+            os.path.join(self.directory, "dev", "vpc.template")
+        )
+
+    def test_read_rendered_templates_returns_bodies(self):
+        write_rendered_templates(self.directory, "dev", self.bodies)
+        assert read_rendered_templates(self.directory) == self.bodies
+
+    def test_read_rendered_templates_with_modified_template(self):
+        write_rendered_templates(self.directory, "dev", self.bodies)
+        with open(os.path.join(self.directory, "dev", "vpc.template"), "w") \
+                as template_file:
+            template_file.write("modified")
+
+        with pytest.raises(RenderedTemplateError):
+            read_rendered_templates(self.directory)
+
+    def test_read_rendered_templates_without_manifest(self):
+        with pytest.raises(RenderedTemplateError):
+            read_rendered_templates(self.directory)
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+
+from mock import patch, sentinel
+
+from sceptre.resolvers.export_value import ExportValue
+
+
+class TestExportValueResolver(object):
+
+    def setup_method(self, test_method):
+        self.export_value_resolver = ExportValue(
+            environment_config=sentinel.environment_config,
+            stack_config=sentinel.config,
+            connection_manager=sentinel.connection_manager,
+            argument="prj-network-vpc-VpcId"
+        )
+
+    @patch("sceptre.resolvers.export_value.export_index")
+    def test_resolve(self, mock_export_index):
+        mock_export_index.get_value.return_value = sentinel.value
+
+        assert self.export_value_resolver.resolve() == sentinel.value
+        mock_export_index.get_value.assert_called_once_with(
+            sentinel.connection_manager, "prj-network-vpc-VpcId"
+        )
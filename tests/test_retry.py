@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+
+from botocore.exceptions import ClientError
+from mock import patch, sentinel
+
+from sceptre.retry import RetryBudget, RetryMetrics, RetryPolicy
+from sceptre.retry import retry_metrics
+
+
+def _client_error(code, status=400):
+    return ClientError(
+        {
+            "Error": {"Code": code, "Message": "Boom!"},
+            "ResponseMetadata": {"HTTPStatusCode": status}
+        },
+        sentinel.operation
+    )
+
+
+class TestRetryPolicy(object):
+
+    def setup_method(self, test_method):
+        self.metrics = RetryMetrics()
+        self.retry_policy = RetryPolicy(metrics=self.metrics)
+
+    def test_from_config_with_no_config(self):
+        retry_policy = RetryPolicy.from_config(None)
+
+        assert retry_policy.max_attempts == 30
+        assert retry_policy.base_delay == 1
+        assert retry_policy.max_delay == 20
+        assert retry_policy.budget is None
+        assert retry_policy.metrics is retry_metrics
+
+    def test_from_config_overrides_defaults(self):
+        retry_policy = RetryPolicy.from_config({
+            "max_attempts": 5,
+            "service_codes": {"cloudformation": ["ValidationError"]},
+            "budget": {"capacity": 10}
+        })
+
+        assert retry_policy.max_attempts == 5
+        assert retry_policy.max_delay == 20
+        assert "ValidationError" in \
+            retry_policy.service_codes["cloudformation"]
+        assert retry_policy.budget.capacity == 10
+
+    def test_is_retryable_with_throttling_codes(self):
+        for code in [
+            "Throttling", "ThrottlingException", "RequestLimitExceeded",
+            "TooManyRequestsException"
+        ]:
+            assert self.retry_policy.is_retryable(
+                "cloudformation", _client_error(code)
+            )
+
+    def test_is_retryable_with_server_error(self):
+        assert self.retry_policy.is_retryable(
+            "cloudformation", _client_error("Unknown", 503)
+        )
+
+    def test_is_retryable_with_client_error(self):
+        assert not self.retry_policy.is_retryable(
+            "cloudformation", _client_error("ValidationError")
+        )
+
+    def test_is_retryable_with_service_code(self):
+        retry_policy = RetryPolicy(service_codes={"s3": ["NoSuchBucket"]})
+        error = _client_error("NoSuchBucket", 404)
+
+        assert retry_policy.is_retryable("s3", error)
+        assert not retry_policy.is_retryable("cloudformation", error)
+
+    @patch("sceptre.retry.random.uniform")
+    def test_get_delay_backs_off_to_max_delay(self, mock_uniform):
+        mock_uniform.side_effect = lambda low, high: high
+        retry_policy = RetryPolicy(base_delay=1, max_delay=10)
+
+        delays = [retry_policy.get_delay(attempt) for attempt in range(1, 7)]
+
+        assert delays == [1, 2, 4, 8, 10, 10]
+        mock_uniform.assert_called_with(0, 10)
+
+    def test_can_retry_until_max_attempts(self):
+        retry_policy = RetryPolicy(max_attempts=3, metrics=self.metrics)
+
+        assert retry_policy.can_retry(2)
+        assert not retry_policy.can_retry(3)
+        assert self.metrics.get_summary()["exhausted"] == 1
+
+    def test_can_retry_withdraws_from_budget(self):
+        retry_policy = RetryPolicy(
+            budget=RetryBudget(capacity=10, retry_cost=5),
+            metrics=self.metrics
+        )
+
+        assert retry_policy.can_retry(1)
+        assert retry_policy.can_retry(1)
+        assert not retry_policy.can_retry(1)
+        assert self.metrics.get_summary()["exhausted"] == 1
+
+    def test_record_success_refunds_budget(self):
+        budget = RetryBudget(capacity=10, retry_cost=5, success_refund=5)
+        retry_policy = RetryPolicy(budget=budget)
+        budget.acquire()
+
+        retry_policy.record_success()
+        retry_policy.record_success()
+
+        assert budget.available == 10
+
+
+class TestRetryMetrics(object):
+
+    def test_record_retry(self):
+        metrics = RetryMetrics()
+
+        metrics.record_retry("cloudformation", "Throttling", 1.5)
+        metrics.record_retry("cloudformation", "Throttling", 2)
+
+        assert metrics.get_summary() == {
+            "retries": 2,
+            "sleep_time": 3.5,
+            "exhausted": 0,
+            "codes": {"cloudformation:Throttling": 2}
+        }
+
+    def test_reset(self):
+        metrics = RetryMetrics()
+        metrics.record_retry("s3", "SlowDown", 1)
+        metrics.record_exhausted()
+
+        metrics.reset()
+
+        assert metrics.get_summary()["retries"] == 0
+        assert metrics.get_summary()["exhausted"] == 0
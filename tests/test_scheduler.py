@@ -0,0 +1,357 @@
+# -*- coding: utf-8 -*-
+
+import threading
+
+from mock import Mock
+
+from sceptre.scheduler import FailurePolicy
+from sceptre.scheduler import StackScheduler
+from sceptre.stack_status import StackStatus
+
+
+class TestStackScheduler(object):
+
+    def setup_method(self, test_method):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def _get_stack(self, name, status=StackStatus.COMPLETE):
+        stack = Mock()
+        stack.name = name
+
+        def launch():
+            with self.lock:
+                self.calls.append(name)
+            if isinstance(status, Exception):
+                raise status
+            return status
+
+        stack.launch.side_effect = launch
+        return stack
+
+    def _run(
+            self, stacks, dependencies, max_concurrency=None,
+            on_failure=FailurePolicy.CONTINUE
+    ):
+        scheduler = StackScheduler(
+            stacks={stack.name: stack for stack in stacks},
+            dependencies=dependencies,
+            max_concurrency=max_concurrency,
+            on_failure=on_failure
+        )
+        stack_statuses = {
+            stack.name: StackStatus.PENDING for stack in stacks
+        }
+        return scheduler.run("launch", stack_statuses)
+
+    def test_max_concurrency_defaults_to_number_of_stacks(self):
+        scheduler = StackScheduler(
+            stacks={"a": Mock(), "b": Mock()}, dependencies={}
+        )
+        assert scheduler.max_concurrency == 2
+
+    def test_max_concurrency_with_no_stacks(self):
+        scheduler = StackScheduler(stacks={}, dependencies={})
+        assert scheduler.max_concurrency == 1
+
+    def test_run_launches_stacks_in_dependency_order(self):
+        stacks = [
+            self._get_stack("dev/vpc"),
+            self._get_stack("dev/subnets"),
+            self._get_stack("dev/app")
+        ]
+        dependencies = {
+            "dev/vpc": [],
+            "dev/subnets": ["dev/vpc"],
+            "dev/app": ["dev/subnets", "dev/vpc"]
+        }
+
+        response = self._run(stacks, dependencies, max_concurrency=4)
+
+        assert self.calls == ["dev/vpc", "dev/subnets", "dev/app"]
+        assert response == {
+            "dev/vpc": StackStatus.COMPLETE,
+            "dev/subnets": StackStatus.COMPLETE,
+            "dev/app": StackStatus.COMPLETE
+        }
+
+    def test_run_never_exceeds_max_concurrency(self):
+        active = []
+        peak = []
+        lock = threading.Lock()
+        stacks = []
+        for index in range(8):
+            stack = Mock()
+            stack.name = "dev/stack-{0}".format(index)
+
+            def launch():
+                with lock:
+                    active.append(1)
+                    peak.append(len(active))
+                threading.Event().wait(0.01)
+                with lock:
+                    active.pop()
+                return StackStatus.COMPLETE
+
+            stack.launch.side_effect = launch
+            stacks.append(stack)
+
+        response = self._run(
+            stacks, {stack.name: [] for stack in stacks}, max_concurrency=2
+        )
+
+        assert max(peak) <= 2
+        assert set(response.values()) == {StackStatus.COMPLETE}
+
+    def test_run_fails_transitive_dependents_of_failed_stack(self):
+        stacks = [
+            self._get_stack("dev/vpc", Exception("Boom!")),
+            self._get_stack("dev/subnets"),
+            self._get_stack("dev/app"),
+            self._get_stack("dev/unrelated")
+        ]
+        dependencies = {
+            "dev/vpc": [],
+            "dev/subnets": ["dev/vpc"],
+            "dev/app": ["dev/subnets"],
+            "dev/unrelated": []
+        }
+
+        response = self._run(stacks, dependencies)
+
+        assert sorted(self.calls) == ["dev/unrelated", "dev/vpc"]
+        assert response == {
+            "dev/vpc": StackStatus.FAILED,
+            "dev/subnets": StackStatus.FAILED,
+            "dev/app": StackStatus.FAILED,
+            "dev/unrelated": StackStatus.COMPLETE
+        }
+
+    def test_run_fails_dependents_of_incomplete_stack(self):
+        stacks = [
+            self._get_stack("dev/vpc", StackStatus.IN_PROGRESS),
+            self._get_stack("dev/subnets")
+        ]
+        dependencies = {"dev/vpc": [], "dev/subnets": ["dev/vpc"]}
+
+        response = self._run(stacks, dependencies)
+
+        assert self.calls == ["dev/vpc"]
+        assert response == {
+            "dev/vpc": StackStatus.IN_PROGRESS,
+            "dev/subnets": StackStatus.FAILED
+        }
+
+    def test_priorities_without_durations(self):
+        scheduler = StackScheduler(
+            stacks={"vpc": Mock(), "network": Mock(), "app": Mock(),
+                    "dns": Mock()},
+            dependencies={
+                "vpc": [],
+                "network": ["vpc"],
+                "app": ["network"],
+                "dns": []
+            }
+        )
+        assert scheduler.priorities == {
+            "vpc": 3, "network": 2, "app": 1, "dns": 1
+        }
+
+    def test_priorities_with_durations(self):
+        scheduler = StackScheduler(
+            stacks={"vpc": Mock(), "app": Mock(), "db": Mock()},
+            dependencies={"vpc": [], "app": ["vpc"], "db": []},
+            durations={"vpc": 10.0, "app": 20.0}
+        )
+        # "db" has no recorded duration so is weighted by the mean.
+        assert scheduler.priorities == {"vpc": 30.0, "app": 20.0, "db": 15.0}
+
+    def test_explain(self):
+        scheduler = StackScheduler(
+            stacks={"vpc": Mock(), "app": Mock()},
+            dependencies={"vpc": [], "app": ["vpc"]},
+            durations={"vpc": 5.0}
+        )
+        assert scheduler.explain() == [
+            {"rank": 1, "stack": "vpc", "priority": 10.0, "duration": 5.0},
+            {"rank": 2, "stack": "app", "priority": 5.0, "duration": None}
+        ]
+
+    def test_run_dispatches_critical_path_first(self):
+        stacks = [
+            self._get_stack("dev/a"),
+            self._get_stack("dev/b"),
+            self._get_stack("dev/c"),
+            self._get_stack("dev/vpc"),
+            self._get_stack("dev/network"),
+            self._get_stack("dev/app")
+        ]
+        dependencies = {
+            "dev/a": [],
+            "dev/b": [],
+            "dev/c": [],
+            "dev/vpc": [],
+            "dev/network": ["dev/vpc"],
+            "dev/app": ["dev/network"]
+        }
+
+        self._run(stacks, dependencies, max_concurrency=1)
+
+        assert self.calls[0] == "dev/vpc"
+
+    def test_run_records_observed_durations_of_complete_stacks(self):
+        stacks = [
+            self._get_stack("dev/vpc"),
+            self._get_stack("dev/app", StackStatus.FAILED)
+        ]
+        scheduler = StackScheduler(
+            stacks={stack.name: stack for stack in stacks},
+            dependencies={}
+        )
+        scheduler.run("launch", {})
+
+        assert list(scheduler.observed_durations) == ["dev/vpc"]
+
+    def test_plan_without_durations(self):
+        scheduler = StackScheduler(
+            stacks={"vpc": Mock(), "app": Mock(), "db": Mock(),
+                    "dns": Mock()},
+            dependencies={"vpc": [], "app": ["vpc"], "db": ["vpc"],
+                          "dns": []}
+        )
+        assert scheduler.plan() == {
+            "stacks": 4,
+            "waves": [["dns", "vpc"], ["app", "db"]],
+            "critical_path": ["vpc", "app"],
+            "max_parallelism": 2,
+            "max_concurrency": 4,
+            "estimated_duration": None
+        }
+
+    def test_plan_estimates_duration_at_max_concurrency(self):
+        scheduler = StackScheduler(
+            stacks={"vpc": Mock(), "app": Mock(), "db": Mock()},
+            dependencies={"vpc": [], "app": ["vpc"], "db": ["vpc"]},
+            max_concurrency=1,
+            durations={"vpc": 10.0, "app": 20.0, "db": 5.0}
+        )
+        plan = scheduler.plan()
+
+        assert plan["critical_path"] == ["vpc", "app"]
+        assert plan["max_parallelism"] == 2
+        assert plan["estimated_duration"] == 35.0
+
+    def test_run_with_stop_dispatch_starts_no_further_stacks(self):
+        stacks = [
+            self._get_stack("dev/vpc", StackStatus.FAILED),
+            self._get_stack("dev/dns"),
+            self._get_stack("dev/app")
+        ]
+        dependencies = {"dev/vpc": [], "dev/dns": [], "dev/app": []}
+        stack_statuses = {stack.name: StackStatus.PENDING for stack in stacks}
+        scheduler = StackScheduler(
+            stacks={stack.name: stack for stack in stacks},
+            dependencies=dependencies,
+            max_concurrency=1,
+            durations={"dev/vpc": 10.0, "dev/dns": 1.0, "dev/app": 1.0},
+            on_failure=FailurePolicy.STOP_DISPATCH
+        )
+
+        response = scheduler.run("launch", stack_statuses)
+
+        assert self.calls == ["dev/vpc"]
+        assert response == {
+            "dev/vpc": StackStatus.FAILED,
+            "dev/dns": StackStatus.PENDING,
+            "dev/app": StackStatus.PENDING
+        }
+
+    def test_run_with_cancel_in_flight_cancels_running_stacks(self):
+        started = threading.Event()
+        cancelled = threading.Event()
+
+        slow_stack = Mock()
+        slow_stack.name = "dev/app"
+        slow_stack.updating = True
+
+        def launch():
+            started.set()
+            cancelled.wait(5)
+            return StackStatus.FAILED
+
+        slow_stack.launch.side_effect = launch
+        slow_stack.cancel_update.side_effect = cancelled.set
+
+        failing_stack = Mock()
+        failing_stack.name = "dev/vpc"
+
+        def fail():
+            started.wait(5)
+            return StackStatus.FAILED
+
+        failing_stack.launch.side_effect = fail
+
+        response = self._run(
+            [slow_stack, failing_stack],
+            {"dev/app": [], "dev/vpc": []},
+            on_failure=FailurePolicy.CANCEL_IN_FLIGHT
+        )
+
+        slow_stack.cancel_update.assert_called_once_with()
+        assert response == {
+            "dev/app": StackStatus.FAILED,
+            "dev/vpc": StackStatus.FAILED
+        }
+
+    def test_run_with_cancel_in_flight_skips_stacks_not_updating(self):
+        started = threading.Event()
+        failed = threading.Event()
+
+        creating_stack = Mock()
+        creating_stack.name = "dev/app"
+        creating_stack.updating = False
+
+        def launch():
+            started.set()
+            failed.wait(5)
+            return StackStatus.COMPLETE
+
+        creating_stack.launch.side_effect = launch
+
+        failing_stack = Mock()
+        failing_stack.name = "dev/vpc"
+
+        def fail():
+            started.wait(5)
+            failed.set()
+            return StackStatus.FAILED
+
+        failing_stack.launch.side_effect = fail
+
+        response = self._run(
+            [creating_stack, failing_stack],
+            {"dev/app": [], "dev/vpc": []},
+            on_failure=FailurePolicy.CANCEL_IN_FLIGHT
+        )
+
+        creating_stack.cancel_update.assert_not_called()
+        assert response == {
+            "dev/app": StackStatus.COMPLETE,
+            "dev/vpc": StackStatus.FAILED
+        }
+
+    def test_handle_failure_logs_cancel_errors(self):
+        updating_stack = Mock()
+        updating_stack.name = "dev/app"
+        updating_stack.updating = True
+        updating_stack.cancel_update.side_effect = ValueError("Boom!")
+        scheduler = StackScheduler(
+            stacks={"dev/app": updating_stack},
+            dependencies={"dev/app": []},
+            on_failure=FailurePolicy.CANCEL_IN_FLIGHT
+        )
+        scheduler._stopped = False
+
+        scheduler._handle_failure("dev/vpc", ["dev/app"])
+
+        updating_stack.cancel_update.assert_called_once_with()
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+
+from mock import patch
+
+from sceptre.config_cache import ConfigFileCache
+from sceptre.environment import Environment
+from sceptre.plugins import PluginRegistry
+from sceptre.snapshot import ProjectSnapshot
+
+
+class TestProjectSnapshot(object):
+
+    def setup_method(self, test_method):
+        self.sceptre_dir = tempfile.mkdtemp()
+        self.write("config/config.yaml", "project_code: prj\nregion: r\n")
+        self.write("config/dev/vpc.yaml", "template_path: vpc.json\n")
+        self.write(
+            "config/dev/subnets.yaml",
+            "template_path: subnets.json\ndependencies:\n  - dev/vpc\n"
+        )
+        self.snapshot = ProjectSnapshot(self.sceptre_dir)
+
+        self.config_file_cache = ConfigFileCache()
+        self.plugin_registry = PluginRegistry()
+        self.patchers = [
+            patch(
+                "sceptre.config.config_file_cache", self.config_file_cache
+            ),
+            patch(
+                "sceptre.snapshot.config_file_cache", self.config_file_cache
+            ),
+            patch("sceptre.config.plugin_registry", self.plugin_registry),
+            patch("sceptre.snapshot.plugin_registry", self.plugin_registry)
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def teardown_method(self, test_method):
+        for patcher in self.patchers:
+            patcher.stop()
+        shutil.rmtree(self.sceptre_dir)
+
+    def write(self, path, content):
+        path = os.path.join(self.sceptre_dir, path)
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with open(path, "w") as config_file:
+            config_file.write(content)
+
+    def compile(self):
+        response = Environment(self.sceptre_dir, "dev").compile()
+        self.config_file_cache.clear()
+        self.plugin_registry.clear()
+        return response
+
+    def test_compile_writes_snapshot(self):
+        response = self.compile()
+
+        assert os.path.isfile(self.snapshot.path)
+        assert response["environment"] == "dev"
+        assert response["dependencies"] == {
+            "dev/vpc": [], "dev/subnets": ["dev/vpc"]
+        }
+        assert "stack_output" in response["plugins"]
+
+    def test_compile_does_not_write_environment_variables(self):
+        self.write(
+            "config/dev/config.yaml",
+            "home: {{ environment_variable.HOME }}\n"
+        )
+
+        with patch.dict(os.environ, {"SUPER_SECRET_TOKEN": "hunter2xyz"}):
+            self.compile()
+
+        with open(self.snapshot.path, "rb") as snapshot_file:
+            assert b"hunter2xyz" not in snapshot_file.read()
+        assert self.snapshot.load("dev") is not None
+        assert not any(
+            key[0].endswith(os.path.join("dev", "config.yaml"))
+            for key in self.config_file_cache.get_entries()["nodes"]
+        )
+
+    def test_compile_does_not_write_user_variables_from_includes(self):
+        self.write("config/dev/config.yaml", "{% include 'name.j2' %}\n")
+        self.write("config/dev/name.j2", "name: {{ var.name }}\n")
+
+        Environment(
+            self.sceptre_dir, "dev", options={"user_variables": {"name": "a"}}
+        ).compile()
+
+        assert not any(
+            key[0].endswith(os.path.join("dev", "config.yaml"))
+            for key in self.config_file_cache.get_entries()["nodes"]
+        )
+
+    def test_compile_with_unwritable_cache_dir(self):
+        self.write(".sceptre", "not a directory")
+
+        response = self.compile()
+
+        assert response["snapshot"] is None
+        assert self.snapshot.load("dev") is None
+
+    def test_load_restores_caches(self):
+        self.compile()
+
+        config_index = self.snapshot.load("dev")
+
+        assert config_index.get_stack_names("dev") == [
+            "dev/subnets", "dev/vpc"
+        ]
+        assert self.config_file_cache.get_entries()["nodes"]
+        with patch("sceptre.plugins.get_subclasses") as mock_get_subclasses:
+            stacks = Environment(
+                self.sceptre_dir, "dev", config_index=config_index
+            ).stacks
+            assert stacks["subnets"].dependencies == {"dev/vpc"}
+        mock_get_subclasses.assert_not_called()
+
+    def test_load_with_touched_file(self):
+        self.compile()
+        os.utime(
+            os.path.join(self.sceptre_dir, "config", "dev", "vpc.yaml"),
+            (1, 1)
+        )
+
+        assert self.snapshot.load("dev") is not None
+
+    def test_load_with_touched_included_file(self):
+        self.write("config/dev/config.yaml", "{% include 'name.j2' %}\n")
+        self.write("config/dev/name.j2", "name: a\n")
+        self.compile()
+        os.utime(
+            os.path.join(self.sceptre_dir, "config", "dev", "name.j2"), (1, 1)
+        )
+
+        assert self.snapshot.load("dev") is not None
+        key, = [
+            key for key in self.config_file_cache.get_entries()["nodes"]
+            if key[0].endswith(os.path.join("dev", "config.yaml"))
+        ]
+        assert key[6][0][1] == 1
+
+    def test_load_with_changed_file(self):
+        self.compile()
+        self.write("config/dev/vpc.yaml", "template_path: other.json\n")
+
+        assert self.snapshot.load("dev") is None
+
+    def test_load_with_new_stack(self):
+        self.compile()
+        self.write("config/dev/sg.yaml", "template_path: sg.json\n")
+
+        assert self.snapshot.load("dev") is None
+
+    def test_load_with_other_environment(self):
+        self.compile()
+
+        assert self.snapshot.load("prod") is None
+
+    def test_load_without_snapshot(self):
+        assert self.snapshot.load("dev") is None
@@ -11,6 +11,7 @@ from botocore.exceptions import ClientError
 from sceptre.config import Config
 from sceptre.stack import Stack
 from sceptre.template import Template
+from sceptre.wait import WaitStrategy
 from sceptre.stack_status import StackStatus
 from sceptre.stack_status import StackChangeSetStatus
 from sceptre.exceptions import CannotUpdateFailedStackError
@@ -18,6 +19,7 @@ from sceptre.exceptions import UnknownStackStatusError
 from sceptre.exceptions import UnknownStackChangeSetStatusError
 from sceptre.exceptions import StackDoesNotExistError
 from sceptre.exceptions import ProtectedStackError
+from sceptre.exceptions import StackTimeoutError
 
 
 class TestStack(object):
@@ -145,24 +147,79 @@ environment_config={'key': 'val'}, connection_manager=connection_manager)"
         self.stack._hooks = sentinel.hooks
         assert self.stack.hooks == sentinel.hooks
 
+    @patch("sceptre.stack.RenderCache")
     @patch("sceptre.stack.Template")
-    def test_template_loads_template(self, mock_Template):
+    def test_template_loads_template(self, mock_Template, mock_RenderCache):
         self.stack._template = None
         self.stack.environment_config.sceptre_dir = "sceptre_dir"
+        self.stack.environment_config.get.side_effect = \
+            lambda key, default=None: default
         self.stack._config = {
             "template_path": "template_path",
             "sceptre_user_data": sentinel.sceptre_user_data
         }
         mock_Template.return_value = sentinel.template
+        mock_RenderCache.return_value = sentinel.render_cache
 
         response = self.stack.template
 
+        mock_RenderCache.assert_called_once_with("sceptre_dir/.sceptre")
         mock_Template.assert_called_once_with(
             path="sceptre_dir/template_path",
-            sceptre_user_data=sentinel.sceptre_user_data
+            sceptre_user_data=sentinel.sceptre_user_data,
+            cache_dir="sceptre_dir/.sceptre",
+            render_cache=sentinel.render_cache,
+            render_pool=None
         )
         assert response == sentinel.template
 
+    @patch("sceptre.stack.Template")
+    def test_template_without_render_cache(self, mock_Template):
+        self.stack._template = None
+        self.stack.environment_config.sceptre_dir = "sceptre_dir"
+        self.stack.environment_config.get.side_effect = \
+            lambda key, default=None: False
+        self.stack._config = {
+            "template_path": "template_path",
+            "sceptre_user_data": sentinel.sceptre_user_data
+        }
+
+        self.stack.template
+
+        assert mock_Template.call_args[1]["render_cache"] is None
+
+    @patch("sceptre.stack.get_render_pool")
+    @patch("sceptre.stack.Template")
+    def test_template_with_render_processes(
+        self, mock_Template, mock_get_render_pool
+    ):
+        self.stack._template = None
+        self.stack.environment_config.sceptre_dir = "sceptre_dir"
+        self.stack.environment_config.get.side_effect = \
+            lambda key, default=None: 4 if key == "render_processes" else False
+        self.stack.environment_config.__getitem__.side_effect = None
+        self.stack.environment_config.__getitem__.return_value = 4
+        self.stack._config = {
+            "template_path": "template_path",
+            "sceptre_user_data": sentinel.sceptre_user_data
+        }
+        mock_get_render_pool.return_value = sentinel.render_pool
+
+        self.stack.template
+
+        mock_get_render_pool.assert_called_once_with(4)
+        assert mock_Template.call_args[1]["render_pool"] == \
+            sentinel.render_pool
+
+    def test_use_rendered_template(self):
+        self.stack.environment_config.sceptre_dir = "sceptre_dir"
+        self.stack._config = {"template_path": "template_path"}
+
+        self.stack.use_rendered_template(sentinel.body)
+
+        assert self.stack.template.path == "sceptre_dir/template_path"
+        assert self.stack.template.body == sentinel.body
+
     def test_template_returns_template_if_it_exists(self):
         self.stack._template = sentinel.template
         response = self.stack.template
@@ -225,12 +282,14 @@ environment_config={'key': 'val'}, connection_manager=connection_manager)"
         )
         mock_wait_for_completion.assert_called_once_with()
 
+    @patch("sceptre.stack.Stack._start_event_stream")
     @patch("sceptre.stack.Stack._format_parameters")
     @patch("sceptre.stack.Stack._wait_for_completion")
     @patch("sceptre.stack.Stack._get_template_details")
     def test_update_sends_correct_request(
         self, mock_get_template_details,
-        mock_wait_for_completion, mock_format_params
+        mock_wait_for_completion, mock_format_params,
+        mock_start_event_stream
     ):
         mock_format_params.return_value = sentinel.parameters
         mock_get_template_details.return_value = {
@@ -263,6 +322,27 @@ environment_config={'key': 'val'}, connection_manager=connection_manager)"
         )
         mock_wait_for_completion.assert_called_once_with()
 
+    @patch("sceptre.stack.Stack._start_event_stream")
+    @patch("sceptre.stack.Stack._format_parameters")
+    @patch("sceptre.stack.Stack._wait_for_completion")
+    @patch("sceptre.stack.Stack._get_template_details")
+    def test_update_is_updating_while_waiting(
+        self, mock_get_template_details,
+        mock_wait_for_completion, mock_format_params,
+        mock_start_event_stream
+    ):
+        mock_get_template_details.return_value = {}
+        self.stack._config = {}
+        updating = []
+        mock_wait_for_completion.side_effect = \
+            lambda: updating.append(self.stack.updating)
+
+        assert self.stack.updating is False
+        self.stack.update()
+
+        assert updating == [True]
+        assert self.stack.updating is False
+
     @patch("sceptre.stack.Stack.hooks")
     @patch("sceptre.stack.Stack.create")
     @patch("sceptre.stack.Stack.get_status")
@@ -372,11 +452,13 @@ environment_config={'key': 'val'}, connection_manager=connection_manager)"
         with pytest.raises(UnknownStackStatusError):
             self.stack.launch()
 
+    @patch("sceptre.stack.Stack._start_event_stream")
     @patch("sceptre.stack.Stack._wait_for_completion")
     @patch("sceptre.stack.Stack.hooks")
     @patch("sceptre.stack.Stack.get_status")
     def test_delete_with_created_stack(
-            self, mock_get_status, mock_hooks, mock_wait_for_completion
+            self, mock_get_status, mock_hooks, mock_wait_for_completion,
+            mock_start_event_stream
     ):
         self.stack._config = {"protect": False}
         mock_get_status.return_value = "CREATE_COMPLETE"
@@ -391,11 +473,13 @@ environment_config={'key': 'val'}, connection_manager=connection_manager)"
             }
         )
 
+    @patch("sceptre.stack.Stack._start_event_stream")
     @patch("sceptre.stack.Stack._wait_for_completion")
     @patch("sceptre.stack.Stack.hooks")
     @patch("sceptre.stack.Stack.get_status")
     def test_delete_when_wait_for_completion_raises_stack_does_not_exist_error(
-            self, mock_get_status, mock_hooks, mock_wait_for_completion
+            self, mock_get_status, mock_hooks, mock_wait_for_completion,
+            mock_start_event_stream
     ):
         self.stack._config = {"protect": False}
         mock_get_status.return_value = "CREATE_COMPLETE"
@@ -404,11 +488,13 @@ environment_config={'key': 'val'}, connection_manager=connection_manager)"
         status = self.stack.delete()
         assert status == StackStatus.COMPLETE
 
+    @patch("sceptre.stack.Stack._start_event_stream")
     @patch("sceptre.stack.Stack._wait_for_completion")
     @patch("sceptre.stack.Stack.hooks")
     @patch("sceptre.stack.Stack.get_status")
     def test_delete_when_wait_for_completion_raises_non_existent_client_error(
-            self, mock_get_status, mock_hooks, mock_wait_for_completion
+            self, mock_get_status, mock_hooks, mock_wait_for_completion,
+            mock_start_event_stream
     ):
         self.stack._config = {"protect": False}
         mock_get_status.return_value = "CREATE_COMPLETE"
@@ -425,11 +511,13 @@ environment_config={'key': 'val'}, connection_manager=connection_manager)"
         status = self.stack.delete()
         assert status == StackStatus.COMPLETE
 
+    @patch("sceptre.stack.Stack._start_event_stream")
     @patch("sceptre.stack.Stack._wait_for_completion")
     @patch("sceptre.stack.Stack.hooks")
     @patch("sceptre.stack.Stack.get_status")
     def test_delete_when_wait_for_completion_raises_unexpected_client_error(
-            self, mock_get_status, mock_hooks, mock_wait_for_completion
+            self, mock_get_status, mock_hooks, mock_wait_for_completion,
+            mock_start_event_stream
     ):
         self.stack._config = {"protect": False}
         mock_get_status.return_value = "CREATE_COMPLETE"
@@ -532,6 +620,27 @@ environment_config={'key': 'val'}, connection_manager=connection_manager)"
             }
         )
 
+    def test_cancel_update_sends_correct_request(self):
+        assert self.stack.cancel_update() is True
+        self.stack.connection_manager.call.assert_called_with(
+            service="cloudformation",
+            command="cancel_update_stack",
+            kwargs={"StackName": sentinel.external_name}
+        )
+
+    def test_cancel_update_when_stack_is_not_updating(self):
+        self.stack.connection_manager.call.side_effect = ClientError(
+            {
+                "Error": {
+                    "Code": "ValidationError",
+                    "Message": "CancelUpdateStack cannot be called from "
+                               "current stack status"
+                }
+            },
+            sentinel.operation
+        )
+        assert self.stack.cancel_update() is False
+
     def test_set_stack_policy_sends_correct_request(self):
         self.stack.set_policy("tests/fixtures/stack_policies/unlock.json")
         self.stack.connection_manager.call.assert_called_with(
@@ -637,9 +746,10 @@ environment_config={'key': 'val'}, connection_manager=connection_manager)"
             }
         )
 
+    @patch("sceptre.stack.Stack._start_event_stream")
     @patch("sceptre.stack.Stack._wait_for_completion")
     def test_execute_change_set_sends_correct_request(
-        self, mock_wait_for_completion
+        self, mock_wait_for_completion, mock_start_event_stream
     ):
         self.stack._config = {"protect": False}
         self.stack.execute_change_set(sentinel.change_set_name)
@@ -775,6 +885,30 @@ environment_config={'key': 'val'}, connection_manager=connection_manager)"
         status = self.stack.get_status()
         assert status == "CREATE_COMPLETE"
 
+    def _set_fingerprint_state(self, body="body", dependencies=None):
+        self.stack._external_name = "prj-stack"
+        self.stack.region = "eu-west-1"
+        self.stack._template = Mock(spec=Template)
+        self.stack._template.body = body
+        self.stack._parameters = {"b": "2", "a": "1"}
+        self.stack._config = {"stack_tags": {"tag": "value"}}
+        self.mock_connection_manager.iam_role = None
+        return self.stack.get_fingerprint(dependencies)
+
+    def test_get_fingerprint_is_stable(self):
+        fingerprint = self._set_fingerprint_state()
+        assert len(fingerprint) == 64
+        assert self._set_fingerprint_state() == fingerprint
+
+    def test_get_fingerprint_changes_with_template_body(self):
+        assert self._set_fingerprint_state("body") != \
+            self._set_fingerprint_state("other body")
+
+    def test_get_fingerprint_changes_with_dependency_fingerprints(self):
+        assert self._set_fingerprint_state(
+            dependencies={"dev/vpc": "a"}
+        ) != self._set_fingerprint_state(dependencies={"dev/vpc": "b"})
+
     @patch("sceptre.stack.Stack.describe")
     def test_get_status_with_non_existent_stack(self, mock_describe):
         mock_describe.side_effect = ClientError(
@@ -817,8 +951,6 @@ environment_config={'key': 'val'}, connection_manager=connection_manager)"
             self.stack.region,
             sentinel.template_bucket_name,
             sentinel.template_key_prefix,
-            self.stack._environment_path,
-            sentinel.external_name,
             self.stack.connection_manager
         )
 
@@ -865,6 +997,43 @@ environment_config={'key': 'val'}, connection_manager=connection_manager)"
         with pytest.raises(ProtectedStackError):
             self.stack._protect_execution()
 
+    @patch("sceptre.stack.StackEventStream")
+    def test_start_event_stream_skips_existing_events(
+            self, mock_event_stream
+    ):
+        self.stack._start_event_stream()
+
+        assert self.stack.event_stream == mock_event_stream.return_value
+        mock_event_stream.return_value.skip_existing.assert_called_once_with()
+
+    @patch("sceptre.stack.StackEventStream")
+    def test_start_event_stream_for_new_stack(self, mock_event_stream):
+        self.stack._start_event_stream(existing=False)
+
+        mock_event_stream.return_value.skip_existing.assert_not_called()
+
+    @patch("sceptre.stack.time")
+    @patch("sceptre.stack.StackEventStream")
+    def test_wait_for_completion_reads_started_event_stream(
+            self, mock_event_stream, mock_time
+    ):
+        self.stack._external_name = "prj-stack-name"
+        event_stream = Mock()
+        event_stream.read.return_value = iter([{
+            "Timestamp": datetime.datetime(2016, 3, 15, 14, 2, 0, 0),
+            "LogicalResourceId": "prj-stack-name",
+            "ResourceType": "AWS::CloudFormation::Stack",
+            "ResourceStatus": "UPDATE_COMPLETE"
+        }])
+        self.stack.event_stream = event_stream
+        self.stack._config = {}
+
+        status = self.stack._wait_for_completion()
+
+        assert status == StackStatus.COMPLETE
+        mock_event_stream.assert_not_called()
+        assert self.stack.event_stream is None
+
     @patch("sceptre.stack.time")
     @patch("sceptre.stack.Stack._log_new_events")
     @patch("sceptre.stack.Stack.get_status")
@@ -874,10 +1043,127 @@ environment_config={'key': 'val'}, connection_manager=connection_manager)"
             mock_log_new_events, mock_time
     ):
         mock_get_simplified_status.return_value = StackStatus.COMPLETE
+        self.stack._config = {}
 
         self.stack._wait_for_completion()
         mock_log_new_events.assert_called_once_with()
 
+    @patch("sceptre.stack.time")
+    @patch("sceptre.stack.Stack._log_new_events")
+    @patch("sceptre.stack.Stack.get_status")
+    def test_wait_for_completion_uses_status_from_stack_events(
+            self, mock_get_status, mock_log_new_events, mock_time
+    ):
+        self.stack._wait_strategy = WaitStrategy(jitter=0)
+        mock_log_new_events.side_effect = [
+            "UPDATE_IN_PROGRESS", None, "UPDATE_COMPLETE"
+        ]
+
+        status = self.stack._wait_for_completion()
+
+        assert status == StackStatus.COMPLETE
+        assert mock_get_status.call_count == 0
+        assert [call[0][0] for call in mock_time.sleep.call_args_list] == [
+            1, 1.5, 2.25
+        ]
+
+    @patch("sceptre.stack.time")
+    @patch("sceptre.stack.Stack._log_new_events")
+    @patch("sceptre.stack.Stack.get_status")
+    def test_wait_for_completion_describes_stack_without_stack_events(
+            self, mock_get_status, mock_log_new_events, mock_time
+    ):
+        self.stack._wait_strategy = WaitStrategy()
+        mock_log_new_events.return_value = None
+        mock_get_status.return_value = "CREATE_FAILED"
+
+        status = self.stack._wait_for_completion()
+
+        assert status == StackStatus.FAILED
+        mock_get_status.assert_called_once_with()
+
+    @patch("sceptre.stack.time")
+    @patch("sceptre.stack.Stack._log_new_events")
+    def test_wait_for_completion_raises_after_timeout(
+            self, mock_log_new_events, mock_time
+    ):
+        self.stack._wait_strategy = WaitStrategy(timeout=60)
+        mock_log_new_events.return_value = "CREATE_IN_PROGRESS"
+        mock_time.time.side_effect = [0, 30, 61]
+
+        with pytest.raises(StackTimeoutError):
+            self.stack._wait_for_completion()
+
+    @patch("sceptre.stack.Stack._log_new_events")
+    def test_wait_for_completion_with_status_poller(
+            self, mock_log_new_events
+    ):
+        self.stack._wait_strategy = WaitStrategy(timeout=60)
+        self.stack.status_poller = Mock()
+        self.stack.status_poller.tick = 0
+        self.stack.status_poller.wait_for_tick.return_value = 1
+        future = self.stack.status_poller.watch.return_value
+        future.done.return_value = True
+        future.result.return_value = "UPDATE_ROLLBACK_COMPLETE"
+
+        status = self.stack._wait_for_completion()
+
+        assert status == StackStatus.FAILED
+        self.stack.status_poller.watch.assert_called_once_with(self.stack)
+        self.stack.status_poller.unwatch.assert_called_once_with(
+            self.stack, future
+        )
+        mock_log_new_events.assert_called_once_with()
+
+    @patch("sceptre.stack.Stack._log_new_events")
+    def test_wait_for_completion_with_status_poller_reads_events_rarely(
+            self, mock_log_new_events
+    ):
+        self.stack._wait_strategy = WaitStrategy(timeout=60)
+        self.stack.status_poller = Mock()
+        self.stack.status_poller.tick = 3
+        self.stack.status_poller.event_ticks = 2
+        self.stack.status_poller.wait_for_tick.side_effect = [4, 5, 6, 7]
+        future = self.stack.status_poller.watch.return_value
+        future.done.side_effect = [False, False, False, True]
+        future.result.return_value = "UPDATE_COMPLETE"
+
+        status = self.stack._wait_for_completion()
+
+        assert status == StackStatus.COMPLETE
+        assert mock_log_new_events.call_count == 2
+        assert [
+            call[0][0] for call in
+            self.stack.status_poller.wait_for_tick.call_args_list
+        ] == [3, 4, 5, 6]
+
+    @patch("sceptre.stack.time")
+    @patch("sceptre.stack.Stack._log_new_events")
+    def test_wait_for_completion_with_status_poller_raises_after_timeout(
+            self, mock_log_new_events, mock_time
+    ):
+        self.stack._wait_strategy = WaitStrategy(timeout=60)
+        self.stack.status_poller = Mock()
+        self.stack.status_poller.tick = 0
+        self.stack.status_poller.event_ticks = 12
+        self.stack.status_poller.wait_for_tick.return_value = 1
+        future = self.stack.status_poller.watch.return_value
+        future.done.return_value = False
+        mock_time.time.side_effect = [0, 30, 61]
+
+        with pytest.raises(StackTimeoutError):
+            self.stack._wait_for_completion()
+        self.stack.status_poller.unwatch.assert_called_once_with(
+            self.stack, future
+        )
+
+    def test_wait_strategy_is_read_from_config(self):
+        self.stack._config = {"wait": {"max_delay": 5, "timeout": 600}}
+
+        assert self.stack.wait_strategy.max_delay == 5
+        assert self.stack.wait_strategy.timeout == 600
+        assert self.stack.wait_strategy.initial_delay == 1
+
     @pytest.mark.parametrize("test_input,expected", [
         ("ROLLBACK_COMPLETE", StackStatus.FAILED),
         ("STACK_COMPLETE", StackStatus.COMPLETE),
@@ -894,42 +1180,59 @@ environment_config={'key': 'val'}, connection_manager=connection_manager)"
         with pytest.raises(UnknownStackStatusError):
             self.stack._get_simplified_status("UNKOWN_STATUS")
 
-    @patch("sceptre.stack.Stack.describe_events")
-    def test_log_new_events_calls_describe_events(self, mock_describe_events):
-        mock_describe_events.return_value = {
-            "StackEvents": []
-        }
-        self.stack._log_new_events()
-        self.stack.describe_events.assert_called_once_with()
+    def test_log_new_events_reads_event_stream(self):
+        self.stack.event_stream = Mock()
+        self.stack.event_stream.read.return_value = iter([])
 
-    @patch("sceptre.stack.Stack.describe_events")
-    def test_log_new_events_prints_correct_event(self, mock_describe_events):
-        mock_describe_events.return_value = {
-            "StackEvents": [
-                {
-                    "Timestamp": datetime.datetime(
-                        2016, 3, 15, 14, 2, 0, 0, tzinfo=tzutc()
-                    ),
-                    "LogicalResourceId": "id-2",
-                    "ResourceType": "type-2",
-                    "ResourceStatus": "resource-status"
-                },
-                {
-                    "Timestamp": datetime.datetime(
-                        2016, 3, 15, 14, 1, 0, 0, tzinfo=tzutc()
-                    ),
-                    "LogicalResourceId": "id-1",
-                    "ResourceType": "type-1",
-                    "ResourceStatus": "resource",
-                    "ResourceStatusReason": "User Initiated"
-                }
-            ]
-        }
-        self.stack.most_recent_event_datetime = (
-            datetime.datetime(2016, 3, 15, 14, 0, 0, 0, tzinfo=tzutc())
-        )
+        assert self.stack._log_new_events() is None
+        self.stack.event_stream.read.assert_called_once_with()
+
+    def test_log_new_events_prints_correct_event(self):
+        self.stack.event_stream = Mock()
+        self.stack.event_stream.read.return_value = iter([
+            {
+                "Timestamp": datetime.datetime(
+                    2016, 3, 15, 14, 1, 0, 0, tzinfo=tzutc()
+                ),
+                "LogicalResourceId": "id-1",
+                "ResourceType": "type-1",
+                "ResourceStatus": "resource",
+                "ResourceStatusReason": "User Initiated"
+            },
+            {
+                "Timestamp": datetime.datetime(
+                    2016, 3, 15, 14, 2, 0, 0, tzinfo=tzutc()
+                ),
+                "LogicalResourceId": "id-2",
+                "ResourceType": "type-2",
+                "ResourceStatus": "resource-status"
+            }
+        ])
         self.stack._log_new_events()
 
+    def test_log_new_events_returns_latest_stack_event_status(self):
+        def event(minute, logical_resource_id, resource_type, status):
+            return {
+                "Timestamp": datetime.datetime(
+                    2016, 3, 15, 14, minute, 0, 0, tzinfo=tzutc()
+                ),
+                "LogicalResourceId": logical_resource_id,
+                "ResourceType": resource_type,
+                "ResourceStatus": status
+            }
+
+        self.stack.event_stream = Mock()
+        self.stack.event_stream.read.return_value = iter([
+            event(2, "prj-stack", "AWS::CloudFormation::Stack",
+                  "CREATE_COMPLETE"),
+            event(3, "prj-stack", "AWS::CloudFormation::Stack",
+                  "UPDATE_IN_PROGRESS"),
+            event(4, "Bucket", "AWS::S3::Bucket", "CREATE_COMPLETE")
+        ])
+        self.stack._external_name = "prj-stack"
+
+        assert self.stack._log_new_events() == "UPDATE_IN_PROGRESS"
+
     @patch("sceptre.stack.time")
     @patch("sceptre.stack.Stack._get_cs_status")
     def test_wait_for_cs_completion_calls_get_cs_status(
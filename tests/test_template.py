@@ -1,14 +1,16 @@
 # -*- coding: utf-8 -*-
 
+import hashlib
 import json
 import yaml
 import os
+import shutil
+import tempfile
 import threading
 
 import pytest
 from mock import patch, sentinel, Mock
 
-from freezegun import freeze_time
 from botocore.exceptions import ClientError
 
 import sceptre.template
@@ -33,6 +35,10 @@ class TestTemplate(object):
             path="/folder/template.py",
             sceptre_user_data={}
         )
+        Template._verified_buckets.clear()
+        Template._bucket_locks.clear()
+        Template._uploaded_keys.clear()
+        Template._upload_locks.clear()
 
     def test_initialise_template(self):
         assert self.template.path == "/folder/template.py"
@@ -51,27 +57,30 @@ class TestTemplate(object):
         body = self.template.body
         assert body == sentinel.body
 
-    @freeze_time("2012-01-01")
     @patch("sceptre.template.Template._bucket_exists")
     def test_upload_to_s3_with_valid_arguments(self, mock_bucket_exists):
         self.template._body = '{"template": "mock"}'
         mock_bucket_exists.return_value = True
+        self.connection_manager.call.side_effect = [
+            ClientError(
+                {"Error": {"Code": "404", "Message": "Not Found"}},
+                sentinel.operation
+            ),
+            None
+        ]
 
         url = self.template.upload_to_s3(
             region="eu-west-1",
             bucket_name="bucket-name",
             key_prefix="/prefix/",
-            environment_path="environment/path",
-            stack_name="stack-name",
             connection_manager=self.connection_manager
         )
 
-        expected_template_key = (
-            "prefix/eu-west-1/environment/path/"
-            "stack-name-2012-01-01-00-00-00-000000Z.json"
+        expected_template_key = "prefix/eu-west-1/{0}.json".format(
+            hashlib.sha256(b'{"template": "mock"}').hexdigest()
         )
 
-        self.connection_manager.call.assert_called_once_with(
+        self.connection_manager.call.assert_called_with(
             service="s3",
             command="put_object",
             kwargs={
@@ -86,6 +95,100 @@ class TestTemplate(object):
             expected_template_key
         )
 
+    @patch("sceptre.template.Template._bucket_exists")
+    def test_upload_to_s3_with_existing_object(self, mock_bucket_exists):
+        self.template._body = '{"template": "mock"}'
+        mock_bucket_exists.return_value = True
+
+        self.template.upload_to_s3(
+            "eu-west-1", "bucket-name", "prefix", self.connection_manager
+        )
+
+        self.connection_manager.call.assert_called_once_with(
+            service="s3",
+            command="head_object",
+            kwargs={
+                "Bucket": "bucket-name",
+                "Key": "prefix/eu-west-1/{0}.json".format(
+                    hashlib.sha256(b'{"template": "mock"}').hexdigest()
+                )
+            }
+        )
+
+    @patch("sceptre.template.Template._bucket_exists")
+    def test_upload_to_s3_uploads_identical_templates_once(
+        self, mock_bucket_exists
+    ):
+        mock_bucket_exists.return_value = True
+        self.connection_manager.call.side_effect = [
+            ClientError(
+                {"Error": {"Code": "404", "Message": "Not Found"}},
+                sentinel.operation
+            ),
+            None
+        ]
+        other_template = Template("/folder/other.py", {})
+        self.template._body = other_template._body = '{"template": "mock"}'
+
+        urls = [
+            template.upload_to_s3(
+                "eu-west-1", "bucket-name", "prefix", self.connection_manager
+            )
+            for template in [self.template, other_template]
+        ]
+
+        assert urls[0] == urls[1]
+        assert self.connection_manager.call.call_count == 2
+
+    @patch("sceptre.template.Template._create_bucket")
+    @patch("sceptre.template.Template._bucket_exists")
+    def test_ensure_bucket_verifies_bucket_once(
+        self, mock_bucket_exists, mock_create_bucket
+    ):
+        mock_bucket_exists.return_value = False
+
+        for _ in range(2):
+            self.template._ensure_bucket(
+                "eu-west-1", "bucket-name", self.connection_manager
+            )
+
+        mock_bucket_exists.assert_called_once_with(
+            "bucket-name", self.connection_manager
+        )
+        mock_create_bucket.assert_called_once_with(
+            "eu-west-1", "bucket-name", self.connection_manager
+        )
+
+    @patch("sceptre.template.Template._bucket_exists")
+    def test_ensure_bucket_verifies_each_region(self, mock_bucket_exists):
+        mock_bucket_exists.return_value = True
+
+        for region in ["eu-west-1", "us-east-1"]:
+            self.template._ensure_bucket(
+                region, "bucket-name", self.connection_manager
+            )
+
+        assert mock_bucket_exists.call_count == 2
+
+    def test_object_exists_with_unreadable_object(self):
+        self.connection_manager.call.side_effect = ClientError(
+            {"Error": {"Code": "403", "Message": "Forbidden"}},
+            sentinel.operation
+        )
+        assert self.template._object_exists(
+            "bucket-name", "key", self.connection_manager
+        ) is False
+
+    def test_object_exists_with_other_error(self):
+        self.connection_manager.call.side_effect = ClientError(
+            {"Error": {"Code": "500", "Message": "Internal Error"}},
+            sentinel.operation
+        )
+        with pytest.raises(ClientError):
+            self.template._object_exists(
+                "bucket-name", "key", self.connection_manager
+            )
+
     def test_bucket_exists_with_bucket_that_exists(self):
         # connection_manager.call doesn't raise an exception, mimicing the
         # behaviour when head_bucket successfully executes.
@@ -305,3 +408,156 @@ def test_render_jinja_template(filename, sceptre_user_data, expected):
     expected_yaml = yaml.safe_load(expected)
     result_yaml = yaml.safe_load(result)
     assert expected_yaml == result_yaml
+
+
+def test_render_jinja_template_shares_environment(tmpdir):
+    jinja_template_dir = os.path.join(
+        os.getcwd(),
+        "tests/fixtures/templates"
+    )
+    cache_dir = str(tmpdir)
+    for vpc_id in ["10.0.0.0/16", "10.1.0.0/16"]:
+        result = sceptre.template.Template._render_jinja_template(
+            template_dir=jinja_template_dir,
+            filename="vpc.j2",
+            jinja_vars={"sceptre_user_data": {"vpc_id": vpc_id}},
+            cache_dir=cache_dir
+        )
+        assert vpc_id in result
+
+    environment = sceptre.template.get_jinja_environment(
+        jinja_template_dir, cache_dir
+    )
+    assert environment is sceptre.template.get_jinja_environment(
+        jinja_template_dir, cache_dir
+    )
+    assert os.listdir(os.path.join(cache_dir, "jinja"))
+
+
+def test_render_jinja_template_with_unwritable_cache_dir(tmpdir):
+    jinja_template_dir = os.path.join(
+        os.getcwd(),
+        "tests/fixtures/templates"
+    )
+    cache_dir = str(tmpdir.join(".sceptre"))
+    with open(cache_dir, "w") as cache_file:
+        cache_file.write("")
+
+    result = sceptre.template.Template._render_jinja_template(
+        template_dir=jinja_template_dir,
+        filename="vpc.j2",
+        jinja_vars={"sceptre_user_data": {"vpc_id": "10.0.0.0/16"}},
+        cache_dir=cache_dir
+    )
+
+    assert "10.0.0.0/16" in result
+
+
+class TestTemplateRenderCache(object):
+
+    def setup_method(self, test_method):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "vpc.j2")
+        with open(self.path, "w") as template_file:
+            template_file.write("{{ sceptre_user_data.vpc_id }}")
+        self.render_cache = Mock()
+        self.render_cache.get.return_value = None
+        self.template = Template(
+            path=self.path,
+            sceptre_user_data={"vpc_id": "10.0.0.0/16"},
+            render_cache=self.render_cache
+        )
+
+    def teardown_method(self, test_method):
+        shutil.rmtree(self.directory)
+
+    def test_body_stores_rendered_body(self):
+        assert self.template.body == "10.0.0.0/16"
+        self.render_cache.set.assert_called_once_with(
+            self.template.get_render_key(), "10.0.0.0/16"
+        )
+
+    def test_body_with_cached_body(self):
+        self.render_cache.get.return_value = sentinel.body
+        assert self.template.body == sentinel.body
+        self.render_cache.set.assert_not_called()
+
+    def test_render_key_changes_with_sceptre_user_data(self):
+        render_key = self.template.get_render_key()
+        self.template.sceptre_user_data = {"vpc_id": "10.1.0.0/16"}
+        assert self.template.get_render_key() != render_key
+
+    def test_render_key_changes_with_helper_files(self):
+        render_key = self.template.get_render_key()
+        with open(os.path.join(self.directory, "macros.j2"), "w") as helper:
+            helper.write("{% macro vpc() %}{% endmacro %}")
+        # Directories are walked once per process.
+        sceptre.template._source_paths.clear()
+        assert self.template.get_render_key() != render_key
+
+    def test_render_key_walks_template_dir_once(self):
+        other_template = Template(
+            path=self.path, sceptre_user_data={"vpc_id": "10.1.0.0/16"}
+        )
+        with patch("sceptre.template.os.walk", wraps=os.walk) as mock_walk:
+            for template in [self.template, other_template]:
+                template.get_render_key()
+        assert mock_walk.call_count == 1
+
+    def test_render_key_ignores_hidden_directories(self):
+        render_key = self.template.get_render_key()
+        os.makedirs(os.path.join(self.directory, ".sceptre"))
+        with open(os.path.join(self.directory, ".sceptre", "x"), "w") as f:
+            f.write("x")
+        assert self.template.get_render_key() == render_key
+
+
+class TestTemplateRenderKeyModules(object):
+
+    def setup_method(self, test_method):
+        self.directory = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.directory, "templates"))
+        self.write("templates/vpc.py", (
+            "import json\n"
+            "import yaml\n"
+            "from helpers import tags\n"
+            "\n"
+            "def sceptre_handler(sceptre_user_data):\n"
+            "    return json.dumps(tags.TAGS)\n"
+        ))
+        self.write("helpers/__init__.py", "")
+        self.write("helpers/tags.py", "from .names import NAME\n")
+        self.write("helpers/names.py", "NAME = 'a'\n")
+        self.template = Template(
+            path=os.path.join(self.directory, "templates", "vpc.py"),
+            sceptre_user_data={}
+        )
+
+    def teardown_method(self, test_method):
+        shutil.rmtree(self.directory)
+
+    def write(self, path, content):
+        path = os.path.join(self.directory, path)
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with open(path, "w") as source_file:
+            source_file.write(content)
+
+    def test_module_paths_include_helpers_and_installed_packages(self):
+        paths = self.template._get_module_paths()
+
+        assert os.path.join(self.directory, "helpers", "names.py") in paths
+        assert yaml.__file__ in paths
+        assert not any(path.endswith("json.py") for path in paths)
+
+    def test_module_paths_are_found_once(self):
+        self.template._get_module_paths()
+        with patch("sceptre.template.imp.find_module") as mock_find_module:
+            self.template._get_module_paths()
+        mock_find_module.assert_not_called()
+
+    def test_render_key_changes_with_helpers_outside_template_dir(self):
+        render_key = self.template.get_render_key()
+        self.write("helpers/names.py", "NAME = 'bb'\n")
+
+        assert self.template.get_render_key() != render_key
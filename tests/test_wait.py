@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+from itertools import islice
+
+from mock import patch
+
+from sceptre.wait import WaitStrategy
+
+
+class TestWaitStrategy(object):
+
+    def test_from_config_with_no_config(self):
+        wait_strategy = WaitStrategy.from_config(None)
+
+        assert wait_strategy.initial_delay == 1
+        assert wait_strategy.max_delay == 20
+        assert wait_strategy.backoff == 1.5
+        assert wait_strategy.jitter == 0.2
+        assert wait_strategy.timeout is None
+
+    def test_from_config_overrides_defaults(self):
+        wait_strategy = WaitStrategy.from_config({
+            "initial_delay": 5, "timeout": 3600
+        })
+
+        assert wait_strategy.initial_delay == 5
+        assert wait_strategy.timeout == 3600
+        assert wait_strategy.max_delay == 20
+
+    def test_get_delays_backs_off_to_max_delay(self):
+        wait_strategy = WaitStrategy(
+            initial_delay=2, max_delay=10, backoff=2, jitter=0
+        )
+        delays = list(islice(wait_strategy.get_delays(), 5))
+
+        assert delays == [2, 4, 8, 10, 10]
+
+    @patch("sceptre.wait.random.uniform")
+    def test_get_delays_applies_jitter(self, mock_uniform):
+        mock_uniform.return_value = 1.1
+        wait_strategy = WaitStrategy(initial_delay=10, max_delay=20)
+
+        assert next(wait_strategy.get_delays()) == 11.0
+        mock_uniform.assert_called_once_with(0.8, 1.2)